@@ -0,0 +1,150 @@
+import asyncio
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, cast
+from .Emitter import EventEmitter
+from .chains import ANY, PROPAGATION, STOPPED
+from .hooks import EventHooks
+from .registry import Listeners
+
+
+async def _wait(awaitable: Awaitable[Any]) -> Any:
+    return await awaitable
+
+
+class AsyncEventEmitter(EventEmitter):
+    """
+    An EventEmitter whose listeners may be coroutine functions.
+
+    It has the same API as `EventEmitter`, plus `emit_async`, which awaits the awaitables returned by listeners.
+    Plain listeners are still called inline, in order, so they pay nothing for the event loop.
+    """
+
+    __slots__ = ("concurrent",)
+
+    def __init__(self, options: Optional[Dict[str, Any]] | None) -> None:
+        """
+        Initializes a new instance of the AsyncEventEmitter class.
+
+        Args:
+            options `(Optional[Dict[str, Any]]):` An optional dictionary containing configuration options for the AsyncEventEmitter.
+                Besides the options of `EventEmitter`, the possible keys and their corresponding values are:
+                - 'concurrent' (bool): If True, `emit_async` awaits coroutine listeners concurrently; otherwise it awaits them one after
+                  the other, in listener order. Defaults to True.
+        """
+        super().__init__(options)
+        self.concurrent: bool = options.get('concurrent', True) if options else True
+
+    async def emit_async(self, event_name: str, *args: Any, concurrent: Optional[bool] = None):
+        """
+        Emits an event with the given name and arguments, awaiting the listeners that return awaitables.
+
+        Args:
+            event_name (str): The name of the event to emit.
+            *args (Any): The arguments to pass to the event listeners.
+            concurrent (Optional[bool]): Overrides the 'concurrent' option for this emit. Defaults to None.
+
+        Returns:
+            self: The current instance of the class.
+
+        Every listener is called in order. In sequential mode an awaitable returned by a listener is awaited before the next
+        listener is called. In concurrent mode the awaitables are collected and awaited together in an `asyncio.TaskGroup`
+        once every listener was called, those of the patterns and catch-all listeners the event reaches included, so the
+        emit takes as long as the slowest listener. A single awaitable is awaited
+        directly, without creating a task. If a listener raises, the awaitables collected so far are closed and the error
+        is raised; errors raised while awaiting are raised by the TaskGroup as an `ExceptionGroup`.
+
+        With the 'captureRejections' option, exceptions raised by listeners or by their awaitables do not stop the emit.
+        They are collected and, once every awaitable has completed, emitted with `emit_async` on the 'error' event, or
+        raised together as an `ExceptionGroup` if nothing listens to 'error'.
+
+        Example:
+        ```py
+            emitter = AsyncEventEmitter(None)
+
+            async def save(order):
+                await cache.set(order.id, order)
+
+            emitter.on('order', save)
+            emitter.on('order', lambda order: print(order.id))
+
+            await emitter.emit_async('order', order)
+        ```
+        """
+        if concurrent is None:
+            concurrent = self.concurrent
+        members, stops, scope = self._reached(event_name)
+        hooks = EventHooks(self._hooks, event_name) if self._hooks is not None and members else None
+        context = hooks.begin(args) if hooks is not None else None
+        token = PROPAGATION.set(scope) if scope is not None else None
+        pending: List[Awaitable[Any]] = []
+        errors: List[Exception] = []
+        try:
+            try:
+                for index, (name, listeners) in enumerate(members):
+                    if stops and index in stops and PROPAGATION.get() is STOPPED:
+                        continue
+                    called = (event_name,) + args if name is ANY else args
+                    await self._call_async(cast(str, name), listeners, called, concurrent, hooks, pending, errors)
+            finally:
+                if token is not None:
+                    PROPAGATION.reset(token)
+            if pending:
+                await self._await_pending(pending, errors)
+            if errors:
+                if event_name == 'error' or 'error' not in self.events:
+                    raise ExceptionGroup(f"listeners of {event_name!r} raised", errors)
+                for error in errors:
+                    await self.emit_async('error', error, concurrent=concurrent)
+        except BaseException as error:
+            if hooks is not None:
+                hooks.end(context, error)
+            raise
+        if hooks is not None:
+            hooks.end(context)
+        return self
+
+    async def _call_async(self, name: str, listeners: Listeners, args: Tuple[Any, ...], concurrent: bool, hooks: Optional[EventHooks],
+                          pending: List[Awaitable[Any]], errors: List[Exception]) -> None:
+        # Calls the listeners of one registry of the chain. `name` is the name of the registry, which differs from the
+        # emitted name for the patterns of wildcard subscriptions and for the catch-all listeners, whose `args` start
+        # with the emitted name. In concurrent mode the awaitables are added to `pending`, shared by the whole chain,
+        # and with the 'captureRejections' option the exceptions are added to `errors`.
+        listeners.emitted(args)
+        capture = self.captureRejections
+        records = listeners.claimed()
+        try:
+            for record in records:
+                try:
+                    result = listeners.call(record, hooks)(*args)
+                    if result is None or not hasattr(result, '__await__'):
+                        continue
+                    if concurrent:
+                        pending.append(result)
+                    else:
+                        await result
+                except Exception as error:
+                    if not capture:
+                        raise
+                    errors.append(error)
+        except BaseException:
+            for awaitable in pending:
+                if asyncio.iscoroutine(awaitable):
+                    awaitable.close()
+            raise
+        finally:
+            records.close()
+            self._drop(name, listeners)
+
+    async def _await_pending(self, pending: List[Awaitable[Any]], errors: List[Exception]) -> None:
+        # Awaits the awaitables of every registry of the chain together.
+        if self.captureRejections:
+            for outcome in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(outcome, Exception):
+                    errors.append(outcome)
+                elif isinstance(outcome, BaseException):
+                    raise outcome
+        elif len(pending) == 1:
+            await pending[0]
+        else:
+            async with asyncio.TaskGroup() as group:
+                for awaitable in pending:
+                    group.create_task(awaitable if asyncio.iscoroutine(awaitable) else _wait(awaitable))
@@ -1,7 +1,28 @@
-from typing import Any, Callable, List, Optional, Dict
+import inspect
+import re
+import weakref
+from concurrent.futures import Executor, Future
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Callable, Hashable, List, Mapping, Optional, Dict, Tuple, Union, cast
+from .chains import ANY, CACHE_SIZE, PROPAGATION, STOPPED, Chain, Member, Resolver
+from .dispatch import Rejections
+from .executors import BatchingProcessPool
+from .hooks import EmitContext, EventHooks, HookHandle, Hooks, ListenerContext
+from .limits import DEFAULT_LIMITS, ListenerLimits
+from .metrics import EventMetrics
+from .pacing import PacedCall
+from .registry import Listeners, Registration, Subscription, weak_call, weak_key
+from .replay import ReplayBuffer, payload_size
 from .utils import DEFAULT_LISTNER_COUNT, AbortSignal, Disposable
+from .wildcards import segment_trie
+
+# Shared, read-only `events` of every emitter that never had a listener.
+NO_EVENTS: Mapping[str, Listeners] = MappingProxyType({})
 
 class EventEmitter:
+    __slots__ = ("events", "captureRejections", "_limits", "_metrics", "_hooks", "_resolver", "_any_first", "__weakref__")
+
     def __init__(self, options: Optional[Dict[str, Any]] | None) -> None:
         """
         Initializes a new instance of the EventEmitter class.
@@ -9,33 +30,199 @@ class EventEmitter:
         Args:
             options `(Optional[Dict[str, Any]]):` An optional dictionary containing configuration options for the EventEmitter.
                 The possible keys and their corresponding values are:
-                - 'captureRejections' (bool): If True, the EventEmitter will capture and emit rejections. Defaults to False.
+                - 'captureRejections' (bool): If True, an exception raised by a listener does not stop the emit. The exceptions raised
+                  during an emit are collected and, once every listener ran, emitted on the 'error' event. Defaults to False.
+                - 'maxListenersMode' (Union[str, Callable]): What happens when adding a listener exceeds `get_max_listeners` or
+                  `get_max_total_listeners`. 'warn' issues a `MaxListenersExceededWarning` once per event, with the stack that
+                  added the listener; 'raise' raises `MaxListenersExceededError` and does not add the listener; a callable is
+                  called once per event as `callback(emitter, event_name, count, limit, stack)`, where `event_name` is None for
+                  the total limit. Defaults to 'warn'.
+                - 'metrics' (bool): If True, the emitter collects metrics from the start, as after `enable_metrics`. Defaults to False.
+                - 'wildcard' (Union[bool, str]): If True, event names are dotted namespaces and listeners can subscribe to patterns
+                  of them: a '*' segment matches any one segment and a '**' segment any number of segments, so 'db.*' receives
+                  'db.insert' and 'db.**' receives 'db.insert.users'. If 'mqtt', event names are MQTT topics and listeners can
+                  subscribe to topic filters: '+' matches one level and '#', which must be the last level, any number of levels,
+                  so 'site/+/temp' receives 'site/42/temp' and 'site/#' receives 'site/42/sensor/7/temp'. An emit calls the
+                  listeners of the event itself, then those of the matching patterns in the order the patterns were first
+                  subscribed. Defaults to False.
+                - 'wildcardCache' (int): The number of event names whose matching listeners are cached, for the 'wildcard'
+                  and 'bubble' options; the least recently emitted ones are evicted first. 0 caches every emitted name.
+                  Defaults to 131072.
+                - 'bubble' (bool): If True, an emit bubbles up the dotted hierarchy of the event name: an emit of
+                  'http.request.slow' calls the listeners of 'http.request.slow', then those of 'http.request', then those of
+                  'http'. With `'wildcard': 'mqtt'`, the levels are separated by '/'. A listener can call `stop_propagation`
+                  to skip the remaining levels. Defaults to False.
+                - 'anyOrder' (str): Whether the catch-all listeners of `on_any` are called 'before' or 'after' the listeners of
+                  the emitted event. Defaults to 'before'.
 
         Initializes the `events` dictionary to store event listeners, and the `captureRejections` flag to indicate whether
         rejections should be captured and emitted. If `options` is provided, the `captureRejections` flag is set to the
         value of the 'captureRejections' key in the `options` dictionary. If the 'captureRejections' key is not present
         in the `options` dictionary, or if `options` is None, the `captureRejections` flag is set to False.
+
+        The class uses `__slots__`, and `events` starts out as a shared, read-only empty mapping: the dictionary of the
+        emitter is only created when the first listener is registered, so idle emitters stay small. `events` is typed as
+        a `Mapping` for that reason; listeners are added and removed with the methods of the emitter, not through it.
         """
-        self.events: dict[str, List[Callable[..., None]]] = {}
+        self.events: Mapping[str, Listeners] = NO_EVENTS
         self.captureRejections: bool = options.get('captureRejections', False) if options else False
-
-    def on(self, event_name: str, listener: Callable[..., None]) -> None:
+        mode = options.get('maxListenersMode', 'warn') if options else 'warn'
+        self._limits: ListenerLimits = DEFAULT_LIMITS if mode == 'warn' else ListenerLimits(mode)
+        self._metrics: Optional[Dict[str, EventMetrics]] = {} if options and options.get('metrics') else None
+        self._hooks: Optional[Hooks] = None
+        order = options.get('anyOrder', 'before') if options else 'before'
+        if order != 'before' and order != 'after':
+            raise ValueError(f"the 'anyOrder' option must be 'before' or 'after', not {order!r}")
+        self._any_first: bool = order == 'before'
+        wildcard = options.get('wildcard') if options else None
+        bubble = options.get('bubble') if options else None
+        self._resolver: Optional[Resolver] = None
+        if wildcard or bubble:
+            trie = segment_trie(wildcard) if wildcard else None
+            delimiter = (trie.delimiter if trie is not None else '.') if bubble else None
+            capacity = options.get('wildcardCache', CACHE_SIZE) if options else CACHE_SIZE
+            self._resolver = Resolver(trie, capacity, self._any_first, delimiter)
+
+    def on(self, event_name: str, listener: Callable[..., None], *, executor: Optional[Executor] = None, priority: int = 0, weak: bool = False,
+           debounce: Optional[float] = None, throttle: Optional[float] = None, coalesce_by: Optional[Callable[..., Hashable]] = None) -> Subscription:
         """
         Adds a listener to the specified event.
 
         Args:
             event_name (str): The name of the event to listen to.
             listener `(Callable[..., None]):` The function to be called when the event is emitted.
+            executor (Optional[Executor]): If given, emitting the event submits the listener call to this executor instead of
+                calling the listener inline, so a listener that blocks does not stall the emitting thread. Use a `BoundedThreadPool`
+                to limit the number of pending calls, or a `BatchingProcessPool` for CPU-bound listeners, which may then be given
+                as an importable 'package.module:function' reference. Defaults to None.
+            priority (int): Listeners with a higher priority are called before listeners with a lower one; listeners with the same
+                priority are called in the order they were added. Defaults to 0.
+            weak (bool): If True, the emitter only holds a weak reference to the listener (a `weakref.WeakMethod` for a bound
+                method), so registering it does not keep its object alive. The registration is removed as soon as the listener
+                is garbage collected. Defaults to False.
+            debounce (Optional[float]): If given, the listener is only called once the event has not been emitted for this many
+                seconds, with the latest arguments. Defaults to None.
+            throttle (Optional[float]): If given, the listener is called at most once every this many seconds: right away for the
+                first emit, then at the end of the interval with the latest arguments. Defaults to None.
+            coalesce_by `(Optional[Callable[..., Hashable]]):` If given, the delayed calls are kept per key, computed from the
+                arguments of the emit, and the listener is called once per key with the latest arguments of that key. Defaults to None.
+                Delayed calls run on a timer thread shared by all paced listeners; see `PacedCall`.
 
         Returns:
-            None: This function does not return anything.
+            Subscription: A handle that removes this registration when disposed.
 
         This function adds a listener to the specified event. If the event does not exist in the `events` dictionary,
-        it is created as an empty list. The listener function is then appended to the list of listeners for that event.
+        it is created with an empty `Listeners` registry. The listener function is then appended to the registry of that event.
+        Emits that are already running keep iterating the snapshot of listeners they started with.
+
+        Example:
+        ```py
+            emitter = EventEmitter({ "captureRejections": True })
+
+            with emitter.on('my_event', lambda x: print(x)):
+                emitter.emit('my_event', 'Hello, world!') # Output: Hello, world!
+
+            emitter.emit('my_event', 'Goodbye, world!') # No output
+        ```
+        """
+        return self._replayed(self._add(event_name, listener, False, False, executor, priority, weak, debounce, throttle, coalesce_by))
+
+    def on_pattern(self, pattern: Union[str, re.Pattern], listener: Callable[..., None], *, executor: Optional[Executor] = None, priority: int = 0,
+                   weak: bool = False, debounce: Optional[float] = None, throttle: Optional[float] = None,
+                   coalesce_by: Optional[Callable[..., Hashable]] = None) -> Subscription:
+        """
+        Adds a listener to every event whose name matches a regular expression.
+
+        Args:
+            pattern `(Union[str, re.Pattern]):` The regular expression, compiled with `re.compile` if it is a string. It
+                matches an event name as `pattern.match(event_name)` does: from the start of the name, and up to its end only if
+                it ends with '$'.
+            listener `(Callable[..., None]):` The function to be called when a matching event is emitted.
+            executor, priority, weak, debounce, throttle, coalesce_by: As for `on`.
+
+        Returns:
+            Subscription: A handle that removes this registration when disposed.
+
+        The listeners of a pattern are kept under the compiled pattern, which `listeners`, `listener_count`, `off_pattern`
+        and `remove_all_listeners` accept. An emit calls the listeners of the event itself, then those of the wildcard
+        patterns and of the regular expressions that match it, in the order the expressions were first subscribed. The regular
+        expressions of the emitter are matched together, compiled into alternations of up to 64 patterns (see
+        `RegexMatcher`), and the result is cached per event name until a matching pattern is added or removed, so an emit
+        of a name seen before does not run any of them.
+
+        Example:
+        ```py
+            emitter = EventEmitter(None)
+
+            emitter.on_pattern(r'order\\.(created|paid)$', lambda order: print(order))
+            emitter.emit('order.paid', 42) # Output: 42
+            emitter.emit('order.shipped', 42) # No output
+        ```
+        """
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern)
+        return self._replayed(self._add(cast(str, pattern), listener, False, False, executor, priority, weak, debounce, throttle, coalesce_by))
+
+    def off_pattern(self, pattern: Union[str, re.Pattern], listener: Callable[..., None]) -> None:
+        """
+        Removes a listener added with `on_pattern`.
+
+        Args:
+            pattern `(Union[str, re.Pattern]):` The regular expression, as a string or compiled.
+            listener `(Callable[..., None]):` The function to be removed as a listener.
+        """
+        self.off(cast(str, re.compile(pattern) if isinstance(pattern, str) else pattern), listener)
+
+    def on_any(self, listener: Callable[..., None], *, executor: Optional[Executor] = None, priority: int = 0, weak: bool = False,
+               debounce: Optional[float] = None, throttle: Optional[float] = None, coalesce_by: Optional[Callable[..., Hashable]] = None) -> Subscription:
+        """
+        Adds a catch-all listener, called for every emitted event with the event name before the arguments of the emit.
+
+        Args:
+            listener `(Callable[..., None]):` The function to be called as `listener(event_name, *args)`.
+            executor, priority, weak, debounce, throttle, coalesce_by: As for `on`.
+
+        Returns:
+            Subscription: A handle that removes this registration when disposed.
+
+        The catch-all listeners are called before the listeners of the emitted event, or after them with the 'anyOrder'
+        option set to 'after'. They cost nothing while there are none: the first one switches the emitter to the resolved
+        emit path of `on_pattern`, where the listeners every event name reaches are compiled into one dispatch function,
+        the catch-all listeners included, and cached per name, so `emit` still makes a single check to find out which path
+        to take.
+
+        Example:
+        ```py
+            emitter = EventEmitter(None)
+
+            emitter.on_any(lambda event_name, *args: print(event_name, args))
+            emitter.emit('login', 'ada') # Output: login ('ada',)
+        ```
+        """
+        return self._add(cast(str, ANY), listener, False, False, executor, priority, weak, debounce, throttle, coalesce_by)
+
+    def prepend_any(self, listener: Callable[..., None], *, executor: Optional[Executor] = None, priority: int = 0, weak: bool = False,
+                    debounce: Optional[float] = None, throttle: Optional[float] = None, coalesce_by: Optional[Callable[..., Hashable]] = None) -> Subscription:
+        """
+        Adds a catch-all listener before the other catch-all listeners of the same priority. See `on_any`.
+
+        Args:
+            listener `(Callable[..., None]):` The function to be called as `listener(event_name, *args)`.
+            executor, priority, weak, debounce, throttle, coalesce_by: As for `on`.
+
+        Returns:
+            Subscription: A handle that removes this registration when disposed.
+        """
+        return self._add(cast(str, ANY), listener, True, False, executor, priority, weak, debounce, throttle, coalesce_by)
+
+    def off_any(self, listener: Callable[..., None]) -> None:
         """
-        if event_name not in self.events:
-            self.events[event_name] = []
-        self.events[event_name].append(listener)
+        Removes a catch-all listener added with `on_any` or `prepend_any`.
+
+        Args:
+            listener `(Callable[..., None]):` The function to be removed as a listener.
+        """
+        self.off(cast(str, ANY), listener)
 
     def off(self, event_name: str, listener: Callable[..., None]) -> None:
         """
@@ -48,10 +235,237 @@ class EventEmitter:
         Returns:
             None: This function does not return anything.
 
-        This function removes a listener from the specified event. If the event exists in the `events` dictionary and the listener is present in the list of listeners for that event, it is removed from the list.
+        This function removes a listener from the specified event in constant time. If the event exists in the `events` dictionary, the first occurrence of the listener is removed from its registry. Removing a listener that is not registered does nothing. The event is dropped once its last listener is removed.
+        """
+        listeners = self._lookup(event_name)
+        if listeners is not None and listeners.remove(listener):
+            self._drop(event_name, listeners)
+
+    def _add(self, event_name: str, listener: Callable[..., None], prepend: bool, once: bool, executor: Optional[Executor] = None, priority: int = 0, weak: bool = False,
+             debounce: Optional[float] = None, throttle: Optional[float] = None, coalesce_by: Optional[Callable[..., Hashable]] = None) -> Subscription:
+        if isinstance(listener, str):
+            if not isinstance(executor, BatchingProcessPool):
+                raise TypeError(f"listener {listener!r} is a reference, which needs a BatchingProcessPool executor")
+            # The worker processes resolve the reference; the registration holds it in place of the function.
+            listener = cast(Callable[..., None], listener)
+        # The registration is built before the registry of the event is created, so that a listener that cannot be
+        # registered, because it cannot be weakly referenced or its pacing options are invalid, does not leave an
+        # empty registry behind.
+        key = None
+        registered: Callable[..., Any] = listener
+        call: Callable[..., Any] = listener
+        if weak:
+            key = weak_key(listener)
+            purge = partial(_purge, weakref.ref(self), event_name, key)
+            reference: "weakref.ref[Callable[..., Any]]" = (weakref.WeakMethod(listener, purge) if inspect.ismethod(listener)
+                                                            else weakref.ref(listener, purge))
+            registered = reference
+            call = weak_call(reference)
+        if executor is not None:
+            call = partial(executor.submit, call)
+        if debounce is not None or throttle is not None or coalesce_by is not None:
+            call = PacedCall(call, debounce, throttle, coalesce_by)
+        listeners = self._lookup(event_name)
+        if listeners is None:
+            listeners = self._create(event_name)
+        if len(listeners) >= self._limits.threshold:
+            try:
+                self._own_limits().admit(self, event_name, len(listeners) + 1)
+            except BaseException:
+                self._drop(event_name, listeners)
+                raise
+        record = listeners.prepend(registered, once, call, priority, key) if prepend else listeners.append(registered, once, call, priority, key)
+        return Subscription(self, event_name, listeners, record)
+
+    def _events(self) -> Dict[str, Listeners]:
+        # The dictionary of the registries, created by the first registry of the emitter.
+        events = self.events
+        if not isinstance(events, dict):
+            events = self.events = {}
+        return events
+
+    def _lookup(self, event_name: str) -> Optional[Listeners]:
+        # The registry of a key: an event name or wildcard pattern, in `events`, or `ANY` or the compiled expression
+        # of an `on_pattern` subscription, whose registries the resolver holds since they are not event names.
+        if isinstance(event_name, str):
+            return self.events.get(event_name)
+        return self._resolver.registries.get(event_name) if self._resolver is not None else None
+
+    def _registries(self) -> List[Tuple[Any, Listeners]]:
+        # Every registry of the emitter with its key, those of `events` first.
+        registries: List[Tuple[Any, Listeners]] = list(self.events.items())
+        if self._resolver is not None:
+            registries.extend(self._resolver.registries.items())
+        return registries
+
+    def _registry(self) -> Listeners:
+        return Listeners()
+
+    def _create(self, event_name: str) -> Listeners:
+        if event_name is ANY or isinstance(event_name, re.Pattern):
+            if self._resolver is None:
+                self._resolver = Resolver(None, CACHE_SIZE, self._any_first)
+        elif self._resolver is not None and self._resolver.trie is not None:
+            self._resolver.trie.validate(event_name)
+        listeners = self._registry()
+        if isinstance(event_name, str):
+            # The resolver holds the registries of regular expressions and of the catch-all listeners, which are not
+            # metered per event name.
+            self._events()[event_name] = listeners
+            if self._metrics is not None:
+                listeners.metrics = self._metrics.setdefault(event_name, EventMetrics())
+        if self._hooks is not None:
+            listeners.hooks = EventHooks(self._hooks, event_name)
+        if self._resolver is not None:
+            self._resolver.created(event_name, listeners)
+        return listeners
+
+    def _own_limits(self) -> ListenerLimits:
+        if self._limits is DEFAULT_LIMITS:
+            self._limits = DEFAULT_LIMITS.copy()
+        return self._limits
+
+    def _discard(self, event_name: str, listeners: Listeners, record: Registration) -> None:
+        if listeners.discard(record):
+            self._drop(event_name, listeners)
+
+    def _replayed(self, subscription: Subscription) -> Subscription:
+        # Replays the retained emits of the event to a new registration, which a `once` registration consumes.
+        listeners = subscription.listeners
+        replay = listeners.replay
+        if replay is None or not replay:
+            return subscription
+        entries = replay.entries()
+        record = subscription.record
+        if record.once:
+            if not listeners.claim(record):
+                return subscription
+            subscription.dispose()
+            entries = entries[:1]
+        for args in entries:
+            try:
+                record.call(*args)
+            except Exception as error:
+                if not self._reject(subscription.event_name, listeners, error):
+                    raise
+        return subscription
+
+    def _pin(self, event_name: str, replay: ReplayBuffer) -> Listeners:
+        # The registry of a retained event is created up front, so that it records the emits of the event.
+        listeners = self.events.get(event_name)
+        if listeners is None:
+            listeners = self._create(event_name)
+        listeners.replay = replay
+        listeners._changed()
+        return listeners
+
+    def _drop(self, event_name: str, listeners: Listeners) -> None:
+        if not listeners and listeners.replay is None and self._lookup(event_name) is listeners:
+            if isinstance(event_name, str):
+                del self._events()[event_name]
+            if self._resolver is not None:
+                self._resolver.removed(event_name, listeners)
+                self._release()
+
+    def _release(self) -> None:
+        # Drops the resolver once the last pattern or catch-all registry is gone, which puts the emitter back on the
+        # plain emit path.
+        if self._resolver is not None and self._resolver.idle():
+            self._resolver.clear()
+            self._resolver = None
+
+    def _resolve(self, event_name: str) -> Tuple[Chain, Callable[..., Any]]:
+        # The chain of registries an emit of `event_name` reaches on an emitter with wildcard subscriptions, and its
+        # dispatch function, resolved and compiled if needed.
+        resolver = self._resolver
+        if resolver is None:
+            # Dropped by a concurrent `off_any` or `off_pattern`: only the exact registry is left.
+            listeners = self.events.get(event_name)
+            chain = Chain(event_name, ((event_name, listeners),) if listeners is not None else ())
+        else:
+            chain = resolver.resolve(self.events, event_name)
+        return chain, chain.compile(self.captureRejections)
+
+    def _reached(self, event_name: str) -> Tuple[Tuple[Member, ...], Tuple[int, ...], Optional[Resolver]]:
+        # The names and registries an emit of `event_name` reaches, for the emit loops that are not compiled, the
+        # indices of those that `stop_propagation` skips, and the value of `PROPAGATION` during the emit if the
+        # emitter bubbles.
+        if self._resolver is not None and not isinstance(event_name, re.Pattern):
+            chain = self._resolve(event_name)[0]
+            return chain.members, chain.stops, chain.scope
+        listeners = self._lookup(event_name)
+        return ((event_name, listeners),) if listeners is not None else (), (), None
+
+    def stop_propagation(self) -> None:
         """
-        if event_name in self.events:
-            self.events[event_name].remove(listener)
+        Stops the emit that is calling the current listener from bubbling further up the event hierarchy.
+
+        The other listeners of the current level are still called, as are the catch-all listeners; the listeners of the
+        ancestor events are not. This only has an effect with the 'bubble' option, on the innermost emit of this emitter
+        that is running in the current thread or task, from a listener that runs inside it, which excludes listeners run
+        by an executor and coroutines run concurrently by `emit_async`. Every emit of a bubbling emitter, nested ones
+        included, stops on its own: a listener of a nested emit does not stop the emit around it. Outside of an emit of
+        this emitter, it does nothing.
+
+        Example:
+        ```py
+            emitter = EventEmitter({ "bubble": True })
+
+            def handle(request):
+                print("slow", request)
+                emitter.stop_propagation()
+
+            emitter.on('http.request.slow', handle)
+            emitter.on('http', lambda request: print("http", request))
+
+            emitter.emit('http.request.slow', 42) # Output: slow 42
+            emitter.emit('http.request.fast', 42) # Output: http 42
+        ```
+        """
+        resolver = self._resolver
+        if resolver is not None and PROPAGATION.get() is resolver:
+            PROPAGATION.set(STOPPED)
+
+    def _emit_resolved(self, event_name: str, args: tuple) -> None:
+        # `emit` on an emitter with wildcard subscriptions. A cached chain of the current generation with a compiled
+        # dispatch function is dispatched without resolving anything.
+        resolver = self._resolver
+        if resolver is None:
+            EventEmitter.emit(self, event_name, *args)
+            return
+        chain = resolver.chains.get(event_name)
+        dispatch = chain.dispatch if chain is not None and chain.generation == resolver.generation else None
+        if chain is None or dispatch is None:
+            chain, dispatch = self._resolve(event_name)
+        else:
+            chain.used = True
+        try:
+            if dispatch(*args) is True:
+                for name, listeners in chain.members:
+                    self._drop(cast(str, name), listeners)
+        except Exception as error:
+            for name, listeners in chain.members:
+                self._drop(cast(str, name), listeners)
+            if not self._reject(event_name, None, error):
+                raise
+
+    def _reject(self, event_name: str, listeners: Optional[Listeners], error: Exception) -> bool:
+        # Returns False when the error was not captured and must propagate. A single listener is dispatched
+        # without a capturing loop, so its exception arrives here unwrapped.
+        if listeners is not None:
+            self._drop(event_name, listeners)
+        if isinstance(error, Rejections):
+            errors = error.errors
+        elif self.captureRejections:
+            errors = [error]
+        else:
+            return False
+        if event_name == 'error' or 'error' not in self.events:
+            raise ExceptionGroup(f"listeners of {event_name!r} raised", errors)
+        # Errors are delivered right away, also by subclasses whose `emit` defers the delivery.
+        for error in errors:
+            EventEmitter.emit(self, 'error', error)
+        return True
 
     def emit(self, event_name: str, *args: Any):
         """
@@ -64,7 +478,13 @@ class EventEmitter:
         Returns:
             self: The current instance of the class.
 
-        This function emits an event with the given name and arguments. It checks if the event name exists in the `events` dictionary. If it does, it iterates over the list of listeners for that event and calls each listener with the provided arguments.
+        This function emits an event with the given name and arguments. It checks if the event name exists in the `events` dictionary. If it does, it iterates over the snapshot tuple of listeners for that event and calls each listener with the provided arguments.
+        Listeners added or removed while the event is being emitted do not affect the current emit. `once` listeners are flagged as fired
+        before they are called and are removed together, in one sweep, after the last listener has run. The loop itself is a dispatch
+        function compiled for the current listeners of the event and cached until they change (see `dispatcher`).
+        With the 'wildcard' option or `on_pattern` subscriptions, the listeners of the event and of the patterns that match
+        it are resolved the first time the event is emitted, and the dispatch function compiled for all of them is cached
+        the same way.
 
         Example:
         ```py
@@ -75,24 +495,180 @@ class EventEmitter:
             emitter.on('my_event', lambda x: print(x)) # Output: Hello, world!
         ```
         """
-        if event_name in self.events:
-            for listener in self.events[event_name]:
-                listener(*args)
+        if self._resolver is not None:
+            self._emit_resolved(event_name, args)
+            return self
+        listeners = self.events.get(event_name)
+        if listeners is not None:
+            try:
+                if (listeners.dispatch or listeners.compile(None, self.captureRejections))(*args) is True:
+                    self._drop(event_name, listeners)
+            except Exception as error:
+                if not self._reject(event_name, listeners, error):
+                    raise
         return self
 
-    def once(self, event_name: str, listener: Callable[..., None]):
+    def dispatcher(self, event_name: str, nargs: Optional[int] = None) -> Callable[..., None]:
+        """
+        Returns a function that emits the specified event when called with the event arguments.
+
+        Args:
+            event_name (str): The name of the event to emit.
+            nargs (Optional[int]): The number of arguments the function will be called with. 0, 1 and 2 get dedicated fast paths. Defaults to None, which accepts any number of arguments.
+
+        Returns:
+            `Callable[..., None]:` A function behaving like `emit(event_name, *args)` that skips the method call and, for a fixed `nargs`,
+            the `*args` packing of `emit`. It always dispatches to the current listeners, so it can be kept across `on` and `off` calls.
+
+        Example:
+        ```py
+            emitter = EventEmitter({ "captureRejections": True })
+
+            emitter.on('tick', lambda n: print(n))
+            tick = emitter.dispatcher('tick', 1)
+
+            for n in range(3):
+                tick(n) # Output: 0, 1, 2
+        ```
+        """
+        drop = self._drop
+        reject = self._reject
+        emit_resolved = self._emit_resolved
+
+        # The resolver is created by the first `on_pattern` or `on_any` and dropped with the last one, so the
+        # dispatch functions check for it on each call.
+        if nargs == 0:
+            def dispatch0() -> None:
+                if self._resolver is not None:
+                    return emit_resolved(event_name, ())
+                listeners = self.events.get(event_name)
+                if listeners is not None:
+                    try:
+                        if (listeners.dispatch0 or listeners.compile(0, self.captureRejections))() is True:
+                            drop(event_name, listeners)
+                    except Exception as error:
+                        if not reject(event_name, listeners, error):
+                            raise
+            return dispatch0
+        if nargs == 1:
+            def dispatch1(a: Any) -> None:
+                if self._resolver is not None:
+                    return emit_resolved(event_name, (a,))
+                listeners = self.events.get(event_name)
+                if listeners is not None:
+                    try:
+                        if (listeners.dispatch1 or listeners.compile(1, self.captureRejections))(a) is True:
+                            drop(event_name, listeners)
+                    except Exception as error:
+                        if not reject(event_name, listeners, error):
+                            raise
+            return dispatch1
+        if nargs == 2:
+            def dispatch2(a: Any, b: Any) -> None:
+                if self._resolver is not None:
+                    return emit_resolved(event_name, (a, b))
+                listeners = self.events.get(event_name)
+                if listeners is not None:
+                    try:
+                        if (listeners.dispatch2 or listeners.compile(2, self.captureRejections))(a, b) is True:
+                            drop(event_name, listeners)
+                    except Exception as error:
+                        if not reject(event_name, listeners, error):
+                            raise
+            return dispatch2
+
+        def dispatch(*args: Any) -> None:
+            if self._resolver is not None:
+                return emit_resolved(event_name, args)
+            listeners = self.events.get(event_name)
+            if listeners is not None:
+                try:
+                    if (listeners.dispatch or listeners.compile(None, self.captureRejections))(*args) is True:
+                        drop(event_name, listeners)
+                except Exception as error:
+                    if not reject(event_name, listeners, error):
+                        raise
+        return dispatch
+
+    def emit_futures(self, event_name: str, *args: Any) -> List[Future]:
+        """
+        Emits an event with the given name and arguments, and returns a future for every listener that was called.
+
+        Args:
+            event_name (str): The name of the event to emit.
+            *args (Any): The arguments to pass to the event listeners.
+
+        Returns:
+            `List[Future]:` One future per listener, in listener order. Listeners registered with an `executor` return the future of
+            their submitted call. Inline listeners are called right away and their result or exception is stored in an already
+            completed future, so no exception is raised by this function.
+
+        Example:
+        ```py
+            pool = BoundedThreadPool(max_workers=4, max_pending=100)
+            emitter = EventEmitter(None)
+
+            emitter.on('upload', write_to_disk, executor=pool)
+
+            for future in emitter.emit_futures('upload', blob):
+                future.result()
+        ```
+        """
+        futures: List[Future] = []
+        members, stops, scope = self._reached(event_name)
+        hooks = EventHooks(self._hooks, event_name) if self._hooks is not None and members else None
+        context = hooks.begin(args) if hooks is not None else None
+        token = PROPAGATION.set(scope) if scope is not None else None
+        try:
+            for index, (name, listeners) in enumerate(members):
+                if stops and index in stops and PROPAGATION.get() is STOPPED:
+                    continue
+                called = (event_name,) + args if name is ANY else args
+                listeners.emitted(called)
+                records = listeners.claimed()
+                try:
+                    for record in records:
+                        try:
+                            result = listeners.call(record, hooks)(*called)
+                        except Exception as error:
+                            future: Future = Future()
+                            future.set_exception(error)
+                        else:
+                            if isinstance(result, Future):
+                                future = result
+                            else:
+                                future = Future()
+                                future.set_result(result)
+                        futures.append(future)
+                finally:
+                    records.close()
+                    self._drop(cast(str, name), listeners)
+        finally:
+            if token is not None:
+                PROPAGATION.reset(token)
+        if hooks is not None:
+            hooks.end(context)
+        return futures
+
+    def once(self, event_name: str, listener: Callable[..., None], *, executor: Optional[Executor] = None, priority: int = 0, weak: bool = False,
+           debounce: Optional[float] = None, throttle: Optional[float] = None, coalesce_by: Optional[Callable[..., Hashable]] = None) -> Subscription:
         """
         Adds a listener to the specified event that will be executed only once.
 
         Args:
             event_name (str): The name of the event to listen to.
             listener (Callable[..., None]): The function to be called when the event is emitted.
+            executor (Optional[Executor]): The executor to run the listener on, as in `on`. Defaults to None.
+            priority (int): The priority of the listener, as in `on`. Defaults to 0.
+            weak (bool): If True, the listener is held by a weak reference, as in `on`. Defaults to False.
+            debounce, throttle, coalesce_by: Pace the calls of the listener, as in `on`. Default to None.
 
         Returns:
-            self: The current instance of the class.
+            Subscription: A handle that removes this registration when disposed, if it has not fired yet.
 
         This function adds a listener to the specified event that will be executed only once. If the event does not exist in the `events` dictionary,
-        it is created as an empty list. The listener function is then appended to the list of listeners for that event. The listener will be removed after it is called.
+        it is created. The listener function is then appended to the listeners of that event with its `once` flag set, without any wrapper
+        function. The listener will be removed after it is called.
 
         Example:
         ```py
@@ -107,20 +683,7 @@ class EventEmitter:
             emitter.emit('my_event', 'Goodbye, world!') # No output
         ```
         """
-        def wrapper(*args: Any):
-            """
-            A wrapper function that removes a listener from the event and calls the listener with the provided arguments.
-
-            Args:
-                *args (Any): The arguments to pass to the listener function.
-
-            Returns:
-                None
-            """
-            self.remove_listener(event_name, wrapper)
-            listener(*args)
-        self.on(event_name, wrapper)
-        return self
+        return self._replayed(self._add(event_name, listener, False, True, executor, priority, weak, debounce, throttle, coalesce_by))
 
     def listeners(self, event_name: str) -> List[Callable[..., None]]:
         """
@@ -131,8 +694,14 @@ class EventEmitter:
 
         Returns:
             `List[Callable[..., None]]:` A list of listener functions for the event. If the event does not exist, an empty list is returned.
+                With the 'wildcard' option, `on_pattern` subscriptions or catch-all listeners, the list holds every listener
+                an emit of `event_name` calls, including those of the matching patterns and the catch-all ones, in call order. For a compiled pattern, it holds
+                the listeners added with `on_pattern`.
         """
-        return self.events.get(event_name, [])
+        if self._resolver is not None:
+            return [listener for _, listeners in self._reached(event_name)[0] for listener in listeners]
+        listeners = self.events.get(event_name)
+        return list(listeners) if listeners is not None else []
 
     def listener_count(self, event_name: str) -> int:
         """
@@ -142,9 +711,13 @@ class EventEmitter:
             event_name (str): The name of the event.
 
         Returns:
-            int: The number of listeners for the event.
+            int: The number of listeners for the event. With the 'wildcard' option, `on_pattern` subscriptions or catch-all
+                listeners, the listeners of the matching patterns and the catch-all ones are counted too.
         """
-        return len(self.listeners(event_name))
+        if self._resolver is not None:
+            return sum(len(listeners) for _, listeners in self._reached(event_name)[0])
+        listeners = self.events.get(event_name)
+        return len(listeners) if listeners is not None else 0
 
     def remove_listener(self, event_name: str, listener: Callable[..., None]):
         """
@@ -172,57 +745,324 @@ class EventEmitter:
         Returns:
             self: The current instance of the class.
 
-        This function removes all listeners for the specified event if `event_name` is provided. If `event_name` is not provided, all events and their listeners will be removed.
+        This function removes all listeners for the specified event if `event_name` is provided. If `event_name` is not provided, all events and their listeners will be removed. Retained events stay retained.
         """
+        removed: List[Tuple[Any, Listeners]]
         if event_name:
-            del self.events[event_name]
+            listeners = self._lookup(event_name)
+            removed = [(event_name, listeners)] if listeners is not None else []
         else:
-            self.events.clear()
+            removed = self._registries()
+        for name, listeners in removed:
+            if self.events.get(name) is listeners:
+                del self._events()[name]
+            listeners.cancel()
+            if self._resolver is not None:
+                self._resolver.removed(name, listeners)
+            if listeners.replay is not None:
+                self._pin(name, listeners.replay)
+        self._release()
+        return self
+
+    def retain(self, event_name: str, last: int = 1, max_bytes: Optional[int] = None, sizeof: Callable[[tuple], int] = payload_size):
+        """
+        Retains the latest emits of an event and replays them to the listeners added later.
+
+        Args:
+            event_name (str): The name of the event.
+            last (int): The number of emits to retain. Defaults to 1.
+            max_bytes (Optional[int]): If given, the oldest emits are also evicted while the estimated size of the retained
+                arguments exceeds it. Defaults to None.
+            sizeof `(Callable[[tuple], int]):` Estimates the size of the arguments of an emit. Defaults to the sum of their
+                shallow `sys.getsizeof`.
+
+        Returns:
+            self: The current instance of the class.
+
+        A listener added with `on` or `prependListener` is called with every retained emit, oldest first, before the call
+        that adds it returns. A listener added with `once` or `prependOnceListener` is called with the oldest retained emit
+        instead of waiting for the next one. Retaining an event that is already retained resizes its buffer and keeps the
+        latest emits that fit.
+
+        Example:
+        ```py
+            emitter = EventEmitter(None)
+            emitter.retain('leader_elected')
+            emitter.emit('leader_elected', 'node-3')
+
+            emitter.on('leader_elected', print) # Output: node-3
+        ```
+        """
+        replay = ReplayBuffer(last, max_bytes, sizeof)
+        listeners = self.events.get(event_name)
+        if listeners is not None and listeners.replay is not None:
+            for args in listeners.replay.entries():
+                replay.record(*args)
+        self._pin(event_name, replay)
         return self
 
-    def set_max_listeners(self, n: int):
+    def release(self, event_name: str):
+        """
+        Stops retaining the emits of an event and drops the retained ones.
+
+        Args:
+            event_name (str): The name of the event.
+
+        Returns:
+            self: The current instance of the class.
+        """
+        listeners = self.events.get(event_name)
+        if listeners is not None and listeners.replay is not None:
+            listeners.replay = None
+            listeners._changed()
+            self._drop(event_name, listeners)
+        return self
+
+    def retained(self, event_name: str) -> List[tuple]:
+        """
+        Returns the retained emits of an event.
+
+        Args:
+            event_name (str): The name of the event.
+
+        Returns:
+            `List[tuple]:` The argument tuples of the retained emits, oldest first. Empty if the event is not retained.
+        """
+        listeners = self.events.get(event_name)
+        if listeners is None or listeners.replay is None:
+            return []
+        return listeners.replay.entries()
+
+    def enable_metrics(self):
+        """
+        Starts collecting metrics: the number of emits and the fan-out of every event, and the call latency of every listener.
+
+        Returns:
+            self: The current instance of the class.
+
+        The dispatch functions of the events are recompiled with a timed call for every listener, so only an emitter that
+        collects metrics pays for them: the dispatch functions of the others are exactly the same as without metrics. The
+        latencies are kept in log-bucketed histograms, which cost the same to update whatever the value. Emits of events
+        without listeners are not counted.
+        """
+        if self._metrics is None:
+            self._metrics = {}
+            for event_name, listeners in self.events.items():
+                listeners.metrics = self._metrics.setdefault(event_name, EventMetrics())
+                listeners._changed()
+        return self
+
+    def disable_metrics(self):
+        """
+        Stops collecting metrics and drops the collected ones.
+
+        Returns:
+            self: The current instance of the class.
+        """
+        if self._metrics is not None:
+            self._metrics = None
+            for listeners in self.events.values():
+                listeners.metrics = None
+                listeners._changed()
+        return self
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns a snapshot of the collected metrics.
+
+        Returns:
+            `Dict[str, Dict[str, Any]]:` For every event that was emitted since metrics were enabled: 'emits', the number of
+            emits; 'fanout', a summary of the number of listeners called per emit; and 'listeners', one entry per current
+            listener, in emit order, with the 'listener', its 'name' and a 'latency_ns' summary. A summary holds the 'count',
+            'mean', 'min', 'max', 'p50', 'p90', 'p99' and 'p999' of the recorded values. Empty when metrics are disabled.
+
+        Example:
+        ```py
+            emitter = EventEmitter({ "metrics": True })
+            emitter.on('order_filled', book_order)
+            emitter.emit('order_filled', order)
+
+            for listener in emitter.stats()['order_filled']['listeners']:
+                print(listener['name'], listener['latency_ns']['p99'])
+        ```
+        """
+        if self._metrics is None:
+            return {}
+        stats = {}
+        for event_name, metrics in list(self._metrics.items()):
+            listeners = self.events.get(event_name)
+            stats[event_name] = metrics.summary(listeners.snapshot() if listeners is not None else ())
+        return stats
+
+    def before_emit(self, hook: Callable[[EmitContext], Any]) -> HookHandle:
+        """
+        Adds a hook that is called before the listeners of every emit.
+
+        Args:
+            hook `(Callable[[EmitContext], Any]):` Called with the `EmitContext` of the emit, which holds the event name and
+                the arguments. Exceptions it raises propagate from `emit`.
+
+        Returns:
+            HookHandle: A handle that removes the hook when disposed.
+
+        Hooks are compiled into the dispatch functions of the events. An emitter without hooks dispatches exactly as
+        before, with the plain listener loop. Emits of events without listeners do not run the hooks.
+        """
+        return self._hook('before', hook)
+
+    def after_emit(self, hook: Callable[[EmitContext], Any]) -> HookHandle:
+        """
+        Adds a hook that is called after the listeners of every emit, also when one of them raised.
+
+        Args:
+            hook `(Callable[[EmitContext], Any]):` Called with the `EmitContext` of the emit, whose `start`, `end` and
+                `duration` time the listeners and whose `error` is the exception that escaped them, if any. With
+                'captureRejections', that includes the exceptions delivered to the 'error' event instead of being raised.
+
+        Returns:
+            HookHandle: A handle that removes the hook when disposed.
+
+        Example:
+        ```py
+            emitter = EventEmitter(None)
+
+            def trace(context):
+                print(context.event_name, context.duration, context.error)
+
+            with emitter.after_emit(trace):
+                emitter.emit('order_filled', order)
+        ```
+        """
+        return self._hook('after', hook)
+
+    def around_listener(self, hook: Callable[[ListenerContext, Callable[[], Any]], Any]) -> HookHandle:
+        """
+        Adds a hook that wraps every listener call.
+
+        Args:
+            hook `(Callable[[ListenerContext, Callable[[], Any]], Any]):` Called as `hook(context, proceed)` instead of the
+                listener. It must call `proceed()`, which calls the listener, and return its result. The `ListenerContext`
+                holds the event name, the arguments and the `listener`; `proceed` sets its `start`, `end` and `error`.
+                Hooks added later run inside the ones added earlier.
+
+        Returns:
+            HookHandle: A handle that removes the hook when disposed.
+        """
+        return self._hook('around', hook)
+
+    def _hook(self, kind: str, hook: Callable[..., Any]) -> HookHandle:
+        hooks = self._hooks or Hooks()
+        self._rehook(Hooks(*(getattr(hooks, name) + ((hook,) if name == kind else ()) for name in ('before', 'after', 'around'))))
+        return HookHandle(self, kind, hook)
+
+    def _unhook(self, kind: str, hook: Callable[..., Any]) -> None:
+        hooks = self._hooks
+        if hooks is None or hook not in getattr(hooks, kind):
+            return
+        removed = list(getattr(hooks, kind))
+        removed.remove(hook)
+        self._rehook(Hooks(*(tuple(removed) if name == kind else getattr(hooks, name) for name in ('before', 'after', 'around'))))
+
+    def _rehook(self, hooks: Hooks) -> None:
+        self._hooks = hooks if hooks else None
+        for event_name, listeners in self._registries():
+            listeners.hooks = EventHooks(hooks, event_name) if hooks else None
+            listeners._changed()
+
+    def set_max_listeners(self, n: int, event_name: Optional[str] = None):
         """
         Set the maximum number of listeners for the event emitter.
 
         Args:
-            n (int): The maximum number of listeners.
+            n (int): The maximum number of listeners. 0 removes the limit.
+            event_name (Optional[str]): If given, the limit only applies to this event and overrides the limit of the emitter
+                for it. Defaults to None.
 
         Returns:
             self: The current instance of the class.
 
-        This function sets the maximum number of listeners for the event emitter. It takes an integer `n` as an argument, which represents the maximum number of listeners. The function assigns the value of `n` to the `_max_listeners` attribute of the event emitter object. It then returns the current maximum number of listeners.
+        This function sets the maximum number of listeners of every event, or of a single event. Adding a listener beyond
+        the limit is handled according to the 'maxListenersMode' option: by default, a `MaxListenersExceededWarning` is
+        issued once per event, with the stack that added the listener.
 
         Example:
         ```py
             emitter = EventEmitter({ "captureRejections": True })
             emitter.set_max_listeners(10)  # Set the maximum number of listeners to 10
-            current_max_listeners = emitter.set_max_listeners(20)  # Set the maximum number of listeners to 20 and get the current maximum number of listeners
+            emitter.set_max_listeners(100, 'tick')  # Allow up to 100 listeners of the 'tick' event
         ```
         """
-        self._max_listeners = n
+        if n < 0:
+            raise ValueError(f"the maximum number of listeners must not be negative, got {n}")
+        limits = self._own_limits()
+        if event_name is None:
+            limits.default = n
+        else:
+            if limits.events is None:
+                limits.events = {}
+            limits.events[event_name] = n
+        limits.update()
         return self
 
-    def get_max_listeners(self) -> int:
+    def get_max_listeners(self, event_name: Optional[str] = None) -> int:
         """
         Returns the maximum number of listeners for the event emitter.
 
+        Args:
+            event_name (Optional[str]): If given, returns the limit that applies to this event. Defaults to None.
+
+        Returns:
+            int: The maximum number of listeners, 0 if there is no limit. If a maximum was set with `set_max_listeners`, it returns that value. Otherwise, it returns the default listener count which is `10`.
+        """
+        return self._limits.limit(event_name)
+
+    def set_max_total_listeners(self, n: int):
+        """
+        Sets the maximum number of listeners of all events together.
+
+        Args:
+            n (int): The maximum total number of listeners. 0 removes the limit.
+
+        Returns:
+            self: The current instance of the class.
+
+        While a total limit is set, adding a listener also checks it, which costs a little more than the check of the limit
+        per event. Exceeding it is handled like exceeding the limit of an event.
+        """
+        if n < 0:
+            raise ValueError(f"the maximum number of listeners must not be negative, got {n}")
+        limits = self._own_limits()
+        limits.total = n
+        limits.counted = sum(len(listeners) for _, listeners in self._registries())
+        limits.update()
+        return self
+
+    def get_max_total_listeners(self) -> int:
+        """
+        Returns the maximum number of listeners of all events together.
+
         Returns:
-            int: The maximum number of listeners. If the event emitter has a `_max_listeners` attribute, it returns that value. Otherwise, it returns the default listener count which is `10`.
+            int: The maximum total number of listeners, 0 if there is no limit, which is the default.
         """
-        return self._max_listeners if hasattr(self, '_max_listeners') else self.defaultMaxListeners()
+        return self._limits.total
 
-    def prependListener(self, event_name: str, listener: Callable[..., None]):
+    def prependListener(self, event_name: str, listener: Callable[..., None], *, executor: Optional[Executor] = None, priority: int = 0, weak: bool = False,
+           debounce: Optional[float] = None, throttle: Optional[float] = None, coalesce_by: Optional[Callable[..., Hashable]] = None) -> Subscription:
         """
         Adds a listener to the beginning of the listeners array for the specified event.
 
         Parameters:
             event_name (str): The name of the event to listen for.
             listener (Callable[..., None]): The function to be called when the event is emitted.
+            executor (Optional[Executor]): The executor to run the listener on, as in `on`. Defaults to None.
+            priority (int): The priority of the listener, as in `on`. Defaults to 0.
+            weak (bool): If True, the listener is held by a weak reference, as in `on`. Defaults to False.
+            debounce, throttle, coalesce_by: Pace the calls of the listener, as in `on`. Default to None.
 
         Returns:
-            self: The current instance of the class.
+            Subscription: A handle that removes this registration when disposed.
 
-        This function adds a listener to the beginning of the listeners array for the specified event. If the event does not exist in the `events` dictionary, it is created. The listener is then inserted at the beginning of the listeners array for the specified event.
+        This function adds a listener to the beginning of the listeners array for the specified event. If the event does not exist in the `events` dictionary, it is created. The listener is then prepended to the registry of that event in constant time.
 
         Example:
         ```py
@@ -236,25 +1076,27 @@ class EventEmitter:
             emitter.emit("event")  # Output: "Listener called"
         ```
         """
-        if event_name not in self.events:
-            self.events[event_name] = []
-        self.events[event_name].insert(0, listener)
-        return self
+        return self._replayed(self._add(event_name, listener, True, False, executor, priority, weak, debounce, throttle, coalesce_by))
 
-    def prependOnceListener(self, event_name: str, listener: Callable[..., None]):
+    def prependOnceListener(self, event_name: str, listener: Callable[..., None], *, executor: Optional[Executor] = None, priority: int = 0, weak: bool = False,
+           debounce: Optional[float] = None, throttle: Optional[float] = None, coalesce_by: Optional[Callable[..., Hashable]] = None) -> Subscription:
         """
         Adds a one-time listener function to the beginning of the listeners array for the specified event.
 
         Parameters:
             event_name (str): The name of the event.
             listener (Callable[..., None]): The function to be called when the event is emitted.
+            executor (Optional[Executor]): The executor to run the listener on, as in `on`. Defaults to None.
+            priority (int): The priority of the listener, as in `on`. Defaults to 0.
+            weak (bool): If True, the listener is held by a weak reference, as in `on`. Defaults to False.
+            debounce, throttle, coalesce_by: Pace the calls of the listener, as in `on`. Default to None.
 
         Returns:
-            self: The current instance of the class.
+            Subscription: A handle that removes this registration when disposed, if it has not fired yet.
 
         This function adds a one-time listener function to the beginning of the listeners array for the specified event. 
         The listener will be automatically removed after it is called. If the event does not exist in the `events` dictionary, 
-        it is created. The listener is then inserted at the beginning of the listeners array for the specified event.
+        it is created. The listener is then inserted at the beginning of the listeners array for the specified event with its `once` flag set.
 
         Example:
         ```py
@@ -268,31 +1110,19 @@ class EventEmitter:
             emitter.emit("event")  # Output: "Listener called"
         ```
         """
-        def wrapper(*args: Any):
-            """
-            A wrapper function that removes a listener from the event and calls the listener with the provided arguments.
-
-            Args:
-                *args (Any): The arguments to pass to the listener function.
-
-            Returns:
-                None
-            """
-            self.off(event_name, wrapper)
-            listener(*args)
-        self.prependListener(event_name, wrapper)
-        return self
+        return self._replayed(self._add(event_name, listener, True, True, executor, priority, weak, debounce, throttle, coalesce_by))
 
     def event_names(self) -> List[str]:
         """
         Returns a list of event names.
 
-        This function returns a list of event names by retrieving the keys from the `events` dictionary.
+        This function returns a list of event names by retrieving the keys from the `events` dictionary. Retained events
+        without listeners, catch-all listeners and the patterns of `on_pattern` subscriptions are left out.
 
         Returns:
             List[str]: A list of event names.
         """
-        return list(self.events.keys())
+        return [event_name for event_name, listeners in self.events.items() if listeners]
 
     def addAbortListener(self, signal: AbortSignal, resource: Callable[[str], None]) -> Disposable:
         """
@@ -344,11 +1174,14 @@ class EventEmitter:
         Gets the current setting for capturing rejection events.
 
         This function retrieves the flag indicating whether the EventEmitter instance is configured to capture rejection events.
+        When it is set, an exception raised by a listener no longer aborts the emit: the remaining listeners still run, and the
+        exceptions are then emitted on the 'error' event, or raised together as an `ExceptionGroup` if the 'error' event has no
+        listeners (or is the event being emitted).
 
         Returns:
             bool: True if rejection events are captured; False otherwise.
         """
-        return self.captureRejection
+        return self.captureRejections
 
     def defaultMaxListeners(self):
         """
@@ -359,4 +1192,17 @@ class EventEmitter:
         Returns:
             int: The default maximum number of listeners.
         """
-        return DEFAULT_LISTNER_COUNT
\ No newline at end of file
+        return DEFAULT_LISTNER_COUNT
+
+
+def _purge(emitter: "weakref.ref[EventEmitter]", event_name: str, key: Hashable, reference: "weakref.ref[Any]") -> None:
+    # The callback of the weak reference of a weak registration. It only holds the emitter weakly, so a weak
+    # registration does not keep the emitter alive either.
+    owner = emitter()
+    if owner is None:
+        return
+    listeners = owner._lookup(event_name)
+    if listeners is not None:
+        record = listeners.find(key, reference)
+        if record is not None:
+            owner._discard(event_name, listeners, record)
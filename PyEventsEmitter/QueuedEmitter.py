@@ -0,0 +1,337 @@
+import asyncio
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from .Emitter import EventEmitter
+from .ThreadSafeEmitter import ThreadSafeEventEmitter
+
+OVERFLOW_POLICIES = ('block', 'drop-oldest', 'drop-newest', 'raise')
+
+# The asyncio drain loop yields to the event loop after delivering this many events in a row.
+YIELD_EVERY = 64
+
+
+class QueueMetrics:
+    """
+    Counters of a `QueuedEventEmitter`. They are written by the producers and the drain loop without further locking,
+    so a snapshot taken while events flow may be off by the events in flight.
+    """
+
+    __slots__ = ("enqueued", "delivered", "dropped", "rejected", "latency_last", "latency_max", "latency_total")
+
+    def __init__(self) -> None:
+        self.enqueued: int = 0
+        self.delivered: int = 0
+        self.dropped: int = 0
+        self.rejected: int = 0
+        self.latency_last: float = 0.0
+        self.latency_max: float = 0.0
+        self.latency_total: float = 0.0
+
+
+class QueuedEventEmitter(ThreadSafeEventEmitter):
+    """
+    An EventEmitter whose `emit` only queues the event, so that producers do not run the listeners on their own stack.
+
+    Queued events are delivered in order by a drain loop, which is either a daemon thread started by the first `emit`
+    or an asyncio task running `run`. The queue is bounded; what `emit` does when it is full is set by the 'overflow'
+    option. Listeners are registered as on a `ThreadSafeEventEmitter` and may be added and removed from any thread.
+    `emit_now` delivers an event synchronously, bypassing the queue; errors routed to the 'error' event by
+    'captureRejections' are delivered that way as well. The functions returned by `dispatcher` queue their events like
+    `emit`. `emit_futures` is not supported and raises `TypeError`: its futures come from calling the listeners, which
+    only the drain loop does.
+    """
+
+    __slots__ = ("queue", "maxsize", "overflow", "timeout", "drain", "metrics",
+                 "_not_empty", "_not_full", "_idle", "_busy", "_closed", "_drainer", "_loop", "_wakeup")
+
+    def __init__(self, options: Optional[Dict[str, Any]] | None) -> None:
+        """
+        Initializes a new instance of the QueuedEventEmitter class.
+
+        Args:
+            options `(Optional[Dict[str, Any]]):` An optional dictionary containing configuration options for the QueuedEventEmitter.
+                Besides the options of `EventEmitter`, the possible keys and their corresponding values are:
+                - 'maxsize' (int): The number of events the queue holds. Defaults to 65536.
+                - 'overflow' (str): What `emit` does when the queue is full. 'block' waits for the drain loop to make room,
+                  'drop-oldest' discards the oldest queued event, 'drop-newest' discards the event being emitted, and 'raise'
+                  raises `queue.Full`. Defaults to 'block'. An emit from the drain loop itself, by a listener on the drain
+                  thread or by any code on the event loop that runs `run`, cannot wait for room it alone makes: with 'block',
+                  its event is queued past `maxsize` instead.
+                - 'timeout' (Optional[float]): How long a blocked `emit` waits before raising `queue.Full`. Defaults to None,
+                  which waits for as long as it takes.
+                - 'drain' (str): 'thread' delivers the events on a daemon thread started by the first `emit`; 'task' leaves it
+                  to `run`, which must be awaited in an asyncio task. Defaults to 'thread'.
+        """
+        super().__init__(options)
+        options = options or {}
+        self.maxsize: int = options.get('maxsize', 65536)
+        self.overflow: str = options.get('overflow', 'block')
+        self.timeout: Optional[float] = options.get('timeout')
+        self.drain: str = options.get('drain', 'thread')
+        if self.maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {self.maxsize}")
+        if self.overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}, not {self.overflow!r}")
+        if self.drain not in ('thread', 'task'):
+            raise ValueError(f"drain must be 'thread' or 'task', not {self.drain!r}")
+        self.queue: Deque[Tuple[str, Tuple[Any, ...], float]] = deque()
+        self.metrics: QueueMetrics = QueueMetrics()
+        lock = threading.Lock()
+        self._not_empty = threading.Condition(lock)
+        self._not_full = threading.Condition(lock)
+        self._idle = threading.Condition(lock)
+        self._busy: bool = False
+        self._closed: bool = False
+        self._drainer: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def emit(self, event_name: str, *args: Any):
+        """
+        Queues an event with the given name and arguments for the drain loop.
+
+        Args:
+            event_name (str): The name of the event to emit.
+            *args (Any): The arguments to pass to the event listeners.
+
+        Returns:
+            self: The current instance of the class.
+
+        Raises:
+            queue.Full: If the queue is full and the 'overflow' option is 'raise', or 'block' and `timeout` expired. An
+                emit from the drain loop never waits: with 'block', its event is queued past `maxsize`.
+            RuntimeError: If the emitter was closed.
+        """
+        metrics = self.metrics
+        with self._not_full:
+            if self._closed:
+                raise RuntimeError("cannot emit on a closed QueuedEventEmitter")
+            if len(self.queue) >= self.maxsize:
+                overflow = self.overflow
+                if overflow == 'drop-newest':
+                    metrics.dropped += 1
+                    return self
+                if overflow == 'drop-oldest':
+                    self.queue.popleft()
+                    metrics.dropped += 1
+                elif overflow == 'raise':
+                    metrics.rejected += 1
+                    raise queue.Full(f"{self.maxsize} events are already queued")
+                elif self._draining():
+                    # Only the drain loop makes room, so an emit from one of its listeners would wait for itself.
+                    pass
+                elif not self._not_full.wait_for(self._has_room, self.timeout):
+                    metrics.rejected += 1
+                    raise queue.Full(f"{self.maxsize} events are already queued")
+                elif self._closed:
+                    raise RuntimeError("cannot emit on a closed QueuedEventEmitter")
+            self.queue.append((event_name, args, time.perf_counter()))
+            metrics.enqueued += 1
+            if len(self.queue) == 1:
+                self._notify()
+        return self
+
+    def dispatcher(self, event_name: str, nargs: Optional[int] = None) -> Callable[..., None]:
+        """
+        Returns a function that queues the specified event when called with the event arguments.
+
+        Args:
+            event_name (str): The name of the event to emit.
+            nargs (Optional[int]): Accepted for compatibility with `EventEmitter.dispatcher`; the function takes any number of arguments.
+
+        Returns:
+            `Callable[..., None]:` A function behaving like `emit(event_name, *args)`, with the same overflow policy and metrics.
+        """
+        emit = self.emit
+
+        def dispatch(*args: Any) -> None:
+            emit(event_name, *args)
+        return dispatch
+
+    def emit_futures(self, event_name: str, *args: Any) -> List[Future]:
+        """
+        Not supported: the futures of `emit_futures` are created by calling the listeners, which a queued emitter only
+        does on its drain loop. The number of futures, one per listener, is not known before then either. Use `emit` to
+        queue the event, or `emit_now` to call the listeners on the calling thread.
+
+        Raises:
+            TypeError: Always, naming the supported alternatives.
+        """
+        raise TypeError("QueuedEventEmitter does not support emit_futures, since its listeners run on the drain loop; "
+                        "use emit to queue the event, or emit_now to call the listeners on the calling thread")
+
+    def emit_now(self, event_name: str, *args: Any):
+        """
+        Emits an event synchronously, on the calling thread, without going through the queue.
+
+        Args:
+            event_name (str): The name of the event to emit.
+            *args (Any): The arguments to pass to the event listeners.
+
+        Returns:
+            self: The current instance of the class.
+        """
+        return EventEmitter.emit(self, event_name, *args)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until the drain loop has delivered every queued event.
+
+        Args:
+            timeout (Optional[float]): The longest time to wait, in seconds. Defaults to None, which waits for as long as it takes.
+
+        Returns:
+            bool: True if the queue was drained; False if the timeout expired first.
+        """
+        with self._idle:
+            return self._idle.wait_for(self._is_idle, timeout)
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stops accepting events. The drain loop delivers the events that are already queued and then stops.
+
+        Args:
+            wait (bool): If True, waits until the drain thread has stopped. Defaults to True.
+        """
+        with self._not_empty:
+            self._closed = True
+            self._notify()
+            self._not_full.notify_all()
+            drainer = self._drainer
+        if wait and drainer is not None and drainer is not threading.current_thread():
+            drainer.join()
+
+    def queue_metrics(self) -> Dict[str, float]:
+        """
+        Returns the metrics of the queue.
+
+        Returns:
+            `Dict[str, float]:` 'depth' (events queued), 'maxsize', 'enqueued', 'delivered', 'dropped' (events discarded by the
+            'drop-oldest' and 'drop-newest' policies), 'rejected' (events `emit` raised `queue.Full` for), and the drain latency,
+            from `emit` to the start of the delivery, in seconds: 'latency_last', 'latency_max' and 'latency_mean'.
+        """
+        metrics = self.metrics
+        return {
+            'depth': len(self.queue),
+            'maxsize': self.maxsize,
+            'enqueued': metrics.enqueued,
+            'delivered': metrics.delivered,
+            'dropped': metrics.dropped,
+            'rejected': metrics.rejected,
+            'latency_last': metrics.latency_last,
+            'latency_max': metrics.latency_max,
+            'latency_mean': metrics.latency_total / metrics.delivered if metrics.delivered else 0.0,
+        }
+
+    async def run(self) -> None:
+        """
+        The asyncio drain loop, for the 'task' drain mode. It delivers the queued events on the event loop until the
+        emitter is closed and its queue is empty.
+
+        Example:
+        ```py
+            emitter = QueuedEventEmitter({ "drain": "task" })
+            drainer = asyncio.create_task(emitter.run())
+            ...
+            emitter.close()
+            await drainer
+        ```
+        """
+        if self.drain != 'task':
+            raise RuntimeError("run() is only used with the 'task' drain mode")
+        wakeup = asyncio.Event()
+        with self._not_empty:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = wakeup
+        try:
+            delivered = 0
+            while True:
+                item = self._take(False)
+                if item is not None:
+                    self._deliver(item)
+                    delivered += 1
+                    if delivered % YIELD_EVERY == 0:
+                        await asyncio.sleep(0)
+                    continue
+                if self._closed:
+                    return
+                wakeup.clear()
+                if not self.queue and not self._closed:
+                    await wakeup.wait()
+        finally:
+            with self._not_empty:
+                self._loop = self._wakeup = None
+
+    def _notify(self) -> None:
+        # Called with the lock held, when the queue stops being empty or the emitter is closed.
+        if self.drain == 'thread':
+            if self._drainer is None and not self._closed:
+                self._drainer = threading.Thread(target=self._drain_thread, name="QueuedEventEmitter-drain", daemon=True)
+                self._drainer.start()
+            self._not_empty.notify()
+        elif self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _drain_thread(self) -> None:
+        while True:
+            item = self._take(True)
+            if item is None:
+                return
+            self._deliver(item)
+
+    def _take(self, block: bool) -> Optional[Tuple[str, Tuple[Any, ...], float]]:
+        # Pops the next event; the delivery of the previous one is complete by now. Returns None when there is
+        # nothing to deliver: the queue is empty and, if `block`, the emitter is closed.
+        with self._not_empty:
+            self._busy = False
+            if not self.queue:
+                self._idle.notify_all()
+                if not block:
+                    return None
+                while not self.queue and not self._closed:
+                    self._not_empty.wait()
+                if not self.queue:
+                    return None
+            item = self.queue.popleft()
+            self._busy = True
+            self._not_full.notify()
+        return item
+
+    def _deliver(self, item: Tuple[str, Tuple[Any, ...], float]) -> None:
+        event_name, args, enqueued = item
+        metrics = self.metrics
+        latency = time.perf_counter() - enqueued
+        metrics.latency_last = latency
+        metrics.latency_total += latency
+        if latency > metrics.latency_max:
+            metrics.latency_max = latency
+        try:
+            EventEmitter.emit(self, event_name, *args)
+        except Exception as error:
+            # Nobody is waiting for the outcome of a queued emit; uncaught listener errors are reported like
+            # those of a thread, and do not stop the drain loop.
+            sys.excepthook(type(error), error, error.__traceback__)
+        finally:
+            metrics.delivered += 1
+
+    def _draining(self) -> bool:
+        # True when called by a listener of the drain loop: on the drain thread, or on the event loop that runs `run`.
+        if self.drain == 'thread':
+            return threading.current_thread() is self._drainer
+        if self._loop is None:
+            return False
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _has_room(self) -> bool:
+        return len(self.queue) < self.maxsize or self._closed
+
+    def _is_idle(self) -> bool:
+        return not self.queue and not self._busy
@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from .Emitter import EventEmitter
+from .chains import Chain
+from .hooks import HookHandle
+from .registry import Listeners, LockedListeners, Registration, Subscription
+from .replay import payload_size
+
+
+class ThreadSafeEventEmitter(EventEmitter):
+    """
+    An EventEmitter that can be shared between threads.
+
+    Adding and removing listeners takes the lock of the emitter. Emitting does not: `emit` reads the published
+    dispatch function of the event, which is built from an immutable snapshot of its listeners and replaced, never
+    modified, when they change. Only the first emit after a change takes the lock, to compile the new dispatch
+    function. An emit that races with a change calls either the old or the new listeners, never a mix of both.
+    """
+
+    __slots__ = ("lock",)
+
+    def __init__(self, options: Optional[Dict[str, Any]] | None) -> None:
+        """
+        Initializes a new instance of the ThreadSafeEventEmitter class.
+
+        Args:
+            options `(Optional[Dict[str, Any]]):` The same options as `EventEmitter`.
+        """
+        super().__init__(options)
+        self.lock = threading.RLock()
+
+    def off(self, event_name: str, listener: Callable[..., None]) -> None:
+        with self.lock:
+            super().off(event_name, listener)
+
+    def remove_all_listeners(self, event_name: Optional[str] = None):
+        with self.lock:
+            return super().remove_all_listeners(event_name)
+
+    def retain(self, event_name: str, last: int = 1, max_bytes: Optional[int] = None, sizeof: Callable[[tuple], int] = payload_size):
+        with self.lock:
+            return super().retain(event_name, last, max_bytes, sizeof)
+
+    def release(self, event_name: str):
+        with self.lock:
+            return super().release(event_name)
+
+    def enable_metrics(self):
+        with self.lock:
+            return super().enable_metrics()
+
+    def disable_metrics(self):
+        with self.lock:
+            return super().disable_metrics()
+
+    def _hook(self, kind: str, hook: Callable[..., Any]) -> HookHandle:
+        with self.lock:
+            return super()._hook(kind, hook)
+
+    def _unhook(self, kind: str, hook: Callable[..., Any]) -> None:
+        with self.lock:
+            super()._unhook(kind, hook)
+
+    def set_max_listeners(self, n: int, event_name: Optional[str] = None):
+        with self.lock:
+            return super().set_max_listeners(n, event_name)
+
+    def set_max_total_listeners(self, n: int):
+        with self.lock:
+            return super().set_max_total_listeners(n)
+
+    def _add(self, event_name: str, listener: Callable[..., None], prepend: bool, once: bool, executor: Optional[Executor] = None, priority: int = 0, weak: bool = False,
+             debounce: Optional[float] = None, throttle: Optional[float] = None, coalesce_by: Optional[Callable[..., Hashable]] = None) -> Subscription:
+        with self.lock:
+            return super()._add(event_name, listener, prepend, once, executor, priority, weak, debounce, throttle, coalesce_by)
+
+    def _resolve(self, event_name: str) -> Tuple[Chain, Callable[..., Any]]:
+        with self.lock:
+            return super()._resolve(event_name)
+
+    def _registry(self) -> Listeners:
+        return LockedListeners(self.lock)
+
+    def _discard(self, event_name: str, listeners: Listeners, record: Registration) -> None:
+        with self.lock:
+            super()._discard(event_name, listeners, record)
+
+    def _drop(self, event_name: str, listeners: Listeners) -> None:
+        with self.lock:
+            super()._drop(event_name, listeners)
@@ -1,2 +1,8 @@
 from .Emitter import EventEmitter
+from .AsyncEmitter import AsyncEventEmitter
+from .ThreadSafeEmitter import ThreadSafeEventEmitter
+from .QueuedEmitter import QueuedEventEmitter
+from .executors import BatchingProcessPool, BoundedThreadPool
+from .limits import MaxListenersExceededError, MaxListenersExceededWarning
+from .registry import Subscription
 from .utils import DEFAULT_LISTNER_COUNT, AbortSignal, Disposable
\ No newline at end of file
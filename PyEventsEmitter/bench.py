@@ -0,0 +1,263 @@
+"""
+Benchmarks of the emitter hot paths, with JSON output and a regression check against a stored baseline.
+
+Run with `python -m PyEventsEmitter.bench`. It prints the results as JSON, or writes them to a file with `--output`.
+`--compare baseline.json` also compares them with an earlier run and exits with status 1 if any benchmark got slower,
+or bigger, by more than the `--threshold` fraction, 0.1 by default. Every timing is the best of several repeats, in
+nanoseconds per operation; memory is in bytes per listener. Lower is better for every result.
+
+    python -m PyEventsEmitter.bench --output baseline.json
+    python -m PyEventsEmitter.bench --compare baseline.json
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from . import EventEmitter
+
+FANOUTS = (1, 4, 16, 64, 256)
+ARITIES = (0, 1, 2, 3)
+REPEAT = 5
+
+
+def listener(*args: Any) -> None:
+    pass
+
+
+def _best(operation: Callable[[], Any], number: int, repeat: int = REPEAT) -> float:
+    # Nanoseconds per call of `operation`, best of `repeat` runs of `number` calls.
+    return min(timeit.repeat(operation, number=number, repeat=repeat)) / number * 1e9
+
+
+def _emitter(fanout: int = 0, event_name: str = "tick") -> EventEmitter:
+    emitter = EventEmitter(None).set_max_listeners(0)
+    for _ in range(fanout):
+        emitter.on(event_name, listener)
+    return emitter
+
+
+def emit_fanout(scale: float) -> Dict[str, float]:
+    """
+    `emit` of a one-argument event with 1 to 256 listeners.
+    """
+    results = {}
+    for fanout in FANOUTS:
+        emit = _emitter(fanout).emit
+        results[f"emit/fanout={fanout}"] = _best(lambda: emit("tick", 1), max(1, int(200_000 * scale) // fanout))
+    return results
+
+
+def emit_arity(scale: float) -> Dict[str, float]:
+    """
+    `emit` and the specialized `dispatcher` of an event with 4 listeners, for 0 to 3 arguments.
+    """
+    results = {}
+    emitter = _emitter(4)
+    number = max(1, int(100_000 * scale))
+    for arity in ARITIES:
+        args = tuple(range(arity))
+        emit = emitter.emit
+        dispatch = emitter.dispatcher("tick", arity)
+        results[f"emit/args={arity}"] = _best(lambda: emit("tick", *args), number)
+        results[f"dispatcher/args={arity}"] = _best(lambda: dispatch(*args), number)
+    return results
+
+
+def emit_without_listeners(scale: float) -> Dict[str, float]:
+    """
+    `emit` of an event nobody listens to, on an idle emitter and on one with other events.
+    """
+    idle = EventEmitter(None)
+    busy = _emitter(4, "other")
+    number = max(1, int(500_000 * scale))
+    return {
+        "emit/no-listeners/idle": _best(lambda: idle.emit("tick", 1), number),
+        "emit/no-listeners/busy": _best(lambda: busy.emit("tick", 1), number),
+    }
+
+
+def churn(scale: float) -> Dict[str, float]:
+    """
+    Adding and removing a listener, with `off` and with the returned handle, on an event that has 64 others.
+    """
+    emitter = _emitter(64)
+    on, off = emitter.on, emitter.off
+
+    def on_off() -> None:
+        on("tick", listener)
+        off("tick", listener)
+
+    def on_dispose() -> None:
+        on("tick", listener).dispose()
+
+    def on_emit_off() -> None:
+        on("tick", listener)
+        emitter.emit("tick", 1)
+        off("tick", listener)
+
+    number = max(1, int(50_000 * scale))
+    return {
+        "churn/on+off": _best(on_off, number),
+        "churn/on+dispose": _best(on_dispose, number),
+        "churn/on+emit+off": _best(on_emit_off, max(1, number // 10)),
+    }
+
+
+def once_heavy(scale: float) -> Dict[str, float]:
+    """
+    Emitting to `once` listeners: one alongside 16 regular listeners, and 16 of them fired by a single emit.
+    """
+    mixed = _emitter(16)
+    heavy = _emitter()
+
+    def once_among_regular() -> None:
+        mixed.once("tick", listener)
+        mixed.emit("tick", 1)
+
+    def once_burst() -> None:
+        for _ in range(16):
+            heavy.once("tick", listener)
+        heavy.emit("tick", 1)
+
+    number = max(1, int(20_000 * scale))
+    return {
+        "once/1-among-16": _best(once_among_regular, number),
+        "once/16-fired-together": _best(once_burst, max(1, number // 4)),
+    }
+
+
+def memory(scale: float) -> Dict[str, float]:
+    """
+    Bytes retained per idle emitter, per first listener of an emitter, and per additional listener of an event.
+    """
+    count = max(100, int(20_000 * scale))
+    distinct = [lambda *args: None for _ in range(count)]
+
+    def traced(build: Callable[[], Any]) -> float:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        return (after - before) / count
+
+    def first_listeners() -> List[EventEmitter]:
+        emitters = [EventEmitter(None) for _ in range(count)]
+        for emitter in emitters:
+            emitter.on("change", listener)
+        return emitters
+
+    def shared_event() -> EventEmitter:
+        emitter = EventEmitter(None).set_max_listeners(0)
+        for function in distinct:
+            emitter.on("message", function)
+        return emitter
+
+    idle = traced(lambda: [EventEmitter(None) for _ in range(count)])
+    return {
+        "memory/idle-emitter": idle,
+        "memory/first-listener": traced(first_listeners) - idle,
+        "memory/listener": traced(shared_event),
+    }
+
+
+SUITES: Dict[str, Callable[[float], Dict[str, float]]] = {
+    "emit_fanout": emit_fanout,
+    "emit_arity": emit_arity,
+    "emit_without_listeners": emit_without_listeners,
+    "churn": churn,
+    "once_heavy": once_heavy,
+    "memory": memory,
+}
+
+
+def run(suites: Optional[List[str]] = None, scale: float = 1.0) -> Dict[str, Any]:
+    """
+    Runs benchmark suites.
+
+    Args:
+        suites (Optional[List[str]]): The names of the suites to run. Defaults to None, which runs all of them.
+        scale (float): Scales the number of iterations; lower is faster and noisier. Defaults to 1.0.
+
+    Returns:
+        `Dict[str, Any]:` The environment of the run under 'python' and 'platform', and the results under 'results',
+        keyed by benchmark name.
+    """
+    results: Dict[str, float] = {}
+    for name in suites or SUITES:
+        results.update(SUITES[name](scale))
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "results": {name: round(value, 2) for name, value in results.items()},
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Compares a run with a baseline run.
+
+    Args:
+        current `(Dict[str, Any]):` The output of `run`.
+        baseline `(Dict[str, Any]):` The output of an earlier `run`.
+        threshold (float): The relative change below which a difference counts as noise. Defaults to 0.1.
+
+    Returns:
+        `List[Dict[str, Any]]:` One entry per benchmark present in both runs, with the 'name', both values, the 'ratio'
+        current / baseline and a 'status' of 'regression', 'improvement' or 'unchanged'.
+    """
+    rows = []
+    for name, value in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = value / before if before else float('inf') if value else 1.0
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        rows.append({"name": name, "baseline": before, "current": value, "ratio": round(ratio, 3), "status": status})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m PyEventsEmitter.bench", description="Benchmarks the emitter hot paths.")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="run only this suite; may be repeated")
+    parser.add_argument("--scale", type=float, default=1.0, help="scales the number of iterations (default: 1.0)")
+    parser.add_argument("--output", help="write the results to this JSON file instead of standard output")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with the results stored in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change treated as noise (default: 0.1)")
+    options = parser.parse_args(argv)
+
+    current = run(options.suite, options.scale)
+    report: Dict[str, Any] = current
+    regressions: List[Dict[str, Any]] = []
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        rows = compare(current, baseline, options.threshold)
+        regressions = [row for row in rows if row["status"] == "regression"]
+        report = dict(current, comparison={"baseline": options.compare, "threshold": options.threshold, "benchmarks": rows,
+                                           "regressions": len(regressions)})
+
+    text = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    for row in regressions:
+        print(f"regression: {row['name']} {row['baseline']} -> {row['current']} ({row['ratio']}x)", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,456 @@
+import re
+from collections import OrderedDict
+from contextvars import ContextVar
+from functools import partial
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple, Union
+from .dispatch import Rejections, compile_dispatch
+from .hooks import EventHooks
+from .patterns import RegexMatcher
+from .registry import Listeners
+from .wildcards import SegmentTrie
+
+# The default number of event names whose resolved chains are cached.
+CACHE_SIZE = 1 << 17
+
+
+class AnyEvent:
+    """
+    The key of the registry of the catch-all listeners, which equals no event name and is kept out of
+    `EventEmitter.events`. The listeners of this registry are called with the emitted event name before the arguments
+    of the emit.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return 'ANY'
+
+
+ANY = AnyEvent()
+
+# A registry of a chain and its key: an event name or wildcard pattern, `ANY`, or the compiled expression of an
+# `on_pattern` subscription.
+Member = Tuple[Union[str, AnyEvent, re.Pattern], Listeners]
+
+# The value `EventEmitter.stop_propagation` sets `PROPAGATION` to.
+STOPPED = object()
+
+# The resolver of the bubbling emitter whose emit runs innermost in the current context, or `STOPPED` once a listener
+# of that emit called `stop_propagation`. Every emit with ancestors sets it and resets it when it ends, and every other
+# emit of a bubbling emitter hides it, so that a nested emit cannot stop the emit around it.
+PROPAGATION: ContextVar[Optional[object]] = ContextVar('PROPAGATION', default=None)
+
+
+class Chain:
+    """
+    The registries an emit of one event name reaches, in order, and the dispatch function compiled for them.
+
+    While none of the registries has `once` listeners, the listener calls of all of them are flattened into one
+    compiled dispatch function, so an emit that reaches wildcard subscriptions costs the same as an emit to as many
+    listeners of the event itself; the calls of the catch-all registry are bound to the event name. Otherwise the
+    registries are called in turn, each handling its `once` listeners. The hooks of the emitter are bound to the
+    emitted name and applied once to the whole chain: the emit hooks around its dispatch function and the
+    `around_listener` hooks around every call, instead of the hooks of the registries. On a bubbling emitter, `scope`
+    is its resolver: a dispatch of a chain with ancestors sets `PROPAGATION` to it, and the registries of the ancestors
+    of the event, at the indices of `stops`, are each dispatched on their own, and skipped once a listener called
+    `stop_propagation`. A dispatch of a chain without ancestors, which has nothing to stop, clears `PROPAGATION`, so
+    that a nested emit cannot stop the emit around it either.
+    The registries link back to the chains that hold them, in `Listeners.chains`, and reset `dispatch` when their
+    listeners change, or have it reset when the chain is next looked up. `used` is set by the emits that find the
+    chain in the cache, for its eviction policy, and `generation` is the generation of the resolver the chain was last
+    checked against.
+    """
+
+    __slots__ = ("name", "members", "stops", "scope", "dispatch", "used", "generation")
+
+    def __init__(self, name: str, members: Tuple[Member, ...], stops: Tuple[int, ...] = (), scope: Optional["Resolver"] = None) -> None:
+        """
+        Initializes a new instance of the Chain class.
+
+        Args:
+            name (str): The event name the chain was resolved for.
+            members `(Tuple[Member, ...]):` The keys and registries the emits reach, in emit order.
+            stops `(Tuple[int, ...]):` The indices of the members that `stop_propagation` skips. Defaults to none.
+            scope (Optional[Resolver]): The resolver of the emitter, if it bubbles. Defaults to None.
+        """
+        self.name: str = name
+        self.members: Tuple[Member, ...] = members
+        self.stops: Tuple[int, ...] = stops
+        self.scope: Optional[Resolver] = scope
+        self.dispatch: Optional[Callable[..., Any]] = None
+        self.used: bool = False
+        self.generation: int = 0
+
+    def compile(self, capture: bool = False) -> Callable[..., Any]:
+        """
+        Returns the dispatch function of the chain, building and caching it if needed.
+
+        Args:
+            capture (bool): If True, listener exceptions are collected and raised together as `Rejections` after the loop.
+
+        Returns:
+            `Callable[..., Any]:` The dispatch function. It returns True when the call removed the last registration of
+            one of the registries.
+        """
+        dispatch = self.dispatch
+        if dispatch is not None:
+            return dispatch
+        if not self.members:
+            dispatch = self.dispatch = compile_dispatch(())
+            return dispatch
+        hooks = self.hooks()
+        if self.scope is None:
+            dispatch = _compile_members(self.members, self.name, hooks, capture)
+        elif not self.stops:
+            dispatch = _compile_isolated(_compile_members(self.members, self.name, hooks, capture))
+        else:
+            # Runs of members, split before and after every member that propagation stops at.
+            runs = []
+            start = 0
+            for index in self.stops:
+                if start < index:
+                    runs.append((False, _compile_members(self.members[start:index], self.name, hooks, capture)))
+                runs.append((True, _compile_members(self.members[index:index + 1], self.name, hooks, capture)))
+                start = index + 1
+            if start < len(self.members):
+                runs.append((False, _compile_members(self.members[start:], self.name, hooks, capture)))
+            dispatch = _compile_bubbling(tuple(runs), capture, self.scope)
+        if hooks is not None:
+            dispatch = hooks.wrap_dispatch(dispatch)
+        self.dispatch = dispatch
+        return dispatch
+
+    def hooks(self) -> Optional[EventHooks]:
+        """
+        Returns the hooks of the emitter bound to the emitted event name, or None if it has none.
+        """
+        for _, listeners in self.members:
+            if listeners.hooks is not None:
+                return EventHooks(listeners.hooks.hooks, self.name)
+        return None
+
+
+def _compile_members(members: Tuple[Member, ...], event_name: str, hooks: Optional[EventHooks], capture: bool) -> Callable[..., Any]:
+    if any(listeners.once for _, listeners in members):
+        return _compile_sequence(members, event_name, hooks, capture)
+    calls: Tuple[Callable[..., Any], ...] = ()
+    for name, listeners in members:
+        if name is ANY:
+            calls += tuple(partial(call, event_name) for call in listeners.calls(hooks))
+        else:
+            calls += listeners.calls(hooks)
+    return compile_dispatch(calls, None, capture)
+
+
+def _compile_sequence(members: Tuple[Member, ...], event_name: str, hooks: Optional[EventHooks], capture: bool) -> Callable[..., Any]:
+    # Calls every registry in turn, so that each one handles its `once` listeners. The ones without `once` listeners
+    # are compiled, the others fired; neither runs the emit hooks, which surround the whole chain.
+    steps = tuple((name is ANY, compile_dispatch(listeners.calls(hooks), None, capture) if not listeners.once
+                   else partial(_fire, listeners, capture, hooks)) for name, listeners in members)
+
+    def dispatch(*args: Any) -> bool:
+        emptied = False
+        errors = None
+        for bound, step in steps:
+            try:
+                if step(*((event_name,) + args if bound else args)) is True:
+                    emptied = True
+            except Exception as error:
+                if not capture:
+                    raise
+                captured = error.errors if isinstance(error, Rejections) else [error]
+                errors = captured if errors is None else errors + captured
+        if errors is not None:
+            raise Rejections(errors)
+        return emptied
+    return dispatch
+
+
+def _fire(listeners: Listeners, capture: bool, hooks: Optional[EventHooks], *args: Any) -> bool:
+    return listeners.fire_hooked(args, capture, hooks)
+
+
+def _compile_isolated(run: Callable[..., Any]) -> Callable[..., Any]:
+    # Hides the propagation of the emit around a chain that has no ancestor to stop, so that its listeners cannot stop
+    # that emit.
+    def dispatch(*args: Any) -> Any:
+        if PROPAGATION.get() is None:
+            return run(*args)
+        token = PROPAGATION.set(None)
+        try:
+            return run(*args)
+        finally:
+            PROPAGATION.reset(token)
+    return dispatch
+
+
+def _compile_bubbling(runs: Tuple[Tuple[bool, Callable[..., Any]], ...], capture: bool, scope: "Resolver") -> Callable[..., Any]:
+    # Calls the dispatch function of every run, skipping the stoppable ones once `PROPAGATION` is `STOPPED`.
+    def dispatch(*args: Any) -> bool:
+        emptied = False
+        errors = None
+        token = PROPAGATION.set(scope)
+        try:
+            for stoppable, run in runs:
+                if stoppable and PROPAGATION.get() is STOPPED:
+                    continue
+                try:
+                    if run(*args) is True:
+                        emptied = True
+                except Exception as error:
+                    if not capture:
+                        raise
+                    captured = error.errors if isinstance(error, Rejections) else [error]
+                    errors = captured if errors is None else errors + captured
+        finally:
+            PROPAGATION.reset(token)
+        if errors is not None:
+            raise Rejections(errors)
+        return emptied
+    return dispatch
+
+
+class Resolver:
+    """
+    Resolves event names to the chain of registries their emits reach, and caches the chains.
+
+    The chain of an event name holds the registry of the name itself, if any, followed by the registries of the
+    patterns of `trie` that match it, then by those of the regular expressions of `regexes`, each in the order they
+    were subscribed. The registries of regular expressions are keyed by their compiled `re.Pattern`, which is not an
+    event name, so the resolver holds them in `registries` instead of `EventEmitter.events`, as it does the registry of
+    the catch-all listeners, keyed by `ANY`. With bubbling, the registries of the ancestors of the name, split at the `bubble` delimiter,
+    follow from the nearest to the root; the ancestors without a registry are recorded in `waiting`, so that creating
+    one evicts the chains of its descendants. The registry of the catch-all listeners, `catch_all`, comes first or
+    last, as `catch_all_first`. A chain is resolved the first time the name is emitted and cached until one of its registries is
+    removed or a registry that belongs in it is created. Adding and removing the listeners of a registry only resets
+    the dispatch functions of the chains that hold it: at once for a registry that few chains hold, and otherwise
+    lazily, by advancing `generation` and recording it as the `Listeners.version` of the registry, which a chain from
+    an earlier generation compares with the generation it was checked against the next time it is looked up.
+
+    Creating the registry of an event name evicts its chain at once. Creating the registry of a pattern only advances
+    `generation` and records the pattern in `patterns`: a chain cached in an earlier generation is checked against the
+    patterns created since the next time it is looked up, and evicted if one of them matches its name, so subscribing
+    a pattern costs the same however many chains are cached. `patterns` holds the pattern registries that are still
+    subscribed, newest last.
+
+    The chains of the names that reach no registry are cached too, so that emitting them again skips matching the
+    patterns. The cache holds at most `capacity` chains. When it is full, the chain least recently used is evicted, as
+    tracked by the second-chance approximation of LRU: the chains are kept in the order they were cached, a cache hit
+    only sets `Chain.used`, and eviction takes the oldest chain, sending it back to the end once if it was used since.
+    """
+
+    __slots__ = ("trie", "regexes", "registries", "catch_all", "catch_all_first", "bubble", "waiting", "chains", "capacity", "generation", "patterns")
+
+    def __init__(self, trie: Optional[SegmentTrie], capacity: int = CACHE_SIZE, catch_all_first: bool = True, bubble: Optional[str] = None) -> None:
+        """
+        Initializes a new instance of the Resolver class.
+
+        Args:
+            trie (Optional[SegmentTrie]): The index of the wildcard subscriptions, or None if the emitter has no 'wildcard' option.
+            capacity (int): The number of chains to cache. 0 caches every resolved chain. Defaults to `CACHE_SIZE`.
+            catch_all_first (bool): If True, the catch-all listeners are called before the others. Defaults to True.
+            bubble (Optional[str]): If given, emits bubble up the levels of the event names separated by this delimiter.
+                Defaults to None.
+        """
+        self.trie: Optional[SegmentTrie] = trie
+        self.regexes: RegexMatcher = RegexMatcher()
+        self.registries: Dict[Union[AnyEvent, re.Pattern], Listeners] = {}
+        self.catch_all: Optional[Listeners] = None
+        self.catch_all_first: bool = catch_all_first
+        self.bubble: Optional[str] = bubble
+        self.waiting: Dict[str, Set[str]] = {}
+        self.chains: OrderedDict[str, Chain] = OrderedDict()
+        self.capacity: int = capacity
+        self.generation: int = 0
+        self.patterns: List[Tuple[int, Callable[[str], Any], Listeners]] = []
+
+    def resolve(self, events: Mapping[str, Listeners], event_name: str) -> Chain:
+        """
+        Returns the chain of an event name, resolving and caching it if needed.
+
+        Args:
+            events `(Mapping[str, Listeners]):` The registries of the emitter, by name.
+            event_name (str): The emitted event name.
+        """
+        chain = self.chains.get(event_name)
+        if chain is not None:
+            if chain.generation == self.generation or self._current(chain):
+                chain.used = True
+                return chain
+            self.evict(event_name)
+        exact = events.get(event_name)
+        members: List[Member] = [(event_name, exact)] if exact is not None else []
+        if self.trie is not None:
+            for pattern, listeners in self.trie.match(event_name):
+                if listeners is not exact:
+                    members.append((pattern, listeners))
+        if self.regexes.entries:
+            members.extend(self.regexes.match(event_name))
+        if self.catch_all is not None and self.catch_all_first:
+            members.insert(0, (ANY, self.catch_all))
+        stops: Tuple[int, ...] = ()
+        missing: List[str] = []
+        if self.bubble is not None:
+            ancestors = self._ancestors(events, event_name, missing)
+            stops = tuple(range(len(members), len(members) + len(ancestors)))
+            members.extend(ancestors)
+        if self.catch_all is not None and not self.catch_all_first:
+            members.append((ANY, self.catch_all))
+        if self.capacity and len(self.chains) >= self.capacity:
+            self._evict_oldest()
+        for ancestor in missing:
+            waiting = self.waiting.get(ancestor)
+            if waiting is None:
+                waiting = self.waiting[ancestor] = set()
+            waiting.add(event_name)
+        chain = self.chains[event_name] = Chain(event_name, tuple(members), stops, self if self.bubble is not None else None)
+        chain.generation = self.generation
+        for _, listeners in members:
+            if listeners.chains is None:
+                listeners.chains = set()
+            listeners.chains.add(chain)
+            listeners.resolver = self
+        return chain
+
+    def created(self, event_name: str, listeners: Listeners) -> None:
+        """
+        Evicts the chains a new registry belongs in: the chain of its name, and for the catch-all registry every chain.
+        For a pattern, the chains of the names it matches are evicted when they are next looked up.
+        """
+        if event_name is ANY:
+            self.registries[ANY] = listeners
+            self.catch_all = listeners
+            self.clear()
+            return
+        if isinstance(event_name, re.Pattern):
+            self.registries[event_name] = listeners
+            self.regexes.add(event_name, listeners)
+            matches = event_name.match
+        elif self.trie is not None and self.trie.is_pattern(event_name):
+            self.trie.add(event_name, listeners)
+            matches = partial(self.trie.covers, event_name)
+        else:
+            self.evict(event_name)
+            for name in self.waiting.pop(event_name, ()):
+                self.evict(name)
+            return
+        self.generation += 1
+        self.patterns.append((self.generation, matches, listeners))
+
+    def changed(self, listeners: Listeners) -> None:
+        """
+        Records that the listeners of a registry held by many chains changed, in a new generation, so that the chains
+        reset their dispatch functions when they are next looked up.
+        """
+        self.generation += 1
+        listeners.version = self.generation
+
+    def removed(self, event_name: str, listeners: Listeners) -> None:
+        """
+        Evicts the chains that hold a registry removed from the emitter, and unindexes it if it is a pattern.
+        """
+        if listeners.chains:
+            for chain in list(listeners.chains):
+                self.evict(chain.name)
+        if event_name is ANY:
+            if self.catch_all is listeners:
+                del self.registries[ANY]
+                self.catch_all = None
+        elif isinstance(event_name, re.Pattern):
+            if self.registries.get(event_name) is listeners:
+                del self.registries[event_name]
+            self.regexes.remove(event_name, listeners)
+            self._forget(listeners)
+        elif self.trie is not None and self.trie.is_pattern(event_name):
+            self.trie.remove(event_name, listeners)
+            self._forget(listeners)
+
+    def idle(self) -> bool:
+        """
+        Returns True if the resolver serves no option and has no pattern or catch-all registry left, so that the
+        emitter can do without it.
+        """
+        return self.trie is None and self.bubble is None and self.catch_all is None and not self.regexes.entries
+
+    def clear(self) -> None:
+        """
+        Evicts every cached chain.
+        """
+        for event_name in list(self.chains):
+            self.evict(event_name)
+        # No chain is left from an earlier generation.
+        self.patterns.clear()
+
+    def evict(self, event_name: str) -> None:
+        """
+        Drops the cached chain of an event name and unlinks it from its registries.
+        """
+        chain = self.chains.pop(event_name, None)
+        if chain is not None:
+            self._unlink(chain)
+
+    def _current(self, chain: Chain) -> bool:
+        # Checks a chain from an earlier generation against the patterns created since, newest first, and stamps it
+        # with the current generation if none of them matches its name. The dispatch function is reset if the
+        # listeners of one of its registries changed since.
+        for generation, matches, _ in reversed(self.patterns):
+            if generation <= chain.generation:
+                break
+            if matches(chain.name):
+                return False
+        for _, listeners in chain.members:
+            if listeners.version > chain.generation:
+                chain.dispatch = None
+                break
+        chain.generation = self.generation
+        return True
+
+    def _forget(self, listeners: Listeners) -> None:
+        # Drops a removed pattern registry from `patterns`. The chains it was not checked against yet do not hold it,
+        # which is right now that it is gone.
+        self.patterns = [entry for entry in self.patterns if entry[2] is not listeners]
+
+    def _ancestors(self, events: Mapping[str, Listeners], event_name: str, missing: List[str]) -> List[Member]:
+        # The registries of the ancestors of an event name, from the nearest one. The ancestors without a registry
+        # are added to `missing`.
+        found: List[Member] = []
+        delimiter = self.bubble
+        if delimiter is None:
+            return found
+        ancestor = event_name
+        while delimiter in ancestor:
+            ancestor = ancestor.rpartition(delimiter)[0]
+            listeners = events.get(ancestor)
+            if listeners is not None:
+                found.append((ancestor, listeners))
+            else:
+                missing.append(ancestor)
+        return found
+
+    def _evict_oldest(self) -> None:
+        chains = self.chains
+        while True:
+            event_name, chain = chains.popitem(last=False)
+            if not chain.used:
+                self._unlink(chain)
+                return
+            chain.used = False
+            chains[event_name] = chain
+
+    def _unlink(self, chain: Chain) -> None:
+        # Removes an evicted chain from the registries that link to it, and from the ancestors it waits for.
+        for _, listeners in chain.members:
+            if listeners.chains is not None:
+                listeners.chains.discard(chain)
+                if not listeners.chains:
+                    listeners.resolver = None
+        delimiter = self.bubble
+        if self.waiting and delimiter is not None:
+            ancestor = chain.name
+            while delimiter in ancestor:
+                ancestor = ancestor.rpartition(delimiter)[0]
+                waiting = self.waiting.get(ancestor)
+                if waiting is not None:
+                    waiting.discard(chain.name)
+                    if not waiting:
+                        del self.waiting[ancestor]
@@ -0,0 +1,141 @@
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class Rejections(Exception):
+    """
+    Carries the exceptions captured from listeners out of a dispatch function when `captureRejections` is enabled.
+
+    It is raised once, after every listener has been called, and handled by the emitter, which delivers the
+    exceptions to the 'error' event.
+    """
+
+    def __init__(self, errors: List[Exception]) -> None:
+        """
+        Initializes a new instance of the Rejections class.
+
+        Args:
+            errors `(List[Exception]):` The captured exceptions, in listener order.
+        """
+        super().__init__(errors)
+        self.errors: List[Exception] = errors
+
+
+def _noop(*args: Any) -> None:
+    """
+    The dispatcher of an event without listeners.
+    """
+    return None
+
+
+def compile_dispatch(listeners: Tuple[Callable[..., None], ...], nargs: Optional[int] = None, capture: bool = False) -> Callable[..., Any]:
+    """
+    Builds a function that calls every listener of an event, in order, with the arguments it receives.
+
+    The function is specialized for the given listeners: an event with a single listener is dispatched by calling
+    the listener itself, and the loops for 0, 1 and 2 arguments pass their arguments positionally instead of
+    packing and unpacking `*args` for every listener. A single listener is returned as is even when `capture` is set;
+    the emitter treats any exception it raises as captured.
+
+    Args:
+        listeners `(Tuple[Callable[..., None], ...]):` The listeners to call, in emit order.
+        nargs (Optional[int]): The number of arguments the dispatcher will be called with, or None for any number.
+        capture (bool): If True, an exception raised by a listener does not stop the loop. The exceptions are collected
+            and raised together as `Rejections` after the last listener.
+
+    Returns:
+        `Callable[..., Any]:` The dispatch function. Its return value carries no meaning.
+    """
+    if not listeners:
+        return _noop
+    if len(listeners) == 1:
+        return listeners[0]
+    if capture:
+        return _compile_capturing(listeners, nargs)
+    if nargs == 0:
+        def dispatch0() -> None:
+            for listener in listeners:
+                listener()
+        return dispatch0
+    if nargs == 1:
+        def dispatch1(a: Any) -> None:
+            for listener in listeners:
+                listener(a)
+        return dispatch1
+    if nargs == 2:
+        def dispatch2(a: Any, b: Any) -> None:
+            for listener in listeners:
+                listener(a, b)
+        return dispatch2
+
+    def dispatch(*args: Any) -> None:
+        for listener in listeners:
+            listener(*args)
+    return dispatch
+
+
+def _compile_capturing(listeners: Tuple[Callable[..., None], ...], nargs: Optional[int] = None) -> Callable[..., None]:
+    # The inner loop is the plain loop, so capturing costs one iterator and one try block per emit until a listener
+    # fails. The loop then resumes from the same iterator, after the listener that raised.
+    if nargs == 0:
+        def dispatch0() -> None:
+            remaining = iter(listeners)
+            errors = None
+            while True:
+                try:
+                    for listener in remaining:
+                        listener()
+                    break
+                except Exception as error:
+                    errors = _captured(errors, error)
+            if errors is not None:
+                raise Rejections(errors)
+        return dispatch0
+    if nargs == 1:
+        def dispatch1(a: Any) -> None:
+            remaining = iter(listeners)
+            errors = None
+            while True:
+                try:
+                    for listener in remaining:
+                        listener(a)
+                    break
+                except Exception as error:
+                    errors = _captured(errors, error)
+            if errors is not None:
+                raise Rejections(errors)
+        return dispatch1
+    if nargs == 2:
+        def dispatch2(a: Any, b: Any) -> None:
+            remaining = iter(listeners)
+            errors = None
+            while True:
+                try:
+                    for listener in remaining:
+                        listener(a, b)
+                    break
+                except Exception as error:
+                    errors = _captured(errors, error)
+            if errors is not None:
+                raise Rejections(errors)
+        return dispatch2
+
+    def dispatch(*args: Any) -> None:
+        remaining = iter(listeners)
+        errors = None
+        while True:
+            try:
+                for listener in remaining:
+                    listener(*args)
+                break
+            except Exception as error:
+                errors = _captured(errors, error)
+        if errors is not None:
+            raise Rejections(errors)
+    return dispatch
+
+
+def _captured(errors: Optional[List[Exception]], error: Exception) -> List[Exception]:
+    if errors is None:
+        return [error]
+    errors.append(error)
+    return errors
@@ -0,0 +1,296 @@
+import importlib
+import pickle
+import queue
+import threading
+import time
+from concurrent.futures import CancelledError, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
+
+
+class BoundedThreadPool(ThreadPoolExecutor):
+    """
+    A thread pool for listeners that block, with a bounded number of pending calls.
+
+    `ThreadPoolExecutor` queues every submitted call, so a producer that emits faster than the listeners complete
+    makes its queue grow without limit. This pool admits at most `max_pending` calls that are queued or running;
+    `submit` then waits for one of them to complete, which pushes back on the emitting thread instead of growing
+    memory.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: int = 1024, timeout: Optional[float] = None, **kwargs: Any) -> None:
+        """
+        Initializes a new instance of the BoundedThreadPool class.
+
+        Args:
+            max_workers (Optional[int]): The number of worker threads. Defaults to the `ThreadPoolExecutor` default.
+            max_pending (int): The maximum number of calls that are queued or running at the same time. Defaults to 1024.
+            timeout (Optional[float]): How long `submit` waits for a free slot before raising `queue.Full`. Defaults to None,
+                which waits for as long as it takes. 0 never waits.
+            **kwargs (Any): Passed to `ThreadPoolExecutor`.
+        """
+        super().__init__(max_workers, **kwargs)
+        self.max_pending: int = max_pending
+        self.timeout: Optional[float] = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        """
+        Schedules `fn(*args, **kwargs)` on a worker thread, once a slot is free.
+
+        Args:
+            fn (Callable[..., Any]): The function to call.
+            *args (Any): The positional arguments of the call.
+            **kwargs (Any): The keyword arguments of the call.
+
+        Returns:
+            Future: The future of the call.
+
+        Raises:
+            queue.Full: If no slot became free within `timeout`.
+        """
+        if self.timeout == 0:
+            acquired = self._slots.acquire(blocking=False)
+        else:
+            acquired = self._slots.acquire(timeout=self.timeout)
+        if not acquired:
+            raise queue.Full(f"{self.max_pending} listener calls are already pending")
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future: Future) -> None:
+        self._slots.release()
+
+
+_resolved: Dict[str, Callable[..., Any]] = {}
+
+
+def resolve(reference: Union[str, Callable[..., Any]]) -> Callable[..., Any]:
+    """
+    Returns the function an importable reference points to.
+
+    Args:
+        reference `(Union[str, Callable[..., Any]]):` A reference of the form 'package.module:function', where the part
+            after the colon may be a dotted attribute path such as 'Class.method'. A callable is returned as is.
+
+    Returns:
+        `Callable[..., Any]:` The referenced function. References are resolved once per process and cached.
+    """
+    if not isinstance(reference, str):
+        return reference
+    function = _resolved.get(reference)
+    if function is None:
+        module_name, _, path = reference.partition(':')
+        if not path:
+            raise ValueError(f"{reference!r} is not a 'package.module:function' reference")
+        target: Any = importlib.import_module(module_name)
+        for name in path.split('.'):
+            target = getattr(target, name)
+        function = _resolved[reference] = target
+    return function
+
+
+# The shared memory segments of the worker process that could not be closed yet, because an argument or a result
+# still used one of their buffers when the batch completed.
+_mapped: List[SharedMemory] = []
+
+
+def _run_batch(frame: bytes, segment: Optional[str], spans: List[Tuple[int, int]]) -> List[Tuple[bool, Any]]:
+    # Runs in a worker process: loads the batch with its out-of-band buffers, which are views of the shared memory
+    # segment, calls every listener of the batch and reports each outcome.
+    shared = SharedMemory(segment) if segment is not None else None
+    memory = shared.buf if shared is not None else None
+    buffers: List[Any]
+    if memory is not None:
+        buffers = [memory[start:start + size] for start, size in spans]
+    else:
+        buffers = [memoryview(bytearray()) for _ in spans]
+    try:
+        return _call_all(pickle.loads(frame, buffers=buffers))
+    finally:
+        del buffers, memory
+        if shared is not None:
+            _mapped.append(shared)
+        for mapped in list(_mapped):
+            try:
+                mapped.close()
+            except BufferError:
+                continue
+            _mapped.remove(mapped)
+
+
+def _call_all(calls: List[Tuple[Union[str, Callable[..., Any]], Tuple[Any, ...]]]) -> List[Tuple[bool, Any]]:
+    outcomes: List[Tuple[bool, Any]] = []
+    for listener, args in calls:
+        try:
+            outcomes.append((True, resolve(listener)(*args)))
+        except Exception as error:
+            outcomes.append((False, error))
+    return outcomes
+
+
+def _share(buffers: List[pickle.PickleBuffer]) -> Tuple[Optional[SharedMemory], List[Tuple[int, int]]]:
+    # Copies the out-of-band buffers of a batch end to end into a new shared memory segment, and returns the segment,
+    # or None if the buffers are empty, with the offset and the length of every buffer.
+    views = [buffer.raw() for buffer in buffers]
+    spans = []
+    size = 0
+    for view in views:
+        spans.append((size, view.nbytes))
+        size += view.nbytes
+    if not size:
+        return None, spans
+    shared = SharedMemory(create=True, size=size)
+    memory = cast(memoryview, shared.buf)
+    for view, (start, length) in zip(views, spans):
+        memory[start:start + length] = view
+    return shared, spans
+
+
+def _unlink(shared: Optional[SharedMemory]) -> None:
+    if shared is not None:
+        shared.close()
+        shared.unlink()
+
+
+class BatchingProcessPool(Executor):
+    """
+    A process pool for CPU-bound listeners, which ships listener calls to the worker processes in batches.
+
+    Listeners are registered by importable reference ('package.module:function') so that the worker processes can
+    import them. Calls are collected until `batch_size` of them are pending or `linger` seconds have passed since the
+    first one, and then pickled together as one protocol 5 frame. The out-of-band buffers of the frame, those of NumPy
+    arrays or of arguments wrapped in `pickle.PickleBuffer`, are not pickled into it: they are copied once into a
+    shared memory segment, and the worker loads them as views of the segment, so only the frame and the name of the
+    segment go through the call queue of the process pool. The segment is unlinked when the batch completes. Every
+    call gets its own future, which receives the result or the exception of the listener.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, batch_size: int = 64, linger: float = 0.002, **kwargs: Any) -> None:
+        """
+        Initializes a new instance of the BatchingProcessPool class.
+
+        Args:
+            max_workers (Optional[int]): The number of worker processes. Defaults to the `ProcessPoolExecutor` default.
+            batch_size (int): The number of calls that are sent to a worker together. Defaults to 64.
+            linger (float): The longest time, in seconds, a call waits for its batch to fill up. Defaults to 0.002.
+            **kwargs (Any): Passed to `ProcessPoolExecutor`.
+        """
+        self.batch_size: int = batch_size
+        self.linger: float = linger
+        self._executor = ProcessPoolExecutor(max_workers, **kwargs)
+        self._ready = threading.Condition()
+        self._calls: List[Tuple[Union[str, Callable[..., Any]], Tuple[Any, ...]]] = []
+        self._futures: List[Future] = []
+        self._deadline: float = 0.0
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, fn: Union[str, Callable[..., Any]], /, *args: Any, **kwargs: Any) -> Future:
+        """
+        Adds a listener call to the current batch.
+
+        Args:
+            fn `(Union[str, Callable[..., Any]]):` An importable reference to the listener, or a function that can be pickled by reference.
+            *args (Any): The arguments of the call. They must be picklable.
+
+        Returns:
+            Future: The future of the call.
+        """
+        if kwargs:
+            raise TypeError("listener calls do not take keyword arguments")
+        future: Future = Future()
+        with self._ready:
+            if self._closed:
+                raise RuntimeError("cannot submit listener calls after shutdown")
+            self._calls.append((fn, args))
+            self._futures.append(future)
+            if len(self._calls) >= self.batch_size:
+                self._send()
+            elif len(self._calls) == 1:
+                self._deadline = time.monotonic() + self.linger
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._linger, name="BatchingProcessPool-flusher", daemon=True)
+                    self._flusher.start()
+                self._ready.notify()
+        return future
+
+    def flush(self) -> None:
+        """
+        Sends the pending calls to a worker without waiting for the batch to fill up.
+        """
+        with self._ready:
+            if self._calls:
+                self._send()
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Sends the pending calls and shuts the worker processes down.
+
+        Args:
+            wait (bool): If True, waits until every call has completed. Defaults to True.
+            cancel_futures (bool): If True, cancels the batches that have not started yet. Defaults to False.
+        """
+        with self._ready:
+            if self._calls:
+                self._send()
+            self._closed = True
+            self._ready.notify()
+        self._executor.shutdown(wait, cancel_futures=cancel_futures)
+
+    def _linger(self) -> None:
+        # Sends the pending calls at the deadline set by the first of them. Being woken up by the first call of the
+        # next batch, while the previous one was sent full in the meantime, only moves the wait to the new deadline.
+        with self._ready:
+            while not self._closed:
+                if not self._calls:
+                    self._ready.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._ready.wait(remaining)
+                else:
+                    self._send()
+
+    def _send(self) -> None:
+        # Called with the condition held. Calls whose future was cancelled in the meantime are left out.
+        calls, futures = [], []
+        for call, future in zip(self._calls, self._futures):
+            if future.set_running_or_notify_cancel():
+                calls.append(call)
+                futures.append(future)
+        self._calls, self._futures = [], []
+        if not calls:
+            return
+        shared = None
+        try:
+            buffers: List[pickle.PickleBuffer] = []
+            frame = pickle.dumps(calls, protocol=5, buffer_callback=buffers.append)
+            shared, spans = _share(buffers)
+            batch = self._executor.submit(_run_batch, frame, shared.name if shared is not None else None, spans)
+        except Exception as error:
+            _unlink(shared)
+            for future in futures:
+                future.set_exception(error)
+            return
+        batch.add_done_callback(partial(_settle, futures, shared))
+
+
+def _settle(futures: List[Future], shared: Optional[SharedMemory], batch: Future) -> None:
+    _unlink(shared)
+    error = batch.exception() if not batch.cancelled() else CancelledError()
+    if error is not None:
+        for future in futures:
+            future.set_exception(error)
+        return
+    for future, (ok, value) in zip(futures, batch.result()):
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
@@ -0,0 +1,216 @@
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple
+from .dispatch import Rejections
+from .utils import Disposable
+
+if TYPE_CHECKING:
+    from .Emitter import EventEmitter
+    from .registry import Registration
+
+
+class EmitContext:
+    """
+    What `before_emit` and `after_emit` hooks receive about an emit.
+
+    `start` and `end` are `time.perf_counter_ns()` readings taken right before the first listener is called and right
+    after the last one returned; `end` is None in `before_emit` hooks. `error` is the exception that escaped the
+    listeners, if any; the exceptions captured with 'captureRejections' are grouped in an `ExceptionGroup`. It is set
+    even when `emit` then delivers the captured exceptions to the 'error' event instead of raising them, so a tracer
+    sees the failure either way; `emit_async` only sets it when it raises. `data` is free for the hooks, for example to
+    carry a tracing span from `before_emit` to `after_emit`.
+    """
+
+    __slots__ = ("event_name", "args", "start", "end", "error", "data")
+
+    def __init__(self, event_name: str, args: Tuple[Any, ...]) -> None:
+        """
+        Initializes a new instance of the EmitContext class.
+
+        Args:
+            event_name (str): The name of the event.
+            args `(Tuple[Any, ...]):` The arguments of the emit.
+        """
+        self.event_name: str = event_name
+        self.args: Tuple[Any, ...] = args
+        self.start: int = 0
+        self.end: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.data: Any = None
+
+    @property
+    def duration(self) -> Optional[int]:
+        """
+        Optional[int]: The time the listeners took, in nanoseconds, or None before they completed.
+        """
+        return None if self.end is None else self.end - self.start
+
+
+class ListenerContext(EmitContext):
+    """
+    What `around_listener` hooks receive about a listener call: the `EmitContext` fields, for this call only, and the
+    `listener` being called. `start`, `end` and `error` are set by the `proceed` function the hook calls.
+    """
+
+    __slots__ = ("record",)
+
+    def __init__(self, event_name: str, args: Tuple[Any, ...], record: "Registration") -> None:
+        """
+        Initializes a new instance of the ListenerContext class.
+
+        Args:
+            event_name (str): The name of the event.
+            args `(Tuple[Any, ...]):` The arguments of the emit.
+            record (Registration): The registration of the listener.
+        """
+        super().__init__(event_name, args)
+        self.record: "Registration" = record
+
+    @property
+    def listener(self) -> Optional[Callable[..., Any]]:
+        """
+        `Optional[Callable[..., Any]]:` The listener, as it was registered; None if it was a weak listener that is gone.
+        """
+        record = self.record
+        return record.listener if record.key is record.listener else record.listener()
+
+
+class Hooks:
+    """
+    The hooks of an emitter. Instances are immutable: adding or removing a hook creates new ones, which are handed to
+    the registries of the events, and the dispatch functions are recompiled with them.
+    """
+
+    __slots__ = ("before", "after", "around")
+
+    def __init__(self, before: Tuple[Callable[..., Any], ...] = (), after: Tuple[Callable[..., Any], ...] = (),
+                 around: Tuple[Callable[..., Any], ...] = ()) -> None:
+        """
+        Initializes a new instance of the Hooks class.
+
+        Args:
+            before `(Tuple[Callable[..., Any], ...]):` The `before_emit` hooks, in call order.
+            after `(Tuple[Callable[..., Any], ...]):` The `after_emit` hooks, in call order.
+            around `(Tuple[Callable[..., Any], ...]):` The `around_listener` hooks, outermost first.
+        """
+        self.before: Tuple[Callable[..., Any], ...] = before
+        self.after: Tuple[Callable[..., Any], ...] = after
+        self.around: Tuple[Callable[..., Any], ...] = around
+
+    def __bool__(self) -> bool:
+        return bool(self.before or self.after or self.around)
+
+
+class EventHooks:
+    """
+    The hooks of an emitter, bound to the name of one event, as held by the registry of that event.
+    """
+
+    __slots__ = ("hooks", "event_name")
+
+    def __init__(self, hooks: Hooks, event_name: str) -> None:
+        self.hooks: Hooks = hooks
+        self.event_name: str = event_name
+
+    def begin(self, args: Tuple[Any, ...]) -> Optional[EmitContext]:
+        """
+        Calls the `before_emit` hooks and starts timing the emit. Returns None if there are no emit hooks.
+        """
+        if not self.hooks.before and not self.hooks.after:
+            return None
+        context = EmitContext(self.event_name, args)
+        for hook in self.hooks.before:
+            hook(context)
+        context.start = time.perf_counter_ns()
+        return context
+
+    def end(self, context: Optional[EmitContext], error: Optional[BaseException] = None) -> None:
+        """
+        Stops timing the emit and calls the `after_emit` hooks.
+        """
+        if context is None:
+            return
+        context.end = time.perf_counter_ns()
+        if error is not None:
+            context.error = ExceptionGroup(f"listeners of {self.event_name!r} raised", error.errors) if isinstance(error, Rejections) else error
+        for hook in self.hooks.after:
+            hook(context)
+
+    def wrap_dispatch(self, dispatch: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Returns `dispatch` surrounded by the emit hooks, or `dispatch` itself if there are none.
+        """
+        if not self.hooks.before and not self.hooks.after:
+            return dispatch
+        begin = self.begin
+        end = self.end
+
+        def dispatch_hooked(*args: Any) -> Any:
+            context = begin(args)
+            try:
+                result = dispatch(*args)
+            except BaseException as error:
+                end(context, error)
+                raise
+            end(context)
+            return result
+        return dispatch_hooked
+
+    def wrap_call(self, record: "Registration", call: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Returns `call` surrounded by the `around_listener` hooks, or `call` itself if there are none.
+        """
+        around = self.hooks.around
+        if not around:
+            return call
+        event_name = self.event_name
+
+        def call_around(*args: Any) -> Any:
+            context = ListenerContext(event_name, args, record)
+            step = partial(_proceed, context, call)
+            for hook in reversed(around):
+                step = partial(hook, context, step)
+            return step()
+        return call_around
+
+
+def _proceed(context: ListenerContext, call: Callable[..., Any]) -> Any:
+    # The innermost step of an `around_listener` chain: calls the listener and records the outcome.
+    context.start = time.perf_counter_ns()
+    try:
+        return call(*context.args)
+    except BaseException as error:
+        context.error = error
+        raise
+    finally:
+        context.end = time.perf_counter_ns()
+
+
+class HookHandle(Disposable):
+    """
+    A handle to a hook, returned by `before_emit`, `after_emit` and `around_listener`. Disposing it removes the hook.
+    """
+
+    __slots__ = ("emitter", "kind", "hook")
+
+    def __init__(self, emitter: "EventEmitter", kind: str, hook: Callable[..., Any]) -> None:
+        """
+        Initializes a new instance of the HookHandle class.
+
+        Args:
+            emitter (EventEmitter): The emitter the hook was added to.
+            kind (str): 'before', 'after' or 'around'.
+            hook `(Callable[..., Any]):` The hook.
+        """
+        self.emitter: Optional["EventEmitter"] = emitter
+        self.kind: str = kind
+        self.hook: Callable[..., Any] = hook
+
+    def dispose(self) -> None:
+        """
+        Removes the hook from the emitter. Disposing the handle more than once has no effect.
+        """
+        emitter = self.emitter
+        if emitter is not None:
+            self.emitter = None
+            emitter._unhook(self.kind, self.hook)
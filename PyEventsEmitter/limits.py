@@ -0,0 +1,155 @@
+import os
+import sys
+import traceback
+import warnings
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Set, Union
+from .utils import DEFAULT_LISTNER_COUNT
+
+if TYPE_CHECKING:
+    from .Emitter import EventEmitter
+
+# Frames of this package are left out of the registration stack, so it starts at the code that added the listener.
+_PACKAGE = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+# The number of frames kept in the registration stack.
+STACK_DEPTH = 8
+
+Mode = Union[str, Callable[["EventEmitter", Optional[str], int, int, traceback.StackSummary], Any]]
+
+
+class MaxListenersExceededWarning(RuntimeWarning):
+    """
+    Warns that more listeners were added than the limit allows, which usually means that listeners leak.
+    """
+
+
+class MaxListenersExceededError(RuntimeError):
+    """
+    Raised instead of adding a listener that would exceed the limit, when the emitter is in 'raise' mode.
+    """
+
+
+class ListenerLimits:
+    """
+    The listener limits of an emitter and what to do when they are exceeded.
+
+    `threshold` is the lowest listener count at which adding a listener to an event may exceed a limit, so that
+    adding a listener below it costs a single comparison. Only at or above it are the per-event limit and the total
+    limit worked out. The total is tracked by `counted`, an upper bound of the number of listeners of the emitter
+    that is only recounted when it exceeds the total limit, because listeners are removed without the limits knowing.
+    Emitters that keep the defaults share `DEFAULT_LIMITS`; the others get their own copy.
+    """
+
+    __slots__ = ("default", "events", "total", "mode", "warned", "counted", "threshold")
+
+    def __init__(self, mode: Mode = 'warn') -> None:
+        """
+        Initializes a new instance of the ListenerLimits class.
+
+        Args:
+            mode `(Union[str, Callable[..., Any]]):` 'warn', 'raise', or a callback. Defaults to 'warn'.
+        """
+        if mode not in ('warn', 'raise') and not callable(mode):
+            raise ValueError(f"max listeners mode must be 'warn', 'raise' or a callable, not {mode!r}")
+        self.default: int = DEFAULT_LISTNER_COUNT
+        self.events: Optional[Dict[str, int]] = None
+        self.total: int = 0
+        self.mode: Mode = mode
+        self.warned: Optional[Set[Optional[str]]] = None
+        self.counted: int = 0
+        self.threshold: int = DEFAULT_LISTNER_COUNT
+
+    def copy(self) -> "ListenerLimits":
+        """
+        Returns a copy of the limits, without the record of the events that were already reported.
+        """
+        limits = ListenerLimits(self.mode)
+        limits.default = self.default
+        limits.events = dict(self.events) if self.events else None
+        limits.total = self.total
+        limits.threshold = self.threshold
+        return limits
+
+    def limit(self, event_name: Optional[str] = None) -> int:
+        """
+        Returns the limit of an event, or the default limit if no event is given. 0 means unlimited.
+        """
+        if event_name is not None and self.events:
+            return self.events.get(event_name, self.default)
+        return self.default
+
+    def update(self) -> None:
+        """
+        Recomputes `threshold` after a limit changed.
+        """
+        if self.total:
+            self.threshold = 0
+            return
+        limits = [limit for limit in (self.default, *(self.events or {}).values()) if limit]
+        self.threshold = min(limits) if limits else sys.maxsize
+
+    def admit(self, emitter: "EventEmitter", event_name: str, count: int) -> None:
+        """
+        Checks the limits before a listener is added to an event.
+
+        Args:
+            emitter (EventEmitter): The emitter the listener is added to.
+            event_name (str): The name of the event.
+            count (int): The number of listeners the event will have once the listener is added.
+
+        Raises:
+            MaxListenersExceededError: If a limit is exceeded in 'raise' mode.
+        """
+        limit = self.limit(event_name)
+        if limit and count > limit:
+            self.report(emitter, event_name, count, limit)
+        if self.total:
+            counted = self.counted + 1
+            if counted > self.total:
+                counted = sum(len(listeners) for _, listeners in emitter._registries()) + 1
+                if counted > self.total:
+                    self.counted = counted - 1
+                    self.report(emitter, None, counted, self.total)
+            self.counted = counted
+
+    def report(self, emitter: "EventEmitter", event_name: Optional[str], count: int, limit: int) -> None:
+        """
+        Handles an exceeded limit according to the mode. `event_name` is None for the total limit.
+
+        'raise' raises every time; 'warn' and callbacks report each event, and the total, once. The registration
+        stack is only captured when a report is made.
+        """
+        if event_name is None:
+            message = (f"{count} listeners added to {emitter.__class__.__name__} in total. The total limit is {limit}. "
+                       "Use set_max_total_listeners() to increase it.")
+        else:
+            message = (f"Possible EventEmitter memory leak detected. {count} {event_name!r} listeners added to "
+                       f"{emitter.__class__.__name__}. MaxListeners is {limit}. Use set_max_listeners() to increase it.")
+        if self.mode == 'raise':
+            raise MaxListenersExceededError(message)
+        if self.warned is None:
+            self.warned = set()
+        elif event_name in self.warned:
+            return
+        self.warned.add(event_name)
+        stack = registration_stack()
+        mode = self.mode
+        if isinstance(mode, str):
+            frame = stack[-1]
+            warnings.warn_explicit(f"{message}\nRegistered at:\n{''.join(stack.format())}", MaxListenersExceededWarning,
+                                   frame.filename, frame.lineno or 0)
+        else:
+            mode(emitter, event_name, count, limit, stack)
+
+
+def registration_stack() -> traceback.StackSummary:
+    """
+    Returns the stack of the code that is adding a listener, without the frames of this package.
+    """
+    frame = sys._getframe(1)
+    while frame.f_back is not None and frame.f_code.co_filename.startswith(_PACKAGE):
+        frame = frame.f_back
+    return traceback.extract_stack(frame, limit=STACK_DEPTH)
+
+
+DEFAULT_LIMITS = ListenerLimits()
@@ -0,0 +1,178 @@
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
+
+if TYPE_CHECKING:
+    from .registry import Registration
+
+# Every power of two is split into 2 ** SUB_BITS buckets, so a recorded value is off by less than 1 / 2 ** SUB_BITS.
+SUB_BITS = 3
+SUB_BUCKETS = 1 << SUB_BITS
+BUCKETS = (64 - SUB_BITS + 1) * SUB_BUCKETS
+
+
+def _bucket(value: int) -> int:
+    # Values below SUB_BUCKETS get a bucket each; above, the bucket is the exponent and the next SUB_BITS bits.
+    exponent = value.bit_length() - SUB_BITS - 1
+    if exponent <= 0:
+        return value
+    return (exponent + 1) * SUB_BUCKETS + ((value >> exponent) & (SUB_BUCKETS - 1))
+
+
+def _lowest(bucket: int) -> int:
+    # The smallest value that falls into a bucket.
+    exponent = bucket // SUB_BUCKETS - 1
+    if exponent <= 0:
+        return bucket
+    return (SUB_BUCKETS + bucket % SUB_BUCKETS) << exponent
+
+
+class Histogram:
+    """
+    A log-bucketed histogram of non-negative integers, in the manner of HdrHistogram.
+
+    Recording a value costs a `bit_length` and a list increment, whatever the value; nothing else is updated. Values
+    are kept with a relative precision of 1 / 8 up to 2 ** 64, in a fixed array of buckets, and every statistic is
+    derived from the buckets: the mean, minimum, maximum and percentiles report the lowest value of their bucket.
+    """
+
+    __slots__ = ("counts",)
+
+    def __init__(self) -> None:
+        """
+        Initializes a new, empty instance of the Histogram class.
+        """
+        self.counts: List[int] = [0] * BUCKETS
+
+    def record(self, value: int) -> None:
+        """
+        Records a value.
+
+        Args:
+            value (int): The value, such as a latency in nanoseconds. Negative values are recorded as 0.
+        """
+        self.counts[_bucket(value) if value > 0 else 0] += 1
+
+    def percentile(self, percent: float) -> int:
+        """
+        Returns the value below which `percent` percent of the recorded values fall, or 0 if nothing was recorded.
+        """
+        count = sum(self.counts)
+        if not count:
+            return 0
+        rank = max(1, round(count * percent / 100))
+        seen = 0
+        for bucket, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return _lowest(bucket)
+        return 0
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Returns the count, mean, minimum, maximum and the 50th, 90th, 99th and 99.9th percentiles.
+        """
+        used = [(bucket, count) for bucket, count in enumerate(self.counts) if count]
+        count = sum(count for _, count in used)
+        return {
+            'count': count,
+            'mean': sum(_lowest(bucket) * bucket_count for bucket, bucket_count in used) / count if count else 0.0,
+            'min': _lowest(used[0][0]) if used else 0,
+            'max': _lowest(used[-1][0]) if used else 0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'p999': self.percentile(99.9),
+        }
+
+
+def timed(call: Callable[..., Any], histogram: Histogram) -> Callable[..., Any]:
+    """
+    Returns a function that calls `call` and records how long it took, in nanoseconds, into `histogram`.
+    """
+    counts = histogram.counts
+    clock = time.perf_counter_ns
+
+    def call_timed(*args: Any) -> Any:
+        start = clock()
+        try:
+            return call(*args)
+        finally:
+            # Histogram.record and _bucket, inlined: this runs for every listener call.
+            elapsed = clock() - start
+            exponent = elapsed.bit_length() - SUB_BITS - 1
+            counts[(exponent + 1) * SUB_BUCKETS + ((elapsed >> exponent) & (SUB_BUCKETS - 1)) if exponent > 0 else elapsed] += 1
+    return call_timed
+
+
+class EventMetrics:
+    """
+    The metrics of one event: the fan-out of every emit, which also counts the emits, and the call latency of every
+    listener.
+
+    Emits of an event without listeners are not counted. Counters are updated without locking, so concurrent emits
+    may lose a few counts.
+    """
+
+    __slots__ = ("fanout", "latency", "calls")
+
+    def __init__(self) -> None:
+        """
+        Initializes a new instance of the EventMetrics class.
+        """
+        self.fanout: Histogram = Histogram()
+        self.latency: Dict["Registration", Histogram] = {}
+        self.calls: Dict["Registration", Callable[..., Any]] = {}
+
+    def emitted(self, fanout: int) -> None:
+        """
+        Records an emit that calls `fanout` listeners.
+        """
+        self.fanout.record(fanout)
+
+    def recorder(self, fanout: int) -> Callable[..., None]:
+        """
+        Returns a function that records an emit that calls `fanout` listeners, whatever the arguments of the emit.
+        """
+        bucket = _bucket(fanout)
+        counts = self.fanout.counts
+
+        def record_emit(*args: Any) -> None:
+            counts[bucket] += 1
+        return record_emit
+
+    def call(self, record: "Registration") -> Callable[..., Any]:
+        """
+        Returns the timed call of a registration, creating it the first time.
+        """
+        call = self.calls.get(record)
+        if call is None:
+            histogram = self.latency.get(record)
+            if histogram is None:
+                histogram = self.latency[record] = Histogram()
+            call = self.calls[record] = timed(record.call, histogram)
+        return call
+
+    def prune(self, records: "tuple[Registration, ...]") -> None:
+        """
+        Forgets the registrations that are no longer registered.
+        """
+        if len(self.latency) > len(records):
+            current = set(records)
+            self.latency = {record: histogram for record, histogram in self.latency.items() if record in current}
+            self.calls = {record: call for record, call in self.calls.items() if record in current}
+
+    def summary(self, records: "tuple[Registration, ...]") -> Dict[str, Any]:
+        """
+        Returns the metrics of the event, with the latency of the given registrations in emit order.
+        """
+        listeners = []
+        for record in records:
+            histogram = self.latency.get(record)
+            listener = record.listener if record.key is record.listener else record.listener()
+            listeners.append({
+                'listener': listener,
+                'name': getattr(listener, '__qualname__', repr(listener)),
+                'latency_ns': histogram.summary() if histogram is not None else Histogram().summary(),
+            })
+        fanout = self.fanout.summary()
+        return {'emits': fanout['count'], 'fanout': fanout, 'listeners': listeners}
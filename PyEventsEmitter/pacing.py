@@ -0,0 +1,200 @@
+import heapq
+import itertools
+import sys
+import threading
+import time
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+
+class Timers:
+    """
+    A single timer thread shared by every paced listener.
+
+    Calls are kept in a heap ordered by deadline, so scheduling one costs O(log n) and no thread is created per
+    listener or per call. The thread is started by the first call that is scheduled. The scheduled functions run on
+    the timer thread and must be quick; exceptions they raise are reported through `sys.excepthook`.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new instance of the Timers class.
+        """
+        self._heap: List[Tuple[float, int, Callable[[], Any]]] = []
+        self._ready = threading.Condition()
+        self._counter = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+
+    def call_at(self, deadline: float, function: Callable[[], Any]) -> Tuple[float, int, Callable[[], Any]]:
+        """
+        Schedules a function to be called on the timer thread.
+
+        Args:
+            deadline (float): When to call the function, in `time.monotonic()` seconds.
+            function `(Callable[[], Any]):` The function to call.
+
+        Returns:
+            `Tuple[float, int, Callable[[], Any]]:` The scheduled entry, which `cancel` takes.
+        """
+        entry = (deadline, next(self._counter), function)
+        with self._ready:
+            heapq.heappush(self._heap, entry)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="PyEventsEmitter-timers", daemon=True)
+                self._thread.start()
+            elif self._heap[0] is entry:
+                self._ready.notify()
+        return entry
+
+    def cancel(self, entry: Tuple[float, int, Callable[[], Any]]) -> None:
+        """
+        Unschedules an entry returned by `call_at`. Entries that already ran, or are running, are ignored.
+
+        Args:
+            entry `(Tuple[float, int, Callable[[], Any]]):` The entry to unschedule.
+        """
+        with self._ready:
+            try:
+                self._heap.remove(entry)
+            except ValueError:
+                return
+            heapq.heapify(self._heap)
+
+    def _run(self) -> None:
+        heap = self._heap
+        while True:
+            with self._ready:
+                while not heap or heap[0][0] > time.monotonic():
+                    self._ready.wait(heap[0][0] - time.monotonic() if heap else None)
+                function = heapq.heappop(heap)[2]
+            try:
+                function()
+            except Exception as error:
+                sys.excepthook(type(error), error, error.__traceback__)
+
+
+TIMERS = Timers()
+
+_NOTHING: Tuple[Any, ...] = ()
+
+
+class PacedCall:
+    """
+    Calls a listener at a limited rate, with the latest arguments it was called with.
+
+    - `debounce`: the listener is called once the calls have stopped for `debounce` seconds.
+    - `throttle`: the listener is called at most once every `throttle` seconds. The first call of a burst goes through
+      right away; the calls that follow within the interval are delivered together at its end.
+    - `coalesce_by`: the pending calls are kept per key, `coalesce_by(*args)`, and the listener is called once per key
+      with the latest arguments of that key. Without `debounce` or `throttle`, pending calls are delivered as soon as the
+      timer thread gets to them, which coalesces bursts.
+
+    Delayed calls run on the shared timer thread. Calling a `PacedCall` costs a lock and, at most, one timer per
+    interval: a debounce that is extended only moves its deadline, and the timer reschedules itself when it expires
+    early.
+    """
+
+    __slots__ = ("listener", "debounce", "throttle", "coalesce_by", "timers", "_lock", "_pending", "_deadline", "_scheduled", "_opened", "_timer")
+
+    def __init__(self, listener: Callable[..., Any], debounce: Optional[float] = None, throttle: Optional[float] = None,
+                 coalesce_by: Optional[Callable[..., Hashable]] = None, timers: Timers = TIMERS) -> None:
+        """
+        Initializes a new instance of the PacedCall class.
+
+        Args:
+            listener `(Callable[..., Any]):` The function to call.
+            debounce (Optional[float]): The quiet period, in seconds, after which the listener is called. Defaults to None.
+            throttle (Optional[float]): The shortest interval, in seconds, between two calls of the listener. Defaults to None.
+            coalesce_by `(Optional[Callable[..., Hashable]]):` Returns the key of the arguments of a call. Defaults to None.
+            timers (Timers): The timer thread to use. Defaults to the shared one.
+        """
+        if debounce is not None and throttle is not None:
+            raise ValueError("a listener cannot be both debounced and throttled")
+        if (debounce is not None and debounce < 0) or (throttle is not None and throttle < 0):
+            raise ValueError("debounce and throttle intervals must not be negative")
+        self.listener: Callable[..., Any] = listener
+        self.debounce: Optional[float] = debounce
+        self.throttle: Optional[float] = throttle
+        self.coalesce_by: Optional[Callable[..., Hashable]] = coalesce_by
+        self.timers: Timers = timers
+        self._lock = threading.Lock()
+        self._pending: Any = {} if coalesce_by is not None else _NOTHING
+        self._deadline: float = 0.0
+        self._scheduled: bool = False
+        self._opened: float = float('-inf')
+        self._timer: Optional[Tuple[float, int, Callable[[], Any]]] = None
+
+    def __call__(self, *args: Any) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self.throttle is not None and not self._scheduled and now - self._opened >= self.throttle:
+                # Leading edge: nothing is pending and the last interval is over.
+                self._opened = now
+                leading = True
+            else:
+                leading = False
+                self._hold(args)
+                if self.debounce is not None:
+                    self._deadline = now + self.debounce
+                elif self.throttle is not None:
+                    self._deadline = self._opened + self.throttle
+                else:
+                    self._deadline = now
+                if not self._scheduled:
+                    self._scheduled = True
+                    self._timer = self.timers.call_at(self._deadline, self._expire)
+        if leading:
+            self._deliver([args])
+
+    def cancel(self) -> None:
+        """
+        Drops the pending calls and unschedules their timer. The listener can still be called again afterwards.
+        """
+        with self._lock:
+            self._pending = {} if self.coalesce_by is not None else _NOTHING
+            self._scheduled = False
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            self.timers.cancel(timer)
+
+    def _hold(self, args: Tuple[Any, ...]) -> None:
+        if self.coalesce_by is None:
+            self._pending = args
+            return
+        key = self.coalesce_by(*args)
+        pending = self._pending
+        # The key moves to the end, so keys are delivered in the order of their latest call.
+        pending.pop(key, None)
+        pending[key] = args
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if not self._scheduled:
+                # Cancelled, or already delivered by a timer that raced a cancelled one.
+                return
+            if now < self._deadline:
+                self._timer = self.timers.call_at(self._deadline, self._expire)
+                return
+            self._scheduled = False
+            self._timer = None
+            self._opened = now
+            if self.coalesce_by is None:
+                calls = [self._pending]
+                self._pending = _NOTHING
+            else:
+                calls = list(self._pending.values())
+                self._pending = {}
+        self._deliver(calls)
+
+    def _deliver(self, calls: List[Tuple[Any, ...]]) -> None:
+        errors = None
+        for args in calls:
+            try:
+                self.listener(*args)
+            except Exception as error:
+                if errors is None:
+                    errors = [error]
+                else:
+                    errors.append(error)
+        if errors is not None:
+            raise errors[0] if len(errors) == 1 else ExceptionGroup("paced listener calls raised", errors)
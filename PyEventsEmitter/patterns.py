@@ -0,0 +1,107 @@
+import re
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .registry import Listeners
+
+# Patterns that may refer to their own groups, which the combined expressions renumber: backreferences, by number or
+# by name, and conditional references such as '(?(1)...)'.
+BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=|\(\?\(')
+
+# The number of patterns per combined expression.
+BLOCK = 64
+
+
+class PatternBlock:
+    """
+    Up to `BLOCK` consecutive patterns of a `RegexMatcher`, and the alternation compiled for them.
+    """
+
+    __slots__ = ("entries", "combined")
+
+    def __init__(self) -> None:
+        self.entries: List[Tuple[re.Pattern, "Listeners"]] = []
+        self.combined: Optional[re.Pattern] = None
+
+    def compile(self) -> re.Pattern:
+        # Every branch is followed by an empty group named after its index, which `lastgroup` reports.
+        branches = '|'.join(f"(?:{pattern.pattern})(?P<m{index}>)" for index, (pattern, _) in enumerate(self.entries))
+        self.combined = re.compile(branches or '(?!)')
+        return self.combined
+
+
+class RegexMatcher:
+    """
+    The registries of the regular expression subscriptions of an emitter, matched together.
+
+    A pattern matches an event name as `pattern.match(event_name)` does: from the start of the name, and up to its
+    end only if the pattern ends with '$'. The patterns are kept in blocks of `BLOCK`, in the order they were added,
+    and the patterns of a block are compiled into one alternation, every branch followed by an empty marker group. One
+    `match` of the alternation finds the first pattern of the block that matches, or that none does, which is the
+    common case; only the patterns after it in the block are then tried one by one. Adding a pattern recompiles the
+    last block and removing one recompiles its block, lazily, the first time a name is matched after the change.
+
+    Patterns that cannot be combined without changing their meaning, those with flags, named groups, backreferences
+    or conditional references to groups, are matched one by one instead.
+    """
+
+    __slots__ = ("entries", "counter", "blocks", "separate")
+
+    def __init__(self) -> None:
+        """
+        Initializes a new, empty instance of the RegexMatcher class.
+        """
+        self.entries: Dict[re.Pattern, Tuple[int, "Listeners", Optional[PatternBlock]]] = {}
+        self.counter: int = 0
+        self.blocks: List[PatternBlock] = []
+        self.separate: List[Tuple[re.Pattern, "Listeners"]] = []
+
+    def add(self, pattern: re.Pattern, listeners: "Listeners") -> None:
+        """
+        Adds the registry of a pattern. Patterns are reported in the order they were added.
+        """
+        self.counter += 1
+        if pattern.flags & ~re.UNICODE or pattern.groupindex or BACKREFERENCE.search(pattern.pattern):
+            block = None
+            self.separate.append((pattern, listeners))
+        else:
+            if not self.blocks or len(self.blocks[-1].entries) >= BLOCK:
+                self.blocks.append(PatternBlock())
+            block = self.blocks[-1]
+            block.entries.append((pattern, listeners))
+            block.combined = None
+        self.entries[pattern] = (self.counter, listeners, block)
+
+    def remove(self, pattern: re.Pattern, listeners: "Listeners") -> None:
+        """
+        Removes the registry of a pattern, if it is the one that was added.
+        """
+        entry = self.entries.get(pattern)
+        if entry is None or entry[1] is not listeners:
+            return
+        del self.entries[pattern]
+        block = entry[2]
+        if block is None:
+            self.separate.remove((pattern, listeners))
+        else:
+            block.entries.remove((pattern, listeners))
+            block.combined = None
+            if not block.entries:
+                self.blocks.remove(block)
+
+    def match(self, name: str) -> List[Tuple[re.Pattern, "Listeners"]]:
+        """
+        Returns the patterns that match an event name, with their registries, in the order they were added.
+        """
+        found = []
+        for block in self.blocks:
+            matched = (block.combined or block.compile()).match(name)
+            if matched is not None and matched.lastgroup is not None:
+                entries = block.entries
+                index = int(matched.lastgroup[1:])
+                found.append(entries[index])
+                found.extend(entry for entry in entries[index + 1:] if entry[0].match(name))
+        if self.separate:
+            found.extend(entry for entry in self.separate if entry[0].match(name))
+            found.sort(key=lambda entry: self.entries[entry[0]][0])
+        return found
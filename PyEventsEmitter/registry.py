@@ -0,0 +1,627 @@
+import inspect
+import weakref
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generator, Hashable, Iterator, List, Optional, Set, Tuple, Union
+from .dispatch import Rejections, compile_dispatch
+from .hooks import EventHooks
+from .metrics import EventMetrics
+from .pacing import PacedCall
+from .replay import ReplayBuffer
+from .utils import Disposable
+
+if TYPE_CHECKING:
+    from .Emitter import EventEmitter
+    from .chains import Chain, Resolver
+
+# The number of cached chains whose dispatch functions a registry resets as soon as its listeners change. The chains of
+# a registry held by more are checked against its `version` when they are next looked up instead.
+EAGER_RESETS = 8
+
+
+class Registration:
+    """
+    A compact record of one listener registration.
+
+    `listener` is the function that was registered, which `off` and `listeners` work with, and `call` is the
+    function the emit loop actually calls. They are the same function unless the listener runs somewhere else, for
+    example on an executor. The `once` flag marks listeners that must run at most once; `fired` is set on such a
+    record right before it is called, so re-entrant emits skip it until it is swept from the registry at the end of
+    the emit.
+
+    `key` is what the registry indexes the registration by. It is the listener itself, except for weak
+    registrations, whose `listener` is a weak reference and whose key is `weak_key` of the referenced function.
+    """
+
+    __slots__ = ("listener", "call", "token", "priority", "once", "fired", "key")
+
+    def __init__(self, listener: Callable[..., None], token: int, once: bool, call: Optional[Callable[..., Any]] = None, priority: int = 0, key: Optional[Hashable] = None) -> None:
+        """
+        Initializes a new instance of the Registration class.
+
+        Args:
+            listener `(Callable[..., None]):` The function to be called when the event is emitted.
+            token (int): The token identifying the registration in its `Listeners` registry.
+            once (bool): True if the listener must be removed after it is called for the first time.
+            call `(Optional[Callable[..., Any]]):` The function the emit loop calls instead of `listener`. Defaults to `listener`.
+            priority (int): The priority level of the registration. Defaults to 0.
+            key (Optional[Hashable]): The index key of the registration. Defaults to `listener`.
+        """
+        self.listener: Callable[..., None] = listener
+        self.call: Callable[..., Any] = listener if call is None else call
+        self.token: int = token
+        self.priority: int = priority
+        self.once: bool = once
+        self.fired: bool = False
+        self.key: Hashable = listener if key is None else key
+
+
+class Level:
+    """
+    The registrations of one priority level: the prepended ones, newest first once reversed, and the appended ones.
+    """
+
+    __slots__ = ("head", "tail")
+
+    def __init__(self) -> None:
+        self.head: Optional[Dict[int, Registration]] = None
+        self.tail: Dict[int, Registration] = {}
+
+
+class Listeners:
+    """
+    Holds the listeners registered for a single event.
+
+    Registrations are grouped by priority level; higher levels are emitted first. Within a level, every registration
+    gets an integer token: appended listeners get increasing positive tokens and prepended listeners get decreasing
+    negative tokens, so the order within a level is the ascending token order. The registrations of a level are kept
+    in two insertion-ordered dictionaries keyed by token, and an index maps every listener to its registrations,
+    which makes adding and removing a listener O(1). The registry itself holds the default level 0; other levels are
+    created on demand, and their priorities are kept in a sorted array that new levels are inserted into by binary
+    search. The tuple of registrations and the compiled dispatch functions are rebuilt lazily, the first time they
+    are needed after a change, so emitting never sorts anything.
+
+    The registry of a retained event holds its `replay` buffer, which the dispatch functions record every emit into.
+    Such a registry stays in the emitter while it has no listeners. Likewise, while the emitter collects metrics, the
+    registry holds the `metrics` of its event and the dispatch functions are compiled with timed listener calls, and
+    while the emitter has hooks, the registry holds them in `hooks` and the dispatch functions are compiled with them.
+    On an emitter with wildcard subscriptions, `chains` holds the cached chains of the event names whose emits reach
+    the registry, and `resolver` the resolver that cached them. When the listeners change, the registry resets the
+    dispatch functions of up to `EAGER_RESETS` chains at once; a registry that more chains hold, such as that of '**'
+    or of the catch-all listeners, only records the new generation of the resolver in `version`, and its chains reset
+    themselves the next time they are looked up, so a change costs the same however many chains are cached.
+    """
+
+    __slots__ = ("head", "tail", "levels", "priorities", "records", "size", "counter", "once", "replay", "metrics", "hooks", "chains", "resolver", "version", "dispatch", "dispatch0", "dispatch1", "dispatch2", "_snapshot")
+
+    def __init__(self) -> None:
+        """
+        Initializes a new, empty instance of the Listeners class.
+        """
+        self.head: Optional[Dict[int, Registration]] = None
+        self.tail: Dict[int, Registration] = {}
+        self.levels: Optional[Dict[int, Level]] = None
+        self.priorities: Optional[List[int]] = None
+        self.records: Dict[Hashable, Union[Registration, List[Registration]]] = {}
+        self.size: int = 0
+        self.counter: int = 0
+        self.once: int = 0
+        self.replay: Optional[ReplayBuffer] = None
+        self.metrics: Optional[EventMetrics] = None
+        self.hooks: Optional[EventHooks] = None
+        self.chains: Optional[Set["Chain"]] = None
+        self.resolver: Optional["Resolver"] = None
+        self.version: int = 0
+        self.dispatch: Optional[Callable[..., Any]] = None
+        self.dispatch0: Optional[Callable[[], Any]] = None
+        self.dispatch1: Optional[Callable[[Any], Any]] = None
+        self.dispatch2: Optional[Callable[[Any, Any], Any]] = None
+        self._snapshot: Optional[Tuple[Registration, ...]] = ()
+
+    def append(self, listener: Callable[..., None], once: bool = False, call: Optional[Callable[..., Any]] = None, priority: int = 0, key: Optional[Hashable] = None) -> Registration:
+        """
+        Adds a listener after all the other listeners of its priority level.
+
+        Args:
+            listener `(Callable[..., None]):` The function to be called when the event is emitted.
+            once (bool): True if the listener must be removed after it is called for the first time.
+            call `(Optional[Callable[..., Any]]):` The function the emit loop calls instead of `listener`. Defaults to None.
+            priority (int): The priority level of the listener. Defaults to 0.
+            key (Optional[Hashable]): The index key of the listener. Defaults to the listener itself.
+
+        Returns:
+            Registration: The new registration.
+        """
+        self.counter += 1
+        record = Registration(listener, self.counter, once, call, priority, key)
+        self._level(priority).tail[record.token] = record
+        self._index(record)
+        return record
+
+    def prepend(self, listener: Callable[..., None], once: bool = False, call: Optional[Callable[..., Any]] = None, priority: int = 0, key: Optional[Hashable] = None) -> Registration:
+        """
+        Adds a listener before all the other listeners of its priority level.
+
+        Args:
+            listener `(Callable[..., None]):` The function to be called when the event is emitted.
+            once (bool): True if the listener must be removed after it is called for the first time.
+            call `(Optional[Callable[..., Any]]):` The function the emit loop calls instead of `listener`. Defaults to None.
+            priority (int): The priority level of the listener. Defaults to 0.
+            key (Optional[Hashable]): The index key of the listener. Defaults to the listener itself.
+
+        Returns:
+            Registration: The new registration.
+        """
+        self.counter += 1
+        record = Registration(listener, -self.counter, once, call, priority, key)
+        level = self._level(priority)
+        if level.head is None:
+            level.head = {}
+        level.head[record.token] = record
+        self._index(record)
+        return record
+
+    def discard(self, record: Registration) -> bool:
+        """
+        Removes a registration, and drops the calls of a paced listener that are still pending.
+
+        Args:
+            record (Registration): The registration returned by `append` or `prepend`.
+
+        Returns:
+            bool: True if the registration was found and removed; False otherwise.
+        """
+        if not self._unlink(record):
+            return False
+        if isinstance(record.call, PacedCall):
+            record.call.cancel()
+        return True
+
+    def cancel(self) -> None:
+        """
+        Drops the pending calls of the paced listeners, for a registry that is removed as a whole.
+        """
+        for records in self.records.values():
+            for record in (records,) if isinstance(records, Registration) else records:
+                if isinstance(record.call, PacedCall):
+                    record.call.cancel()
+
+    def _unlink(self, record: Registration) -> bool:
+        priority = record.priority
+        levels, priorities = self.levels, self.priorities
+        level = self if priority == 0 else levels.get(priority) if levels is not None else None
+        if level is None:
+            return False
+        if record.token < 0:
+            if level.head is None or level.head.pop(record.token, None) is None:
+                return False
+        elif level.tail.pop(record.token, None) is None:
+            return False
+        if levels is not None and priorities is not None and priority != 0 and not level.tail and not level.head:
+            del levels[priority]
+            del priorities[bisect_left(priorities, -priority)]
+        records = self.records[record.key]
+        if isinstance(records, Registration):
+            del self.records[record.key]
+        else:
+            records.remove(record)
+            if len(records) == 1:
+                self.records[record.key] = records[0]
+        if record.once:
+            self.once -= 1
+        self.size -= 1
+        self._changed()
+        return True
+
+    def remove(self, listener: Callable[..., None]) -> bool:
+        """
+        Removes the first occurrence, in emit order, of a listener, whether it was registered weakly or not.
+
+        Args:
+            listener `(Callable[..., None]):` The function to be removed.
+
+        Returns:
+            bool: True if the listener was found and removed; False otherwise.
+        """
+        candidates: List[Registration] = []
+        for key in (listener, weak_key(listener)):
+            records = self.records.get(key)
+            if isinstance(records, Registration):
+                candidates.append(records)
+            elif records is not None:
+                candidates.extend(records)
+        if not candidates:
+            return False
+        return self.discard(min(candidates, key=_emit_order))
+
+    def find(self, key: Hashable, listener: Callable[..., None]) -> Optional[Registration]:
+        """
+        Returns the registration of a listener under an index key, or None if there is none.
+
+        Args:
+            key (Hashable): The index key of the registration.
+            listener `(Callable[..., None]):` The `listener` of the registration, compared by identity.
+        """
+        records = self.records.get(key)
+        if isinstance(records, Registration):
+            return records if records.listener is listener else None
+        for record in records or ():
+            if record.listener is listener:
+                return record
+        return None
+
+    def sweep(self, fired: List[Registration]) -> None:
+        """
+        Removes the `once` registrations that fired during an emit, in a single pass. The pending call of a paced
+        `once` listener is still delivered.
+
+        Args:
+            fired `(List[Registration]):` The registrations to remove. Registrations that were already removed are ignored.
+        """
+        for record in fired:
+            self._unlink(record)
+
+    def claim(self, record: Registration) -> bool:
+        """
+        Flags a `once` registration as fired, unless it already was.
+
+        Args:
+            record (Registration): The registration about to be called.
+
+        Returns:
+            bool: True if the caller may call the listener; False if it already fired.
+        """
+        if record.fired:
+            return False
+        record.fired = True
+        return True
+
+    def fire(self, *args: Any) -> bool:
+        """
+        Calls the listeners in emit order, honouring the `once` flags.
+
+        A `once` registration is flagged as fired before it is called and skipped by re-entrant calls. All fired
+        registrations are removed in one sweep after the loop, even if a listener raises.
+
+        Args:
+            *args (Any): The arguments to pass to the listeners.
+
+        Returns:
+            bool: True if the sweep removed the last registration.
+        """
+        return self._fire(args, False)
+
+    def fire_capturing(self, *args: Any) -> bool:
+        """
+        Same as `fire`, but an exception raised by a listener does not stop the loop. The exceptions are raised
+        together as `Rejections` after the sweep.
+
+        Args:
+            *args (Any): The arguments to pass to the listeners.
+
+        Returns:
+            bool: True if the sweep removed the last registration.
+        """
+        return self._fire(args, True)
+
+    def fire_hooked(self, args: Tuple[Any, ...], capture: bool, hooks: Optional[EventHooks]) -> bool:
+        """
+        Same as `fire` and `fire_capturing`, but the listener calls are surrounded by `hooks` instead of the hooks of the
+        registry, and the emit hooks are left to the caller. Chains use it with the hooks bound to the emitted event name.
+
+        Returns:
+            bool: True if the sweep removed the last registration.
+        """
+        return self._fire(args, capture, hooks)
+
+    def claimed(self) -> Generator[Registration, None, None]:
+        """
+        Yields the registrations an emit must call, in emit order.
+
+        `once` registrations are claimed when they are reached and skipped if they already fired. The fired ones are
+        removed in one sweep when the generator finishes or is closed, so callers that may stop early must close it.
+
+        Returns:
+            `Generator[Registration, None, None]:` The registrations to call.
+        """
+        fired = None
+        try:
+            for record in self.snapshot():
+                if record.once:
+                    if not self.claim(record):
+                        continue
+                    if fired is None:
+                        fired = [record]
+                    else:
+                        fired.append(record)
+                yield record
+        finally:
+            if fired is not None:
+                self.sweep(fired)
+
+    def emitted(self, args: Tuple[Any, ...]) -> None:
+        """
+        Records an emit into the replay buffer and the metrics of the event, for the emit loops that are not compiled.
+
+        Args:
+            args `(Tuple[Any, ...]):` The arguments of the emit.
+        """
+        if self.replay is not None:
+            self.replay.record(*args)
+        if self.metrics is not None:
+            self.metrics.emitted(len(self.snapshot()))
+
+    def call(self, record: Registration, hooks: Optional[EventHooks] = None) -> Callable[..., Any]:
+        """
+        Returns the function an emit loop calls for a registration: `record.call`, timed while metrics are collected and
+        surrounded by the `around_listener` hooks, if there are any. `hooks`, if given, replaces the hooks of the registry.
+        """
+        call = record.call if self.metrics is None else self.metrics.call(record)
+        if hooks is None:
+            hooks = self.hooks
+        return call if hooks is None else hooks.wrap_call(record, call)
+
+    def _fire(self, args: Tuple[Any, ...], capture: bool, hooks: Optional[EventHooks] = None) -> bool:
+        self.emitted(args)
+        errors = None
+        records = self.claimed()
+        try:
+            for record in records:
+                try:
+                    self.call(record, hooks)(*args)
+                except Exception as error:
+                    if not capture:
+                        raise
+                    if errors is None:
+                        errors = [error]
+                    else:
+                        errors.append(error)
+        finally:
+            records.close()
+        if errors is not None:
+            raise Rejections(errors)
+        return not self
+
+    def compile(self, nargs: Optional[int] = None, capture: bool = False) -> Callable[..., Any]:
+        """
+        Returns the dispatch function for the current listeners, building and caching it if needed.
+
+        The cached function is dropped as soon as the listeners change. While `once` registrations are present, the
+        bound `fire` (or `fire_capturing`) method is returned instead and nothing is cached. Both record the emit into
+        the replay buffer first, if there is one. Emit hooks, if any, surround the function that is returned.
+
+        Args:
+            nargs (Optional[int]): The number of arguments the function will be called with, or None for any number.
+            capture (bool): If True, listener exceptions are collected and raised together as `Rejections` after the loop.
+
+        Returns:
+            `Callable[..., Any]:` The dispatch function. It returns True when the call removed the last registration.
+        """
+        if self.once:
+            dispatch = self.fire_capturing if capture else self.fire
+            return dispatch if self.hooks is None else self.hooks.wrap_dispatch(dispatch)
+        dispatch = compile_dispatch(self.calls(), nargs, capture)
+        if self.hooks is not None:
+            dispatch = self.hooks.wrap_dispatch(dispatch)
+        if nargs is None:
+            self.dispatch = dispatch
+        elif nargs == 0:
+            self.dispatch0 = dispatch
+        elif nargs == 1:
+            self.dispatch1 = dispatch
+        elif nargs == 2:
+            self.dispatch2 = dispatch
+        return dispatch
+
+    def calls(self, hooks: Optional[EventHooks] = None) -> Tuple[Callable[..., Any], ...]:
+        """
+        Returns the functions a compiled dispatch function calls, in order: the recorders of the replay buffer and the
+        metrics, if any, then the call of every registration, as returned by `call` with `hooks`.
+        """
+        snapshot = self.snapshot()
+        if self.metrics is None and self.hooks is None and hooks is None:
+            calls = tuple(record.call for record in snapshot)
+        else:
+            calls = tuple(self.call(record, hooks) for record in snapshot)
+        if self.metrics is not None:
+            self.metrics.prune(snapshot)
+            calls = (self.metrics.recorder(len(snapshot)),) + calls
+        if self.replay is not None:
+            calls = (self.replay.record,) + calls
+        return calls
+
+    def snapshot(self) -> Tuple[Registration, ...]:
+        """
+        Returns the registrations in emit order.
+
+        Returns:
+            `Tuple[Registration, ...]:` An immutable tuple of the registrations. The same tuple is returned until the listeners change.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            levels, priorities = self.levels, self.priorities
+            if levels is None or priorities is None:
+                snapshot = _records(self)
+            else:
+                snapshot = ()
+                for priority in priorities:
+                    snapshot += _records(levels[-priority] if priority else self)
+            self._snapshot = snapshot
+        return snapshot
+
+    def _level(self, priority: int) -> Union["Listeners", Level]:
+        # Level 0 lives on the registry itself, so listeners without a priority need no extra objects. The first
+        # other level creates the level table; `priorities` holds the negated priorities of all levels, 0 included,
+        # in ascending order, which is the emit order.
+        if priority == 0:
+            return self
+        levels, priorities = self.levels, self.priorities
+        if levels is None or priorities is None:
+            levels = self.levels = {}
+            priorities = self.priorities = [0]
+        level = levels.get(priority)
+        if level is None:
+            level = levels[priority] = Level()
+            insort(priorities, -priority)
+        return level
+
+    def _index(self, record: Registration) -> None:
+        # A listener registered once maps to its record; a list is only allocated for duplicate registrations.
+        records = self.records.get(record.key)
+        if records is None:
+            self.records[record.key] = record
+        elif isinstance(records, Registration):
+            self.records[record.key] = [records, record]
+        else:
+            records.append(record)
+        if record.once:
+            self.once += 1
+        self.size += 1
+        self._changed()
+
+    def _changed(self) -> None:
+        self._snapshot = self.dispatch = self.dispatch0 = self.dispatch1 = self.dispatch2 = None
+        chains = self.chains
+        if not chains:
+            return
+        if len(chains) <= EAGER_RESETS or self.resolver is None:
+            for chain in chains:
+                chain.dispatch = None
+        else:
+            self.resolver.changed(self)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Callable[..., None]]:
+        for record in self.snapshot():
+            if record.key is record.listener:
+                yield record.listener
+            else:
+                listener = record.listener()
+                if listener is not None:
+                    yield listener
+
+
+def _records(level: Union[Listeners, Level]) -> Tuple[Registration, ...]:
+    # The registrations of one level in emit order: the prepended ones, newest first, then the appended ones.
+    if level.head:
+        return tuple(reversed(level.head.values())) + tuple(level.tail.values())
+    return tuple(level.tail.values())
+
+
+def _emit_order(record: Registration) -> Tuple[int, int]:
+    return -record.priority, record.token
+
+
+def weak_key(listener: Callable[..., None]) -> Hashable:
+    """
+    Returns the index key of a weak registration of a listener.
+
+    The weak reference cannot serve as the key: once its referent is gone it no longer compares equal to the other
+    references to it. The key is built from object identities instead, which stay valid for as long as the referent
+    lives, and the registration is purged when it dies.
+
+    Args:
+        listener `(Callable[..., None]):` A function, or a bound method, which is identified by its object and function.
+    """
+    if inspect.ismethod(listener):
+        return ('weak', id(listener.__self__), id(listener.__func__))
+    return ('weak', id(listener))
+
+
+def weak_call(reference: "weakref.ref[Callable[..., Any]]") -> Callable[..., Any]:
+    """
+    Returns a function that calls the referent of a weak reference, or does nothing once the referent is gone.
+    """
+    def call(*args: Any) -> Any:
+        listener = reference()
+        if listener is not None:
+            return listener(*args)
+        return None
+    return call
+
+
+class Subscription(Disposable):
+    """
+    A handle to a single listener registration.
+
+    Returned by `on`, `once`, `prependListener` and `prependOnceListener`. Disposing the handle unlinks exactly the
+    registration it was created for, by its record, without searching the listeners of the event. Using the handle as a
+    context manager disposes it when the `with` block exits.
+    """
+
+    __slots__ = ("emitter", "event_name", "listeners", "record")
+
+    def __init__(self, emitter: "EventEmitter", event_name: str, listeners: Listeners, record: Registration) -> None:
+        """
+        Initializes a new instance of the Subscription class.
+
+        Args:
+            emitter (EventEmitter): The emitter the listener was registered on.
+            event_name (str): The name of the event the listener was registered for.
+            listeners (Listeners): The registry holding the registration.
+            record (Registration): The registration in `listeners`.
+        """
+        self.emitter: Optional["EventEmitter"] = emitter
+        self.event_name: str = event_name
+        self.listeners: Listeners = listeners
+        self.record: Registration = record
+
+    @property
+    def disposed(self) -> bool:
+        """
+        bool: True once the handle has been disposed.
+        """
+        return self.emitter is None
+
+    def dispose(self) -> None:
+        """
+        Removes the registration from the emitter. Disposing the handle more than once, or after the listener was
+        removed in another way, has no effect.
+        """
+        emitter = self.emitter
+        if emitter is not None:
+            self.emitter = None
+            emitter._discard(self.event_name, self.listeners, self.record)
+
+
+class LockedListeners(Listeners):
+    """
+    A `Listeners` registry shared between threads.
+
+    The emitter takes the lock around every change. This class takes it around the work that reads the registry
+    dictionaries (rebuilding the snapshot, compiling a dispatch function) and around claiming and sweeping `once`
+    registrations. Reading an already published snapshot or dispatch function needs no lock: they are immutable and
+    replaced by a single attribute assignment.
+    """
+
+    __slots__ = ("lock",)
+
+    def __init__(self, lock: Any) -> None:
+        """
+        Initializes a new, empty instance of the LockedListeners class.
+
+        Args:
+            lock (Any): The lock of the owning emitter. It must be reentrant.
+        """
+        super().__init__()
+        self.lock = lock
+
+    def claim(self, record: Registration) -> bool:
+        with self.lock:
+            return super().claim(record)
+
+    def sweep(self, fired: List[Registration]) -> None:
+        with self.lock:
+            super().sweep(fired)
+
+    def compile(self, nargs: Optional[int] = None, capture: bool = False) -> Callable[..., Any]:
+        with self.lock:
+            return super().compile(nargs, capture)
+
+    def snapshot(self) -> Tuple[Registration, ...]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self.lock:
+                snapshot = super().snapshot()
+        return snapshot
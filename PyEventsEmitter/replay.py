@@ -0,0 +1,83 @@
+import sys
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+
+def payload_size(args: Tuple[Any, ...]) -> int:
+    """
+    Returns the default size estimate of the arguments of an event: the sum of their shallow `sys.getsizeof`.
+    """
+    return sum(map(sys.getsizeof, args))
+
+
+class ReplayBuffer:
+    """
+    The latest emits of an event, replayed to listeners that subscribe later.
+
+    The buffer is a ring of at most `last` argument tuples. With `max_bytes`, the oldest emits are also evicted while
+    the estimated size of the retained arguments exceeds it; an emit that is larger on its own is not retained at all,
+    and it clears the buffer, since the emits before it are stale.
+    `record` is called by every emit of the event, from any thread.
+    """
+
+    __slots__ = ("last", "max_bytes", "sizeof", "size", "_entries", "_sizes", "_lock")
+
+    def __init__(self, last: int = 1, max_bytes: Optional[int] = None, sizeof: Callable[[Tuple[Any, ...]], int] = payload_size) -> None:
+        """
+        Initializes a new instance of the ReplayBuffer class.
+
+        Args:
+            last (int): The number of emits to retain. Defaults to 1.
+            max_bytes (Optional[int]): The largest total size of the retained arguments. Defaults to None, for no size limit.
+            sizeof `(Callable[[Tuple[Any, ...]], int]):` Estimates the size of the arguments of an emit. Defaults to `payload_size`.
+        """
+        if last < 1:
+            raise ValueError(f"last must be at least 1, got {last}")
+        self.last: int = last
+        self.max_bytes: Optional[int] = max_bytes
+        self.sizeof: Callable[[Tuple[Any, ...]], int] = sizeof
+        self.size: int = 0
+        self._entries: Deque[Tuple[Any, ...]] = deque()
+        self._sizes: Optional[Deque[int]] = deque() if max_bytes is not None else None
+        self._lock = threading.Lock()
+
+    def record(self, *args: Any) -> None:
+        """
+        Retains the arguments of an emit, evicting the oldest ones if the buffer is full.
+        """
+        entries = self._entries
+        with self._lock:
+            sizes = self._sizes
+            max_bytes = self.max_bytes
+            if sizes is None or max_bytes is None:
+                if len(entries) == self.last:
+                    entries.popleft()
+                entries.append(args)
+                return
+            size = self.sizeof(args)
+            if size > max_bytes:
+                # The older emits are stale now, so they are not replayed either.
+                entries.clear()
+                sizes.clear()
+                self.size = 0
+                return
+            if len(entries) == self.last:
+                entries.popleft()
+                self.size -= sizes.popleft()
+            while self.size + size > max_bytes:
+                entries.popleft()
+                self.size -= sizes.popleft()
+            entries.append(args)
+            sizes.append(size)
+            self.size += size
+
+    def entries(self) -> List[Tuple[Any, ...]]:
+        """
+        Returns the retained argument tuples, oldest first.
+        """
+        with self._lock:
+            return list(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
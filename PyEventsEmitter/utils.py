@@ -1,10 +1,28 @@
+from typing import Any
+
 DEFAULT_LISTNER_COUNT = 10
 
 class Disposable:
     """
     Represents a disposable object.
+
+    Subclasses release the resource they hold in `dispose`. A disposable can also be used as a context manager,
+    in which case it is disposed when the `with` block exits.
     """
-    pass
+
+    __slots__ = ()
+
+    def dispose(self) -> None:
+        """
+        Releases the resource held by this object. Disposing an object more than once has no effect.
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.dispose()
 
 class AbortSignal:
     """
@@ -0,0 +1,161 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .registry import Listeners
+
+
+class TrieNode:
+    """
+    A node of a `SegmentTrie`: the children by segment, and the registry of the pattern that ends here, if any.
+    """
+
+    __slots__ = ("children", "entry")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, TrieNode] = {}
+        self.entry: Optional[Tuple[int, str, "Listeners"]] = None
+
+
+class SegmentTrie:
+    """
+    The registries of the wildcard subscriptions of an emitter, indexed by the segments of their patterns.
+
+    Event names are split into segments at `delimiter`. In a pattern, a segment that is exactly `single` matches any
+    one segment, and a segment that is exactly `multi` matches any number of segments, none included: with the default
+    tokens, 'db.*' matches 'db.insert' and 'db.**' matches 'db', 'db.insert' and 'db.insert.users'. A wildcard
+    character inside a longer segment is matched literally. With `multi_last`, `multi` may only end a pattern, as '#'
+    in an MQTT topic filter.
+
+    Matching an event name walks the trie segment by segment, so its cost depends on the length of the name and on
+    the wildcards along the way, not on the number of patterns.
+    """
+
+    __slots__ = ("delimiter", "single", "multi", "multi_last", "root", "counter")
+
+    def __init__(self, delimiter: str = '.', single: str = '*', multi: str = '**', multi_last: bool = False) -> None:
+        """
+        Initializes a new, empty instance of the SegmentTrie class.
+
+        Args:
+            delimiter (str): The separator of the segments of an event name. Defaults to '.'.
+            single (str): The segment that matches exactly one segment. Defaults to '*'.
+            multi (str): The segment that matches any number of segments. Defaults to '**'.
+            multi_last (bool): If True, `multi` is only allowed as the last segment of a pattern. Defaults to False.
+        """
+        self.delimiter: str = delimiter
+        self.single: str = single
+        self.multi: str = multi
+        self.multi_last: bool = multi_last
+        self.root: TrieNode = TrieNode()
+        self.counter: int = 0
+
+    def is_pattern(self, name: str) -> bool:
+        """
+        Returns True if the event name has a wildcard segment.
+        """
+        if self.single not in name and self.multi not in name:
+            return False
+        return any(segment == self.single or segment == self.multi for segment in name.split(self.delimiter))
+
+    def validate(self, pattern: str) -> None:
+        """
+        Raises ValueError if `multi` is not the last segment of a pattern that requires it to be.
+        """
+        if self.multi_last and self.multi in pattern:
+            segments = pattern.split(self.delimiter)
+            if self.multi in segments[:-1]:
+                raise ValueError(f"{self.multi!r} must be the last level of a pattern, got {pattern!r}")
+
+    def add(self, pattern: str, listeners: "Listeners") -> None:
+        """
+        Indexes the registry of a pattern. Patterns are matched in the order they were added.
+        """
+        node = self.root
+        for segment in pattern.split(self.delimiter):
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = TrieNode()
+            node = child
+        self.counter += 1
+        node.entry = (self.counter, pattern, listeners)
+
+    def remove(self, pattern: str, listeners: "Listeners") -> None:
+        """
+        Removes the registry of a pattern, if it is the indexed one, and prunes the nodes left empty.
+        """
+        path = []
+        node = self.root
+        for segment in pattern.split(self.delimiter):
+            child = node.children.get(segment)
+            if child is None:
+                return
+            path.append((node, segment))
+            node = child
+        if node.entry is None or node.entry[2] is not listeners:
+            return
+        node.entry = None
+        for parent, segment in reversed(path):
+            if node.children or node.entry is not None:
+                break
+            del parent.children[segment]
+            node = parent
+
+    def match(self, name: str) -> List[Tuple[str, "Listeners"]]:
+        """
+        Returns the patterns that match an event name, with their registries, in the order they were added.
+        """
+        found: Dict[str, Tuple[int, str, "Listeners"]] = {}
+        self._match(self.root, name.split(self.delimiter), 0, found)
+        return [(pattern, listeners) for _, pattern, listeners in sorted(found.values(), key=_order)]
+
+    def covers(self, pattern: str, name: str) -> bool:
+        """
+        Returns True if a single pattern matches an event name.
+        """
+        return self._covers(pattern.split(self.delimiter), 0, name.split(self.delimiter), 0)
+
+    def _match(self, node: TrieNode, segments: List[str], index: int, found: Dict[str, Tuple[int, str, "Listeners"]]) -> None:
+        children = node.children
+        if index == len(segments):
+            if node.entry is not None:
+                found[node.entry[1]] = node.entry
+        else:
+            segment = segments[index]
+            child = children.get(segment)
+            if child is not None:
+                self._match(child, segments, index + 1, found)
+            if segment != self.single:
+                child = children.get(self.single)
+                if child is not None:
+                    self._match(child, segments, index + 1, found)
+        child = children.get(self.multi)
+        if child is not None:
+            for end in range(index, len(segments) + 1):
+                self._match(child, segments, end, found)
+
+    def _covers(self, pattern: List[str], index: int, segments: List[str], position: int) -> bool:
+        if index == len(pattern):
+            return position == len(segments)
+        if pattern[index] == self.multi:
+            return any(self._covers(pattern, index + 1, segments, end) for end in range(position, len(segments) + 1))
+        if position == len(segments):
+            return False
+        if pattern[index] != self.single and pattern[index] != segments[position]:
+            return False
+        return self._covers(pattern, index + 1, segments, position + 1)
+
+
+def _order(entry: Tuple[int, str, "Listeners"]) -> int:
+    return entry[0]
+
+
+def segment_trie(mode: Any) -> SegmentTrie:
+    """
+    Returns the trie of a 'wildcard' option: dotted names with '*' and '**' for True, or MQTT topics with '+' and '#'
+    for 'mqtt'.
+    """
+    if mode is True:
+        return SegmentTrie()
+    if mode == 'mqtt':
+        return SegmentTrie('/', '+', '#', multi_last=True)
+    raise ValueError(f"the 'wildcard' option must be True or 'mqtt', not {mode!r}")
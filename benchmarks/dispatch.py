@@ -0,0 +1,84 @@
+"""
+Compares `emit` and the functions returned by `dispatcher` with the dispatch loop `emit` started from.
+
+For each fan-out the event gets that many no-op listeners and is emitted repeatedly through the original loop, kept
+here as `BaselineEmitter`, through `emit`, through the generic dispatcher and through the dispatcher specialized for
+one argument. The speedup is that of the specialized dispatcher over the original loop. The last column emits on an
+emitter created with `captureRejections`, whose listeners never raise. Run from the repository root with
+`python -m benchmarks.dispatch`.
+"""
+import timeit
+from typing import Any, Callable, Dict, List
+
+from PyEventsEmitter import EventEmitter
+
+FANOUTS = (1, 4, 64, 1024)
+
+
+class BaselineEmitter:
+    """
+    The listener storage and the `emit` loop of `EventEmitter` before dispatch functions were compiled, copied here
+    so that the comparison does not depend on the current code.
+    """
+
+    def __init__(self) -> None:
+        self.events: Dict[str, List[Callable[..., None]]] = {}
+
+    def on(self, event_name: str, listener: Callable[..., None]) -> None:
+        if event_name not in self.events:
+            self.events[event_name] = []
+        self.events[event_name].append(listener)
+
+    def emit(self, event_name: str, *args: Any):
+        if event_name in self.events:
+            for listener in self.events[event_name]:
+                listener(*args)
+        return self
+
+
+def listener(value: object) -> None:
+    pass
+
+
+def measure(fanout: int) -> dict:
+    """
+    Returns the nanoseconds per emit of each variant for the given fan-out.
+    """
+    baseline = BaselineEmitter()
+    emitter = EventEmitter(None).set_max_listeners(0)
+    capturing = EventEmitter({"captureRejections": True}).set_max_listeners(0)
+    for _ in range(fanout):
+        baseline.on("tick", listener)
+        emitter.on("tick", listener)
+        capturing.on("tick", listener)
+    emit_baseline = baseline.emit
+    emit = emitter.emit
+    emit_capturing = capturing.emit
+    generic = emitter.dispatcher("tick")
+    unary = emitter.dispatcher("tick", 1)
+
+    number = max(1, 200_000 // fanout)
+    variants = {
+        "baseline": lambda: emit_baseline("tick", 1),
+        "emit": lambda: emit("tick", 1),
+        "dispatcher": lambda: generic(1),
+        "dispatcher(nargs=1)": lambda: unary(1),
+        "captureRejections": lambda: emit_capturing("tick", 1),
+    }
+    return {
+        name: min(timeit.repeat(call, number=number, repeat=5)) / number * 1e9
+        for name, call in variants.items()
+    }
+
+
+def main() -> None:
+    print(f"{'fan-out':>8} {'baseline ns':>12} {'emit ns':>10} {'generic ns':>11} {'nargs=1 ns':>11} {'speedup':>8} {'capture ns':>11}")
+    for fanout in FANOUTS:
+        result = measure(fanout)
+        speedup = result["baseline"] / result["dispatcher(nargs=1)"]
+        print(f"{fanout:>8} {result['baseline']:>12.1f} {result['emit']:>10.1f} {result['dispatcher']:>11.1f} "
+              f"{result['dispatcher(nargs=1)']:>11.1f} {speedup:>7.2f}x {result['captureRejections']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Reports the memory retained by idle emitters and by registered listeners, as measured by tracemalloc.
+
+Run from the repository root with `python -m benchmarks.memory`.
+"""
+import tracemalloc
+from typing import Callable, List
+
+from PyEventsEmitter import EventEmitter
+
+COUNT = 100_000
+
+# Created before tracing starts, so only the registrations are measured.
+DISTINCT = [lambda *args: None for _ in range(COUNT)]
+
+
+def listener(*args: object) -> None:
+    pass
+
+
+def bytes_per(build: Callable[[], List[EventEmitter]], count: int) -> float:
+    """
+    Returns the traced bytes retained by the objects `build` returns, divided by `count`.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+
+def idle_emitters() -> List[EventEmitter]:
+    return [EventEmitter(None) for _ in range(COUNT)]
+
+
+def one_listener_per_emitter() -> List[EventEmitter]:
+    emitters = [EventEmitter(None) for _ in range(COUNT)]
+    for emitter in emitters:
+        emitter.on("change", listener)
+    return emitters
+
+
+def listeners_on_one_event() -> List[EventEmitter]:
+    emitter = EventEmitter(None).set_max_listeners(0)
+    for distinct in DISTINCT:
+        emitter.on("message", distinct)
+    return [emitter]
+
+
+def main() -> None:
+    idle = bytes_per(idle_emitters, COUNT)
+    first = bytes_per(one_listener_per_emitter, COUNT) - idle
+    shared = bytes_per(listeners_on_one_event, COUNT)
+    print(f"idle emitter:                      {idle:8.1f} bytes")
+    print(f"first listener of an emitter:      {first:8.1f} bytes")
+    print(f"additional listener on one event:  {shared:8.1f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measures the cost of metrics on `emit`.
+
+For each fan-out the same one-argument event is emitted on an emitter that never collected metrics, on one whose
+metrics were enabled and disabled again, and on one that collects metrics. The first two must compile the same
+dispatch code, which is checked before timing. Run from the repository root with `python -m benchmarks.metrics`.
+"""
+import timeit
+
+from PyEventsEmitter import EventEmitter
+
+FANOUTS = (1, 4, 64)
+
+
+def listener(value: object) -> None:
+    pass
+
+
+def measure(fanout: int) -> dict:
+    """
+    Returns the nanoseconds per emit of each variant for the given fan-out.
+    """
+    plain = EventEmitter(None).set_max_listeners(0)
+    disabled = EventEmitter({"metrics": True}).set_max_listeners(0)
+    enabled = EventEmitter({"metrics": True}).set_max_listeners(0)
+    for emitter in (plain, disabled, enabled):
+        for _ in range(fanout):
+            emitter.on("tick", listener)
+    disabled.emit("tick", 0)
+    disabled.disable_metrics()
+
+    expected = plain.events["tick"].compile()
+    compiled = disabled.events["tick"].compile()
+    assert getattr(compiled, "__code__", compiled) is getattr(expected, "__code__", expected), "metrics left code in the dispatch path"
+
+    number = max(1, 200_000 // fanout)
+    variants = {"plain": plain.emit, "disabled": disabled.emit, "enabled": enabled.emit}
+    return {
+        name: min(timeit.repeat(lambda: emit("tick", 1), number=number, repeat=5)) / number * 1e9
+        for name, emit in variants.items()
+    }
+
+
+def main() -> None:
+    print(f"{'fan-out':>8} {'plain ns':>10} {'disabled ns':>12} {'enabled ns':>11} {'overhead':>9}")
+    for fanout in FANOUTS:
+        result = measure(fanout)
+        overhead = result["enabled"] / result["plain"]
+        print(f"{fanout:>8} {result['plain']:>10.1f} {result['disabled']:>12.1f} {result['enabled']:>11.1f} {overhead:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
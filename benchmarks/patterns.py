@@ -0,0 +1,65 @@
+"""
+Measures 2,000 regular expression subscriptions against a catch-all listener that runs every pattern.
+
+The patterns are 'svc<a>\\.(get|put)\\.r<b>\\d*$' for 100 services and 20 routes; the names are
+'svc<a>.<method>.r<b><n>', so every name matches at most one pattern. The report covers compiling the combined
+expressions, first of all the patterns, then of one block after a pattern is added, one combined match of a name
+that matches and of one that does not, the same match as a loop over the patterns, the first emit of a name, which
+matches and compiles its chain, and the following emits, which hit the cache. Run from the repository root with
+`python -m benchmarks.patterns`.
+"""
+import re
+import time
+import timeit
+
+from PyEventsEmitter import EventEmitter
+
+PATTERNS = [rf"svc{a}\.(get|put)\.r{b}\d*$" for a in range(100) for b in range(20)]
+NAMES = [f"svc{a}.{method}.r{b}{n}" for a in range(100) for method in ("get", "put", "del") for b in range(20) for n in range(5)]
+
+
+def listener(*args: object) -> None:
+    pass
+
+
+def main() -> None:
+    emitter = EventEmitter(None).set_max_listeners(0)
+    for pattern in PATTERNS:
+        emitter.on_pattern(pattern, listener)
+    resolver = emitter._resolver
+    if resolver is None:
+        raise RuntimeError("on_pattern did not create a resolver")
+    regexes = resolver.regexes
+    start = time.perf_counter()
+    regexes.match("warm.up")
+    build = (time.perf_counter() - start) * 1e3
+    start = time.perf_counter()
+    emitter.on_pattern("added", listener)
+    regexes.match("warm.up")
+    rebuild = (time.perf_counter() - start) * 1e3
+
+    compiled = [re.compile(pattern) for pattern in PATTERNS]
+    hit, miss = "svc99.put.r19", "svc99.del.r19"
+    combined_hit = min(timeit.repeat(lambda: regexes.match(hit), number=1_000, repeat=5)) / 1_000 * 1e9
+    combined_miss = min(timeit.repeat(lambda: regexes.match(miss), number=10_000, repeat=5)) / 10_000 * 1e9
+    loop = min(timeit.repeat(lambda: [pattern for pattern in compiled if pattern.match(hit)], number=100, repeat=5)) / 100 * 1e9
+
+    emit = emitter.emit
+    start = time.perf_counter()
+    for name in NAMES:
+        emit(name, 1)
+    first = (time.perf_counter() - start) / len(NAMES) * 1e9
+    cached = min(timeit.repeat(lambda: [emit(name, 1) for name in NAMES], number=1, repeat=5)) / len(NAMES) * 1e9
+
+    print(f"{len(PATTERNS):,} patterns, {len(NAMES):,} names")
+    print(f"{'build the combined expressions':<36} {build:>14.1f} ms")
+    print(f"{'add a pattern, recompile its block':<36} {rebuild:>14.1f} ms")
+    print(f"{'combined match, matching name':<36} {combined_hit:>14.1f} ns")
+    print(f"{'combined match, unmatched name':<36} {combined_miss:>14.1f} ns")
+    print(f"{'loop over the patterns':<36} {loop:>14.1f} ns")
+    print(f"{'first emit (match + compile)':<36} {first:>14.1f} ns")
+    print(f"{'cached emit':<36} {cached:>14.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measures how the throughput of CPU-bound listeners grows with the number of worker processes of a
+BatchingProcessPool. Each listener call spins for about 1 ms. The payload is passed as a `pickle.PickleBuffer`, so it
+travels out of band, through the shared memory segment of its batch.
+
+Run from the repository root with `python -m benchmarks.process_pool`.
+"""
+import os
+import pickle
+import time
+from typing import Callable, cast
+
+from PyEventsEmitter import BatchingProcessPool, EventEmitter
+
+CALLS = 2_000
+BUSY = 0.001
+
+
+def extract_features(payload: memoryview) -> int:
+    """
+    A CPU-bound listener: spins for `BUSY` seconds and returns the payload size.
+    """
+    deadline = time.perf_counter() + BUSY
+    while time.perf_counter() < deadline:
+        pass
+    return len(payload)
+
+
+def run(workers: int) -> float:
+    """
+    Returns the listener calls per second completed with `workers` worker processes.
+    """
+    pool = BatchingProcessPool(max_workers=workers, batch_size=32)
+    emitter = EventEmitter(None)
+    emitter.on("frame", cast(Callable[..., None], "benchmarks.process_pool:extract_features"), executor=pool)
+    payload = pickle.PickleBuffer(bytearray(4096))
+
+    pool.submit(extract_features, payload).result()  # Start the worker processes.
+    start = time.perf_counter()
+    futures = []
+    for _ in range(CALLS):
+        futures.extend(emitter.emit_futures("frame", payload))
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    return CALLS / elapsed
+
+
+def main() -> None:
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, 32} & set(range(1, cpus + 1))) or [1]
+    baseline = None
+    print(f"{'workers':>8} {'calls/s':>10} {'scaling':>8}")
+    for workers in counts:
+        rate = run(workers)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>10,.0f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
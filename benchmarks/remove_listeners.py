@@ -0,0 +1,37 @@
+"""
+Measures the cost of removing every listener of an event, one `off` call at a time.
+
+With the indexed registry each removal is O(1), so the total time grows linearly with the number of
+listeners and the time per removal stays flat. Run from the repository root with `python -m benchmarks.remove_listeners`.
+"""
+import time
+
+from PyEventsEmitter import EventEmitter
+
+SIZES = (12_500, 25_000, 50_000, 100_000)
+
+
+def remove_all(count: int) -> float:
+    """
+    Registers `count` distinct listeners on one event and returns the seconds spent removing all of them.
+    """
+    emitter = EventEmitter(None).set_max_listeners(0)
+    listeners = [lambda *args: None for _ in range(count)]
+    for listener in listeners:
+        emitter.on("message", listener)
+
+    start = time.perf_counter()
+    for listener in listeners:
+        emitter.off("message", listener)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'listeners':>10} {'total ms':>10} {'ns/removal':>11}")
+    for count in SIZES:
+        elapsed = min(remove_all(count) for _ in range(3))
+        print(f"{count:>10} {elapsed * 1e3:>10.2f} {elapsed / count * 1e9:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
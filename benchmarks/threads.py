@@ -0,0 +1,75 @@
+"""
+Measures the emit throughput of a ThreadSafeEventEmitter shared by 1 to 32 emitting threads, while another
+thread keeps subscribing and unsubscribing listeners on the same event.
+
+On a regular CPython build the GIL caps the total throughput; on a free-threaded build (3.13t) it should grow with
+the number of threads, since emitting takes no lock. Run from the repository root with `python -m benchmarks.threads`.
+"""
+import sys
+import threading
+import time
+
+from PyEventsEmitter import ThreadSafeEventEmitter
+
+THREADS = (1, 2, 4, 8, 16, 32)
+DURATION = 1.0
+FANOUT = 8
+
+
+def listener(value: object) -> None:
+    pass
+
+
+def run(threads: int) -> tuple:
+    """
+    Returns the emits per second and the subscription changes per second measured with `threads` emitting threads.
+    """
+    emitter = ThreadSafeEventEmitter(None)
+    for _ in range(FANOUT):
+        emitter.on("tick", listener)
+    stop = threading.Event()
+    start = threading.Barrier(threads + 2)
+    emits = [0] * threads
+    churn = [0]
+
+    def emit_loop(index: int) -> None:
+        emit = emitter.emit
+        count = 0
+        start.wait()
+        while not stop.is_set():
+            for _ in range(1000):
+                emit("tick", 1)
+            count += 1000
+        emits[index] = count
+
+    def churn_loop() -> None:
+        count = 0
+        start.wait()
+        while not stop.is_set():
+            emitter.on("tick", listener).dispose()
+            count += 1
+        churn[0] = count
+
+    workers = [threading.Thread(target=emit_loop, args=(index,)) for index in range(threads)]
+    workers.append(threading.Thread(target=churn_loop))
+    for worker in workers:
+        worker.start()
+    start.wait()
+    time.sleep(DURATION)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(emits) / DURATION, churn[0] / DURATION
+
+
+def main() -> None:
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"GIL enabled: {gil}")
+    print(f"{'threads':>8} {'emits/s':>12} {'changes/s':>12}")
+    for threads in THREADS:
+        emits, changes = run(threads)
+        print(f"{threads:>8} {emits:>12,.0f} {changes:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Measures MQTT topic filters with a bounded resolution cache.
+
+An emitter created with `'wildcard': 'mqtt'` subscribes 1,000 'site/<n>/#' filters and 'site/+/sensor/+/temp', then
+emits 1,000,000 distinct topics, which keeps evicting chains from a cache of 65,536 names, and a hot set of 1,000
+topics, which stays cached. Run from the repository root with `python -m benchmarks.topics`.
+"""
+import time
+import timeit
+
+from PyEventsEmitter import EventEmitter
+
+SITES = 1_000
+TOPICS = 1_000_000
+CACHE = 65_536
+
+
+def listener(*args: object) -> None:
+    pass
+
+
+def main() -> None:
+    emitter = EventEmitter({"wildcard": "mqtt", "wildcardCache": CACHE}).set_max_listeners(0)
+    emitter.on("site/+/sensor/+/temp", listener)
+    for site in range(SITES):
+        emitter.on(f"site/{site}/#", listener)
+    emit = emitter.emit
+    resolver = emitter._resolver
+    if resolver is None:
+        raise RuntimeError("the 'wildcard' option did not create a resolver")
+
+    start = time.perf_counter()
+    for topic in range(TOPICS):
+        emit(f"site/{topic % SITES}/sensor/{topic // SITES}/temp", 21.5)
+    streamed = (time.perf_counter() - start) / TOPICS * 1e9
+
+    hot = [f"site/{site}/sensor/0/temp" for site in range(SITES)]
+    cached = min(timeit.repeat(lambda: [emit(topic, 21.5) for topic in hot], number=10, repeat=5)) / (10 * len(hot)) * 1e9
+
+    print(f"{TOPICS:,} distinct topics, cache of {CACHE:,}")
+    print(f"{'emit of a new topic (with eviction)':<40} {streamed:>10.1f} ns")
+    print(f"{'emit of a cached topic':<40} {cached:>10.1f} ns")
+    print(f"{'cached chains':<40} {len(resolver.chains):>10,}")
+
+
+if __name__ == "__main__":
+    main()
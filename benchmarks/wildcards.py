@@ -0,0 +1,76 @@
+"""
+Measures wildcard subscriptions with 10,000 patterns and 100,000 distinct event names.
+
+The patterns are 9,900 's<a>.o<b>.*' and 100 's<a>.**'; the names are 's<a>.o<b>.e<c>', so every name matches one or
+two patterns. The report covers subscribing the patterns, the first emit of every name, which resolves and compiles
+its chain, the following emits, which hit the cache, and, for comparison, the same emits to two listeners of the exact
+name on an emitter without wildcards, an emit of a name that matches nothing, a linear scan of all the patterns for
+one name, and the memory the cached chains take. Run from the repository root with `python -m benchmarks.wildcards`.
+"""
+import time
+import timeit
+import tracemalloc
+
+from PyEventsEmitter import EventEmitter
+from PyEventsEmitter.wildcards import SegmentTrie
+
+PATTERNS = [f"s{a}.o{b}.*" for a in range(100) for b in range(99)] + [f"s{a}.**" for a in range(100)]
+NAMES = [f"s{a}.o{b}.e{c}" for a in range(100) for b in range(100) for c in range(10)]
+
+
+def listener(*args: object) -> None:
+    pass
+
+
+def main() -> None:
+    emitter = EventEmitter({"wildcard": True}).set_max_listeners(0)
+    start = time.perf_counter()
+    for pattern in PATTERNS:
+        emitter.on(pattern, listener)
+    subscribe = (time.perf_counter() - start) / len(PATTERNS) * 1e9
+
+    emit = emitter.emit
+    start = time.perf_counter()
+    for name in NAMES:
+        emit(name, 1)
+    first = (time.perf_counter() - start) / len(NAMES) * 1e9
+
+    cached = min(timeit.repeat(lambda: [emit(name, 1) for name in NAMES], number=1, repeat=5)) / len(NAMES) * 1e9
+    cached_one = min(timeit.repeat(lambda: emit("s1.o1.e1", 1), number=200_000, repeat=5)) / 200_000 * 1e9
+
+    exact = EventEmitter(None)
+    for name in NAMES:
+        exact.on(name, listener)
+        exact.on(name, listener)
+    exact_emit = exact.emit
+    direct = min(timeit.repeat(lambda: [exact_emit(name, 1) for name in NAMES], number=1, repeat=5)) / len(NAMES) * 1e9
+    direct_one = min(timeit.repeat(lambda: exact_emit("s1.o1.e1", 1), number=200_000, repeat=5)) / 200_000 * 1e9
+    unmatched = min(timeit.repeat(lambda: emit("other.name", 1), number=200_000, repeat=5)) / 200_000 * 1e9
+
+    covers = SegmentTrie().covers
+    scan = min(timeit.repeat(lambda: [pattern for pattern in PATTERNS if covers(pattern, "s1.o1.e1")], number=1, repeat=5)) * 1e9
+
+    traced = EventEmitter({"wildcard": True}).set_max_listeners(0)
+    for pattern in PATTERNS:
+        traced.on(pattern, listener)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for name in NAMES:
+        traced.emit(name, 1)
+    cached_bytes = (tracemalloc.get_traced_memory()[0] - before) / len(NAMES)
+    tracemalloc.stop()
+
+    print(f"{len(PATTERNS):,} patterns, {len(NAMES):,} names")
+    print(f"{'subscribe a pattern':<36} {subscribe:>12.1f} ns")
+    print(f"{'first emit (resolve + compile)':<36} {first:>12.1f} ns")
+    print(f"{'cached emit, all names':<36} {cached:>12.1f} ns")
+    print(f"{'exact emit, all names':<36} {direct:>12.1f} ns")
+    print(f"{'cached emit, one name':<36} {cached_one:>12.1f} ns")
+    print(f"{'exact emit, one name':<36} {direct_one:>12.1f} ns")
+    print(f"{'emit of an unmatched name':<36} {unmatched:>12.1f} ns")
+    print(f"{'linear scan of the patterns':<36} {scan:>12.1f} ns")
+    print(f"{'cache memory per name':<36} {cached_bytes:>12.1f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,7 @@ setup(
     author="HackerX",
     packages=find_packages(exclude=exclude, include=include),
     keywords= ["EventEmitter", "PyEventsEmitter", "Emitter", "Events"],
+    python_requires=">=3.11",
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,137 @@
+import asyncio
+import unittest
+import warnings
+from typing import Any, Awaitable, Callable, List, cast
+
+from PyEventsEmitter import AsyncEventEmitter
+
+
+def listen(emitter: AsyncEventEmitter, event_name: str, listener: Callable[..., Awaitable[Any]]) -> None:
+    # Adds a coroutine function as a listener.
+    emitter.on(event_name, cast(Callable[..., None], listener))
+
+
+def sleeper(calls: List[Any], tag: str, delay: float) -> Callable[..., Awaitable[Any]]:
+    # A coroutine listener that records when it starts and when it ends.
+    async def listener(*args: Any) -> None:
+        calls.append(('start', tag))
+        await asyncio.sleep(delay)
+        calls.append(('end', tag))
+    return listener
+
+
+def failer(tag: str, delay: float = 0) -> Callable[..., Awaitable[Any]]:
+    async def listener(*args: Any) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        raise ValueError(tag)
+    return listener
+
+
+class ConcurrencyTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_mode_awaits_the_listeners_together(self) -> None:
+        emitter = AsyncEventEmitter(None)
+        calls: List[Any] = []
+        listen(emitter, 'job', sleeper(calls, 'slow', 0.02))
+        emitter.on('job', lambda: calls.append(('plain', None)))
+        listen(emitter, 'job', sleeper(calls, 'fast', 0.01))
+        await emitter.emit_async('job')
+        self.assertEqual(calls, [('plain', None), ('start', 'slow'), ('start', 'fast'), ('end', 'fast'), ('end', 'slow')])
+
+    async def test_sequential_mode_awaits_the_listeners_in_order(self) -> None:
+        for emitter, concurrent in ((AsyncEventEmitter({ "concurrent": False }), None), (AsyncEventEmitter(None), False)):
+            calls: List[Any] = []
+            listen(emitter, 'job', sleeper(calls, 'slow', 0.02))
+            emitter.on('job', lambda: calls.append(('plain', None)))
+            listen(emitter, 'job', sleeper(calls, 'fast', 0.01))
+            await emitter.emit_async('job', concurrent=concurrent)
+            self.assertEqual(calls, [('start', 'slow'), ('end', 'slow'), ('plain', None), ('start', 'fast'), ('end', 'fast')])
+
+    async def test_wildcard_and_catch_all_listeners_are_awaited_together(self) -> None:
+        emitter = AsyncEventEmitter({ "wildcard": True })
+        calls: List[Any] = []
+        listen(emitter, 'job.*', sleeper(calls, 'pattern', 0.02))
+        listen(emitter, 'job.run', sleeper(calls, 'exact', 0.01))
+        emitter.on_any(cast(Callable[..., None], sleeper(calls, 'any', 0.03)))
+        await emitter.emit_async('job.run')
+        self.assertEqual([call for call in calls if call[0] == 'end'], [('end', 'exact'), ('end', 'pattern'), ('end', 'any')])
+
+    async def test_once_listeners_are_awaited_once(self) -> None:
+        emitter = AsyncEventEmitter(None)
+        calls: List[Any] = []
+        emitter.once('job', cast(Callable[..., None], sleeper(calls, 'once', 0)))
+        await emitter.emit_async('job')
+        await emitter.emit_async('job')
+        self.assertEqual(calls, [('start', 'once'), ('end', 'once')])
+        self.assertEqual(emitter.listener_count('job'), 0)
+
+
+class ErrorTest(unittest.IsolatedAsyncioTestCase):
+    async def test_a_single_failing_awaitable_raises_its_error(self) -> None:
+        emitter = AsyncEventEmitter(None)
+        listen(emitter, 'job', failer('a'))
+        with self.assertRaises(ValueError):
+            await emitter.emit_async('job')
+
+    async def test_concurrent_failures_are_raised_together(self) -> None:
+        emitter = AsyncEventEmitter(None)
+        calls: List[Any] = []
+        listen(emitter, 'job', failer('a'))
+        listen(emitter, 'job', failer('b'))
+        listen(emitter, 'job', sleeper(calls, 'cancelled', 1))
+        with self.assertRaises(ExceptionGroup) as raised:
+            await emitter.emit_async('job')
+        self.assertEqual([str(error) for error in raised.exception.exceptions], ['a', 'b'])
+        self.assertEqual(calls, [('start', 'cancelled')])
+
+    async def test_sequential_failures_stop_the_emit(self) -> None:
+        emitter = AsyncEventEmitter({ "concurrent": False })
+        calls: List[Any] = []
+        listen(emitter, 'job', failer('a'))
+        listen(emitter, 'job', sleeper(calls, 'after', 0))
+        with self.assertRaises(ValueError):
+            await emitter.emit_async('job')
+        self.assertEqual(calls, [])
+
+    async def test_a_raising_listener_closes_the_collected_awaitables(self) -> None:
+        emitter = AsyncEventEmitter(None)
+        calls: List[Any] = []
+
+        def raising() -> None:
+            raise ValueError('sync')
+
+        listen(emitter, 'job', sleeper(calls, 'collected', 0))
+        emitter.on('job', raising)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            with self.assertRaises(ValueError):
+                await emitter.emit_async('job')
+        self.assertEqual(calls, [])
+
+    async def test_capture_rejections_emits_every_error(self) -> None:
+        for concurrent in (True, False):
+            emitter = AsyncEventEmitter({ "captureRejections": True, "concurrent": concurrent })
+            calls: List[Any] = []
+            errors: List[Exception] = []
+            listen(emitter, 'job', failer('a', 0.01))
+            emitter.on('job', lambda: calls.append('plain'))
+            listen(emitter, 'job', failer('b'))
+            listen(emitter, 'job', sleeper(calls, 'last', 0))
+            emitter.on('error', errors.append)
+            await emitter.emit_async('job')
+            self.assertEqual(calls, ['plain', ('start', 'last'), ('end', 'last')])
+            self.assertEqual(sorted(str(error) for error in errors), ['a', 'b'])
+
+    async def test_capture_rejections_without_error_listeners_raises_together(self) -> None:
+        emitter = AsyncEventEmitter({ "captureRejections": True })
+        calls: List[Any] = []
+        listen(emitter, 'job', failer('a'))
+        listen(emitter, 'job', sleeper(calls, 'last', 0))
+        with self.assertRaises(ExceptionGroup) as raised:
+            await emitter.emit_async('job')
+        self.assertEqual([str(error) for error in raised.exception.exceptions], ['a'])
+        self.assertEqual(calls, [('start', 'last'), ('end', 'last')])
+
+
+if __name__ == '__main__':
+    unittest.main()
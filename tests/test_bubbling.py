@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+from typing import Any, List
+
+from PyEventsEmitter import AsyncEventEmitter, EventEmitter
+from PyEventsEmitter.chains import PROPAGATION
+
+
+class StopPropagationTest(unittest.TestCase):
+    def test_stop_propagation_skips_the_ancestors(self) -> None:
+        emitter = EventEmitter({ "bubble": True })
+        calls: List[Any] = []
+
+        def handle(n: int) -> None:
+            calls.append(('p.c.d', n))
+            emitter.stop_propagation()
+
+        emitter.on('p.c.d', handle)
+        emitter.on('p.c.d', lambda n: calls.append(('sibling', n)))
+        emitter.on('p.c', lambda n: calls.append(('p.c', n)))
+        emitter.on('p', lambda n: calls.append(('p', n)))
+        emitter.emit('p.c.d', 1)
+        emitter.emit('p.c.e', 2)
+        self.assertEqual(calls, [('p.c.d', 1), ('sibling', 1), ('p.c', 2), ('p', 2)])
+
+    def test_nested_emits_do_not_stop_the_emit_around_them(self) -> None:
+        emitter = EventEmitter({ "bubble": True })
+        other = EventEmitter({ "bubble": True })
+        calls: List[Any] = []
+
+        def nest(n: int) -> None:
+            emitter.emit('q.r', n)
+            other.emit('s.t', n)
+
+        emitter.on('p.c', nest)
+        emitter.on('p', lambda n: calls.append(('p', n)))
+        emitter.on('q.r', lambda n: emitter.stop_propagation())
+        other.on('s.t', lambda n: other.stop_propagation())
+        other.on('s', lambda n: calls.append(('s', n)))
+        emitter.emit('p.c', 1)
+        self.assertEqual(calls, [('p', 1)])
+
+    def test_other_emitters_do_not_stop_the_emit(self) -> None:
+        emitter = EventEmitter({ "bubble": True })
+        other = EventEmitter({ "bubble": True })
+        plain = EventEmitter(None)
+        calls: List[Any] = []
+
+        def stop_others(n: int) -> None:
+            other.stop_propagation()
+            plain.stop_propagation()
+
+        emitter.on('p.c', stop_others)
+        emitter.on('p', calls.append)
+        emitter.emit('p.c', 1)
+        self.assertEqual(calls, [1])
+
+    def test_stop_propagation_outside_of_an_emit_does_nothing(self) -> None:
+        emitter = EventEmitter({ "bubble": True })
+        calls: List[Any] = []
+        emitter.stop_propagation()
+        self.assertIsNone(PROPAGATION.get())
+        emitter.on('p', calls.append)
+        emitter.emit('p.c', 1)
+        self.assertEqual(calls, [1])
+
+    def test_emit_futures_stops(self) -> None:
+        emitter = EventEmitter({ "bubble": True })
+        calls: List[Any] = []
+        emitter.on('p.c', lambda n: emitter.stop_propagation())
+        emitter.on('p', calls.append)
+        emitter.emit_futures('p.c', 1)
+        emitter.emit_futures('p.d', 2)
+        self.assertEqual(calls, [2])
+
+    def test_emit_async_stops(self) -> None:
+        emitter = AsyncEventEmitter({ "bubble": True })
+        calls: List[Any] = []
+
+        def handle(n: int) -> None:
+            calls.append(('p.c', n))
+            emitter.stop_propagation()
+
+        emitter.on('p.c', handle)
+        emitter.on('p', lambda n: calls.append(('p', n)))
+        asyncio.run(emitter.emit_async('p.c', 1, concurrent=False))
+        asyncio.run(emitter.emit_async('p.d', 2, concurrent=False))
+        self.assertEqual(calls, [('p.c', 1), ('p', 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from typing import Any, List
+
+from PyEventsEmitter import EventEmitter
+
+
+def failing(*args: object) -> None:
+    raise ValueError(*args)
+
+
+class CaptureRejectionsTest(unittest.TestCase):
+    def test_exceptions_are_emitted_as_error_after_every_listener(self) -> None:
+        emitter = EventEmitter({ "captureRejections": True })
+        calls: List[Any] = []
+        errors: List[Exception] = []
+        emitter.on('order', failing)
+        emitter.on('order', lambda *args: calls.append(args))
+        emitter.on('order', failing)
+        emitter.on('error', errors.append)
+        emitter.emit('order', 1)
+        self.assertEqual(calls, [(1,)])
+        self.assertEqual([error.args for error in errors], [(1,), (1,)])
+
+    def test_exceptions_are_raised_together_without_error_listeners(self) -> None:
+        emitter = EventEmitter({ "captureRejections": True })
+        calls: List[Any] = []
+        emitter.on('order', failing)
+        emitter.on('order', lambda *args: calls.append(args))
+        emitter.on('order', failing)
+        with self.assertRaises(ExceptionGroup) as raised:
+            emitter.emit('order', 2)
+        self.assertEqual(calls, [(2,)])
+        self.assertEqual([error.args for error in raised.exception.exceptions], [(2,), (2,)])
+
+    def test_a_single_listener_is_captured(self) -> None:
+        emitter = EventEmitter({ "captureRejections": True })
+        errors: List[Exception] = []
+        emitter.on('order', failing)
+        emitter.on('error', errors.append)
+        emitter.emit('order', 3)
+        emitter.dispatcher('order', 1)(4)
+        self.assertEqual([error.args for error in errors], [(3,), (4,)])
+
+    def test_exceptions_of_error_listeners_are_raised(self) -> None:
+        emitter = EventEmitter({ "captureRejections": True })
+        emitter.on('error', failing)
+        emitter.on('order', failing)
+        with self.assertRaises(ExceptionGroup):
+            emitter.emit('order', 5)
+
+    def test_once_listeners_are_removed_when_they_raise(self) -> None:
+        emitter = EventEmitter({ "captureRejections": True })
+        errors: List[Exception] = []
+        emitter.once('order', failing)
+        emitter.on('error', errors.append)
+        emitter.emit('order', 6)
+        emitter.emit('order', 7)
+        self.assertEqual([error.args for error in errors], [(6,)])
+        self.assertEqual(emitter.listener_count('order'), 0)
+
+    def test_wildcard_chains_are_captured(self) -> None:
+        emitter = EventEmitter({ "captureRejections": True, "wildcard": True })
+        calls: List[Any] = []
+        errors: List[Exception] = []
+        emitter.on('order.*', failing)
+        emitter.on('order.paid', failing)
+        emitter.on_any(lambda *args: calls.append(args))
+        emitter.on('error', errors.append)
+        emitter.emit('order.paid', 8)
+        self.assertEqual(calls, [('order.paid', 8), ('error', errors[0]), ('error', errors[1])])
+        self.assertEqual([error.args for error in errors], [(8,), (8,)])
+
+    def test_exceptions_propagate_without_the_option(self) -> None:
+        emitter = EventEmitter(None)
+        calls: List[Any] = []
+        emitter.on('order', failing)
+        emitter.on('order', lambda *args: calls.append(args))
+        emitter.on('error', calls.append)
+        with self.assertRaises(ValueError):
+            emitter.emit('order', 9)
+        self.assertEqual(calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
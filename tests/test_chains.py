@@ -0,0 +1,126 @@
+import re
+import unittest
+from typing import Any, List
+
+from PyEventsEmitter import EventEmitter
+from PyEventsEmitter.registry import EAGER_RESETS
+
+
+class ResolverTest(unittest.TestCase):
+    def test_resolver_is_dropped_with_the_last_catch_all_or_pattern(self) -> None:
+        emitter = EventEmitter({})
+        calls = []
+        listener = lambda *args: calls.append(args)
+        pattern = re.compile(r'order\.')
+        emitter.on_any(listener)
+        emitter.off_any(listener)
+        self.assertIsNone(emitter._resolver)
+        emitter.on_pattern(pattern, listener)
+        emitter.off_pattern(pattern, listener)
+        self.assertIsNone(emitter._resolver)
+        emitter.on_any(listener)
+        emitter.on_pattern(pattern, listener)
+        emitter.remove_all_listeners()
+        self.assertIsNone(emitter._resolver)
+        emitter.emit('order.paid', 1)
+        self.assertEqual(calls, [])
+
+    def test_names_without_listeners_reach_the_registries_created_later(self) -> None:
+        emitter = EventEmitter({ "wildcard": True, "bubble": True })
+        calls = []
+        emitter.on_pattern(re.compile(r'order\.'), lambda *args: None)
+        names = ['other.%d.x' % n for n in range(5)]
+        for name in names:
+            emitter.emit(name, 0)
+        emitter.on('other.1.x', lambda *args: calls.append(('exact',) + args))
+        emitter.on('other.2', lambda *args: calls.append(('ancestor',) + args))
+        emitter.on('other.*.x', lambda *args: calls.append(('wildcard',) + args))
+        emitter.on_pattern(re.compile(r'other\.3'), lambda *args: calls.append(('pattern',) + args))
+        for n, name in enumerate(names[:4]):
+            emitter.emit(name, n)
+        self.assertEqual(calls, [('wildcard', 0), ('exact', 1), ('wildcard', 1), ('wildcard', 2), ('ancestor', 2),
+                                 ('wildcard', 3), ('pattern', 3)])
+        calls.clear()
+        emitter.on_any(lambda *args: calls.append(('any',) + args))
+        emitter.emit(names[4], 4)
+        self.assertEqual(calls, [('any', 'other.4.x', 4), ('wildcard', 4)])
+
+    def test_patterns_reach_the_names_emitted_before_them(self) -> None:
+        emitter = EventEmitter({ "wildcard": True })
+        calls = []
+        emitter.on('order.*', lambda *args: calls.append(('order.*',) + args))
+        emitter.emit('order.paid', 1)
+        emitter.emit('order.sent', 2)
+        emitter.on_pattern(re.compile(r'order\.p'), lambda *args: calls.append(('pattern',) + args))
+        transient = lambda *args: calls.append(('**',) + args)
+        emitter.on('**', transient)
+        emitter.off('**', transient)
+        emitter.emit('order.paid', 3)
+        emitter.emit('order.sent', 4)
+        self.assertEqual(calls, [('order.*', 1), ('order.*', 2), ('order.*', 3), ('pattern', 3), ('order.*', 4)])
+
+    def test_changes_to_registries_of_many_chains_reach_the_cached_chains(self) -> None:
+        emitter = EventEmitter({ "wildcard": True })
+        calls: List[Any] = []
+        names = ['order.%d' % n for n in range(EAGER_RESETS * 2)]
+        emitter.on('**', lambda *args: None)
+        for name in names:
+            emitter.emit(name)
+        self.assertGreater(len(emitter.events['**'].chains or ()), EAGER_RESETS)
+        listener = lambda *args: calls.append(args)
+        emitter.on('**', listener)
+        for n, name in enumerate(names):
+            emitter.emit(name, n)
+        emitter.off('**', listener)
+        for name in names:
+            emitter.emit(name, -1)
+        self.assertEqual(calls, [(n,) for n in range(len(names))])
+
+    def test_bubbling_keeps_the_resolver(self) -> None:
+        emitter = EventEmitter({ "bubble": True })
+        listener = lambda *args: None
+        emitter.on_any(listener)
+        emitter.off_any(listener)
+        self.assertIsNotNone(emitter._resolver)
+
+
+class RegistryKeysTest(unittest.TestCase):
+    def test_patterns_are_not_event_names(self) -> None:
+        emitter = EventEmitter({ "metrics": True })
+        calls: List[Any] = []
+        emitted: List[Any] = []
+        pattern = re.compile(r'order\.')
+        emitter.before_emit(lambda context: emitted.append(context.event_name))
+        emitter.on_pattern(pattern, calls.append)
+        emitter.on('order.paid', calls.append)
+        emitter.emit('order.paid', 1)
+        emitter.emit('order.sent', 2)
+        self.assertEqual(calls, [1, 1, 2])
+        self.assertEqual(emitted, ['order.paid', 'order.sent'])
+        self.assertEqual(list(emitter.events), ['order.paid'])
+        self.assertEqual(emitter.event_names(), ['order.paid'])
+        self.assertEqual(list(emitter.stats()), ['order.paid'])
+        self.assertEqual(emitter.listener_count('order.x'), 1)
+        emitter.off_pattern(pattern, calls.append)
+        self.assertEqual(emitter.listener_count('order.x'), 0)
+        emitter.emit('order.sent', 3)
+        self.assertEqual(calls, [1, 1, 2])
+
+    def test_catch_all_listeners_are_not_an_event(self) -> None:
+        emitter = EventEmitter({ "metrics": True })
+        calls: List[Any] = []
+        listener = lambda *args: calls.append(args)
+        emitter.on_any(listener)
+        emitter.emit('login', 'ada')
+        self.assertEqual(calls, [('login', 'ada')])
+        self.assertEqual(dict(emitter.events), {})
+        self.assertEqual(emitter.event_names(), [])
+        self.assertEqual(emitter.stats(), {})
+        self.assertEqual(emitter.listener_count('login'), 1)
+        emitter.off_any(listener)
+        emitter.emit('login', 'bob')
+        self.assertEqual(calls, [('login', 'ada')])
+        self.assertIsNone(emitter._resolver)
+
+if __name__ == '__main__':
+    unittest.main()
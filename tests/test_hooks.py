@@ -0,0 +1,117 @@
+import unittest
+from typing import Any, Callable, List, cast
+
+from PyEventsEmitter import EventEmitter
+from PyEventsEmitter.hooks import EmitContext, ListenerContext
+
+
+def failing(*args: object) -> None:
+    raise ValueError(*args)
+
+
+class HooksTest(unittest.TestCase):
+    def tracing(self, emitter: EventEmitter) -> List[Any]:
+        # Adds a hook of every kind, twice, and returns the list they record their calls in.
+        calls: List[Any] = []
+        for tag in ('outer', 'inner'):
+            self.hook(emitter, calls, tag)
+        return calls
+
+    def hook(self, emitter: EventEmitter, calls: List[Any], tag: str) -> None:
+        def before(context: EmitContext) -> None:
+            calls.append(('before', tag, context.event_name, context.args))
+
+        def after(context: EmitContext) -> None:
+            calls.append(('after', tag, context.event_name, context.error))
+
+        def around(context: ListenerContext, proceed: Callable[[], Any]) -> Any:
+            calls.append(('enter', tag, context.listener))
+            try:
+                return proceed()
+            finally:
+                calls.append(('exit', tag, context.error))
+
+        emitter.before_emit(before)
+        emitter.after_emit(after)
+        emitter.around_listener(around)
+
+    def test_hooks_run_in_order_around_the_listeners(self) -> None:
+        emitter = EventEmitter(None)
+        calls = self.tracing(emitter)
+        listener = lambda n: calls.append(('listener', n))
+        emitter.on('order', listener)
+        emitter.emit('order', 1)
+        self.assertEqual(calls, [
+            ('before', 'outer', 'order', (1,)), ('before', 'inner', 'order', (1,)),
+            ('enter', 'outer', listener), ('enter', 'inner', listener), ('listener', 1),
+            ('exit', 'inner', None), ('exit', 'outer', None),
+            ('after', 'outer', 'order', None), ('after', 'inner', 'order', None),
+        ])
+
+    def test_hooks_run_once_per_emit_of_a_wildcard_chain(self) -> None:
+        emitter = EventEmitter({ "wildcard": True })
+        contexts: List[EmitContext] = []
+        emitter.after_emit(contexts.append)
+        emitter.on('order.*', lambda n: None)
+        emitter.on('order.paid', lambda n: None)
+        emitter.on_any(lambda *args: None)
+        emitter.emit('order.paid', 1)
+        emitter.emit('other', 2)
+        self.assertEqual([(context.event_name, context.args) for context in contexts], [('order.paid', (1,)), ('other', (2,))])
+        self.assertIsNotNone(contexts[0].duration)
+
+    def test_listener_errors_reach_the_contexts(self) -> None:
+        emitter = EventEmitter(None)
+        emits: List[EmitContext] = []
+        calls: List[ListenerContext] = []
+
+        def around(context: ListenerContext, proceed: Callable[[], Any]) -> Any:
+            calls.append(context)
+            return proceed()
+
+        emitter.after_emit(emits.append)
+        emitter.around_listener(around)
+        emitter.on('order', failing)
+        with self.assertRaises(ValueError) as raised:
+            emitter.emit('order', 1)
+        self.assertIs(emits[0].error, raised.exception)
+        self.assertIs(calls[0].error, raised.exception)
+        self.assertIsNotNone(calls[0].end)
+
+    def test_captured_errors_reach_the_emit_context_grouped(self) -> None:
+        emitter = EventEmitter({ "captureRejections": True })
+        emits: List[EmitContext] = []
+        errors: List[Exception] = []
+        emitter.after_emit(emits.append)
+        emitter.on('order', failing)
+        emitter.on('order', failing)
+        emitter.on('error', errors.append)
+        emitter.emit('order', 1)
+        error = emits[0].error
+        self.assertIsInstance(error, ExceptionGroup)
+        self.assertEqual(list(cast(ExceptionGroup, error).exceptions), errors)
+
+    def test_disposing_the_handle_removes_the_hook(self) -> None:
+        emitter = EventEmitter(None)
+        calls: List[Any] = []
+        emitter.on('order', calls.append)
+        before = emitter.before_emit(lambda context: calls.append('before'))
+        with emitter.after_emit(lambda context: calls.append('after')):
+            emitter.emit('order', 1)
+
+        def traced(context: ListenerContext, proceed: Callable[[], Any]) -> Any:
+            calls.append('around')
+            return proceed()
+
+        around = emitter.around_listener(traced)
+        emitter.emit('order', 2)
+        before.dispose()
+        before.dispose()
+        around.dispose()
+        emitter.emit('order', 3)
+        self.assertEqual(calls, ['before', 1, 'after', 'before', 'around', 2, 3])
+        self.assertIsNone(emitter._hooks)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import traceback
+import unittest
+import warnings
+from typing import Any, List, Optional
+
+from PyEventsEmitter import EventEmitter, MaxListenersExceededError, MaxListenersExceededWarning
+
+
+def noop(*args: Any) -> None:
+    pass
+
+
+class ListenerLimitsTest(unittest.TestCase):
+    def recording(self) -> EventEmitter:
+        # An emitter whose reports are recorded in `self.reports` as (event name, count, limit).
+        self.reports: List[Any] = []
+
+        def report(emitter: EventEmitter, event_name: Optional[str], count: int, limit: int, stack: traceback.StackSummary) -> None:
+            self.reports.append((event_name, count, limit))
+
+        return EventEmitter({ "maxListenersMode": report })
+
+    def test_per_event_limits_override_the_default(self) -> None:
+        emitter = self.recording()
+        emitter.set_max_listeners(2)
+        emitter.set_max_listeners(3, 'tick')
+        for _ in range(4):
+            emitter.on('tick', noop)
+            emitter.on('order', noop)
+        self.assertEqual(emitter.get_max_listeners(), 2)
+        self.assertEqual(self.reports, [('order', 3, 2), ('tick', 4, 3)])
+
+    def test_zero_removes_the_limit(self) -> None:
+        emitter = self.recording()
+        emitter.set_max_listeners(1)
+        emitter.set_max_listeners(0, 'tick')
+        for _ in range(3):
+            emitter.on('tick', noop)
+        self.assertEqual(self.reports, [])
+
+    def test_warnings_are_issued_once_per_event(self) -> None:
+        emitter = EventEmitter(None)
+        emitter.set_max_listeners(1)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            for _ in range(3):
+                emitter.on('tick', noop)
+                emitter.on('order', noop)
+        self.assertEqual([warning.category for warning in caught], [MaxListenersExceededWarning] * 2)
+        self.assertIn("'tick'", str(caught[0].message))
+        self.assertEqual(caught[0].filename, __file__)
+
+    def test_callbacks_are_called_once_per_event_and_for_the_total(self) -> None:
+        emitter = self.recording()
+        emitter.set_max_listeners(1)
+        emitter.set_max_total_listeners(3)
+        for _ in range(3):
+            emitter.on('tick', noop)
+        emitter.on('order', noop)
+        emitter.on('order', noop)
+        self.assertEqual(self.reports, [('tick', 2, 1), (None, 4, 3), ('order', 2, 1)])
+
+    def test_the_total_is_recounted_after_removals(self) -> None:
+        emitter = self.recording()
+        emitter.set_max_listeners(0)
+        emitter.set_max_total_listeners(2)
+        emitter.on('tick', noop)
+        subscription = emitter.on('order', noop)
+        emitter.off('tick', noop)
+        subscription.dispose()
+        emitter.on('tick', noop)
+        emitter.on('order', noop)
+        self.assertEqual(self.reports, [])
+        emitter.on('order', noop)
+        self.assertEqual(self.reports, [(None, 3, 2)])
+
+    def test_raise_leaves_no_registration_behind(self) -> None:
+        emitter = EventEmitter({ "maxListenersMode": "raise" })
+        emitter.set_max_listeners(1)
+        emitter.on('tick', noop)
+        with self.assertRaises(MaxListenersExceededError):
+            emitter.on('tick', noop)
+        self.assertEqual(emitter.listener_count('tick'), 1)
+        emitter.set_max_listeners(0)
+        emitter.set_max_total_listeners(1)
+        with self.assertRaises(MaxListenersExceededError):
+            emitter.on('order', noop)
+        with self.assertRaises(MaxListenersExceededError):
+            emitter.on('order', noop)
+        self.assertEqual(emitter.event_names(), ['tick'])
+        emitter.off('tick', noop)
+        emitter.on('order', noop)
+        self.assertEqual(emitter.event_names(), ['order'])
+
+    def test_invalid_limits_and_modes_are_rejected(self) -> None:
+        emitter = EventEmitter(None)
+        with self.assertRaises(ValueError):
+            emitter.set_max_listeners(-1)
+        with self.assertRaises(ValueError):
+            emitter.set_max_total_listeners(-1)
+        with self.assertRaises(ValueError):
+            EventEmitter({ "maxListenersMode": "ignore" })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import threading
+import time
+import unittest
+from typing import Any, List, Tuple
+
+from PyEventsEmitter import EventEmitter
+
+INTERVAL = 0.05
+WAIT = 5.0
+
+
+class Recorder:
+    # Records the calls of a paced listener, with the time they were made, and lets the tests wait for them.
+    def __init__(self) -> None:
+        self.calls: List[Tuple[float, Tuple[Any, ...]]] = []
+        self.condition = threading.Condition()
+
+    def __call__(self, *args: Any) -> None:
+        with self.condition:
+            self.calls.append((time.monotonic(), args))
+            self.condition.notify_all()
+
+    def wait(self, count: int) -> List[Tuple[Any, ...]]:
+        with self.condition:
+            if not self.condition.wait_for(lambda: len(self.calls) >= count, WAIT):
+                raise AssertionError(f"expected {count} calls, got {self.args()}")
+            return self.args()
+
+    def args(self) -> List[Tuple[Any, ...]]:
+        return [args for _, args in self.calls]
+
+
+class PacingTest(unittest.TestCase):
+    def test_debounce_calls_once_with_the_latest_arguments(self) -> None:
+        emitter = EventEmitter(None)
+        recorder = Recorder()
+        emitter.on('search', recorder, debounce=INTERVAL)
+        for n in range(5):
+            emitter.emit('search', n)
+        last = time.monotonic()
+        self.assertEqual(recorder.args(), [])
+        self.assertEqual(recorder.wait(1), [(4,)])
+        self.assertGreaterEqual(recorder.calls[0][0] - last, INTERVAL * 0.9)
+        time.sleep(INTERVAL * 2)
+        self.assertEqual(recorder.args(), [(4,)])
+
+    def test_debounce_is_extended_by_every_call(self) -> None:
+        emitter = EventEmitter(None)
+        recorder = Recorder()
+        emitter.on('search', recorder, debounce=INTERVAL * 2)
+        start = time.monotonic()
+        for n in range(3):
+            emitter.emit('search', n)
+            time.sleep(INTERVAL)
+        self.assertEqual(recorder.wait(1), [(2,)])
+        self.assertGreaterEqual(recorder.calls[0][0] - start, INTERVAL * 3)
+
+    def test_throttle_calls_the_leading_edge_and_the_latest_of_the_interval(self) -> None:
+        emitter = EventEmitter(None)
+        recorder = Recorder()
+        emitter.on('scroll', recorder, throttle=INTERVAL)
+        for n in range(5):
+            emitter.emit('scroll', n)
+        self.assertEqual(recorder.args(), [(0,)])
+        self.assertEqual(recorder.wait(2), [(0,), (4,)])
+        self.assertGreaterEqual(recorder.calls[1][0] - recorder.calls[0][0], INTERVAL * 0.9)
+        time.sleep(INTERVAL * 2)
+        emitter.emit('scroll', 5)
+        self.assertEqual(recorder.args(), [(0,), (4,), (5,)])
+
+    def test_coalesce_by_delivers_the_latest_call_of_every_key(self) -> None:
+        emitter = EventEmitter(None)
+        recorder = Recorder()
+        emitter.on('price', recorder, debounce=INTERVAL, coalesce_by=lambda symbol, price: symbol)
+        emitter.emit('price', 'a', 1)
+        emitter.emit('price', 'b', 1)
+        emitter.emit('price', 'a', 2)
+        self.assertEqual(recorder.wait(2), [('b', 1), ('a', 2)])
+
+    def test_coalesce_by_alone_delivers_bursts_on_the_timer_thread(self) -> None:
+        emitter = EventEmitter(None)
+        recorder = Recorder()
+        emitter.on('price', recorder, coalesce_by=lambda symbol, price: symbol)
+        emitter.emit('price', 'a', 1)
+        self.assertEqual(recorder.wait(1), [('a', 1)])
+
+    def test_removing_a_listener_drops_its_pending_calls(self) -> None:
+        emitter = EventEmitter(None)
+        debounced, throttled, disposed, cleared = Recorder(), Recorder(), Recorder(), Recorder()
+        emitter.on('search', debounced, debounce=INTERVAL)
+        emitter.on('scroll', throttled, throttle=INTERVAL)
+        subscription = emitter.on('search', disposed, debounce=INTERVAL)
+        emitter.on('price', cleared, debounce=INTERVAL)
+        for n in range(2):
+            emitter.emit('search', n)
+            emitter.emit('scroll', n)
+            emitter.emit('price', n)
+        emitter.off('search', debounced)
+        emitter.off('scroll', throttled)
+        subscription.dispose()
+        emitter.remove_all_listeners('price')
+        time.sleep(INTERVAL * 3)
+        self.assertEqual(debounced.args(), [])
+        self.assertEqual(throttled.args(), [(0,)])
+        self.assertEqual(disposed.args(), [])
+        self.assertEqual(cleared.args(), [])
+
+    def test_once_listeners_deliver_their_pending_call(self) -> None:
+        emitter = EventEmitter(None)
+        recorder = Recorder()
+        emitter.once('search', recorder, debounce=INTERVAL)
+        emitter.emit('search', 1)
+        self.assertEqual(emitter.listener_count('search'), 0)
+        self.assertEqual(recorder.wait(1), [(1,)])
+
+    def test_invalid_intervals_leave_no_registry(self) -> None:
+        for options in (None, { "wildcard": True }):
+            emitter = EventEmitter(options)
+            for event_name in ('search', 'search.*'):
+                with self.assertRaises(ValueError):
+                    emitter.on(event_name, Recorder(), debounce=INTERVAL, throttle=INTERVAL)
+                with self.assertRaises(ValueError):
+                    emitter.on(event_name, Recorder(), debounce=-1)
+            self.assertEqual(dict(emitter.events), {})
+            self.assertEqual(emitter.listener_count('search.text'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
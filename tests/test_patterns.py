@@ -0,0 +1,33 @@
+import re
+import unittest
+
+from PyEventsEmitter.patterns import RegexMatcher
+from PyEventsEmitter.registry import Listeners
+
+
+class RegexMatcherTest(unittest.TestCase):
+    def matcher(self, *patterns: str) -> RegexMatcher:
+        matcher = RegexMatcher()
+        for pattern in patterns:
+            compiled = re.compile(pattern)
+            matcher.add(compiled, Listeners())
+        return matcher
+
+    def expected(self, matcher: RegexMatcher, name: str) -> list:
+        return [(pattern, listeners) for pattern, (_, listeners, _) in matcher.entries.items() if pattern.match(name)]
+
+    def test_matches_like_re_match_in_subscription_order(self) -> None:
+        matcher = self.matcher(r'order\.(created|paid)$', r'order', r'audit\.', r'order\.paid')
+        for name in ('order.paid', 'order.created', 'order.shipped', 'audit.login', 'other'):
+            self.assertEqual(matcher.match(name), self.expected(matcher, name))
+
+    def test_conditional_group_references_are_not_combined(self) -> None:
+        # Merged after a pattern with a group, '(?(1)...)' would refer to the group of the other pattern.
+        matcher = self.matcher(r'x(a)?', r'(a)?(?(1)b|c)$', r'(<)?\w+(?(1)>)$')
+        self.assertEqual(len(matcher.separate), 2)
+        for name in ('ab', 'c', 'b', 'xa', '<w>', 'w', '<w'):
+            self.assertEqual(matcher.match(name), self.expected(matcher, name))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from typing import Any, Callable, List
+
+from PyEventsEmitter import EventEmitter
+from PyEventsEmitter.registry import Listeners
+
+
+def tagged(calls: List[Any], tag: str) -> Callable[..., None]:
+    # A listener that records its tag.
+    def listener(*args: Any) -> None:
+        calls.append(tag)
+    return listener
+
+
+class PriorityTest(unittest.TestCase):
+    def test_higher_priorities_are_called_first_and_prepend_within_its_level(self) -> None:
+        emitter = EventEmitter(None)
+        calls: List[Any] = []
+        emitter.on('request', tagged(calls, 'audit'), priority=-10)
+        emitter.on('request', tagged(calls, 'handle'))
+        emitter.on('request', tagged(calls, 'authenticate'), priority=10)
+        emitter.prependListener('request', tagged(calls, 'trace'), priority=10)
+        emitter.prependListener('request', tagged(calls, 'parse'))
+        emitter.prependOnceListener('request', tagged(calls, 'log'), priority=-10)
+        emitter.emit('request')
+        self.assertEqual(calls, ['trace', 'authenticate', 'parse', 'handle', 'log', 'audit'])
+        calls.clear()
+        emitter.emit('request')
+        self.assertEqual(calls, ['trace', 'authenticate', 'parse', 'handle', 'audit'])
+
+    def test_equal_priorities_keep_the_order_they_were_added_in(self) -> None:
+        emitter = EventEmitter(None)
+        calls: List[Any] = []
+        for tag in 'abc':
+            emitter.on('request', tagged(calls, tag), priority=5)
+        emitter.on('request', tagged(calls, 'low'), priority=1)
+        for tag in 'de':
+            emitter.on('request', tagged(calls, tag), priority=5)
+        emitter.emit('request')
+        self.assertEqual(calls, ['a', 'b', 'c', 'd', 'e', 'low'])
+
+    def test_off_removes_the_first_registration_in_emit_order(self) -> None:
+        emitter = EventEmitter(None)
+        calls: List[Any] = []
+        listener, other = tagged(calls, 'listener'), tagged(calls, 'other')
+        emitter.on('request', listener, priority=-1)
+        emitter.on('request', other)
+        emitter.on('request', listener, priority=1)
+        emitter.off('request', listener)
+        self.assertEqual(emitter.listeners('request'), [other, listener])
+        emitter.emit('request')
+        self.assertEqual(calls, ['other', 'listener'])
+
+
+class DiscardTest(unittest.TestCase):
+    def test_empty_levels_are_pruned(self) -> None:
+        listeners = Listeners()
+        high = listeners.append(lambda: None, priority=10)
+        low = listeners.prepend(lambda: None, priority=-10)
+        default = listeners.append(lambda: None)
+        self.assertEqual(listeners.priorities, [-10, 0, 10])
+        self.assertTrue(listeners.discard(high))
+        self.assertTrue(listeners.discard(low))
+        self.assertEqual(listeners.levels, {})
+        self.assertEqual(listeners.priorities, [0])
+        self.assertEqual(listeners.snapshot(), (default,))
+
+    def test_discarding_twice_does_nothing(self) -> None:
+        listeners = Listeners()
+        record = listeners.append(lambda: None, priority=3)
+        other = listeners.append(lambda: None, priority=3)
+        self.assertTrue(listeners.discard(record))
+        self.assertFalse(listeners.discard(record))
+        self.assertEqual(len(listeners), 1)
+        self.assertEqual(listeners.snapshot(), (other,))
+        self.assertTrue(listeners.discard(other))
+        self.assertFalse(listeners.discard(other))
+        self.assertEqual(len(listeners), 0)
+        self.assertEqual(listeners.records, {})
+
+    def test_off_and_once_prune_the_levels_of_an_emitter(self) -> None:
+        emitter = EventEmitter(None)
+        calls: List[Any] = []
+        listener = tagged(calls, 'high')
+        emitter.on('request', tagged(calls, 'default'))
+        emitter.on('request', listener, priority=2)
+        emitter.once('request', tagged(calls, 'once'), priority=-2)
+        subscription = emitter.prependListener('request', tagged(calls, 'disposed'), priority=4)
+        listeners = emitter.events['request']
+        self.assertEqual(listeners.priorities, [-4, -2, 0, 2])
+        emitter.emit('request')
+        emitter.off('request', listener)
+        subscription.dispose()
+        self.assertEqual(listeners.levels, {})
+        self.assertEqual(listeners.priorities, [0])
+        emitter.on('request', listener, priority=2)
+        emitter.emit('request')
+        self.assertEqual(calls, ['disposed', 'high', 'default', 'once', 'high', 'default'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import asyncio
+import queue
+import threading
+import unittest
+from typing import Any, Callable, Dict, List
+from unittest import mock
+
+from PyEventsEmitter import QueuedEventEmitter
+
+WAIT = 5.0
+
+
+def twice(emitter: QueuedEventEmitter) -> Callable[[int], None]:
+    # A listener that emits two follow-up events, which overflow a queue of one.
+    def listener(n: int) -> None:
+        emitter.emit('follow-up', n)
+        emitter.emit('follow-up', n + 1)
+    return listener
+
+
+class QueuedEventEmitterTest(unittest.TestCase):
+    def gated(self, options: Dict[str, Any]) -> QueuedEventEmitter:
+        # An emitter whose first delivery blocks until `self.gate` is set, so that the next emits fill the queue.
+        self.calls: List[Any] = []
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        emitter = QueuedEventEmitter({ "maxsize": 2, **options })
+
+        def listener(n: int) -> None:
+            self.started.set()
+            self.gate.wait(WAIT)
+            self.calls.append(n)
+
+        emitter.on('job', listener)
+        emitter.emit('job', 0)
+        self.assertTrue(self.started.wait(WAIT))
+        emitter.emit('job', 1)
+        emitter.emit('job', 2)
+        self.addCleanup(emitter.close)
+        self.addCleanup(self.gate.set)
+        return emitter
+
+    def release(self, emitter: QueuedEventEmitter) -> None:
+        self.gate.set()
+        self.assertTrue(emitter.flush(WAIT))
+
+    def test_drop_newest_discards_the_emitted_event(self) -> None:
+        emitter = self.gated({ "overflow": "drop-newest" })
+        emitter.emit('job', 3)
+        self.release(emitter)
+        self.assertEqual(self.calls, [0, 1, 2])
+        self.assertEqual(emitter.queue_metrics()['dropped'], 1)
+
+    def test_drop_oldest_discards_the_oldest_queued_event(self) -> None:
+        emitter = self.gated({ "overflow": "drop-oldest" })
+        emitter.emit('job', 3)
+        emitter.emit('job', 4)
+        self.release(emitter)
+        self.assertEqual(self.calls, [0, 3, 4])
+        self.assertEqual(emitter.queue_metrics()['dropped'], 2)
+
+    def test_raise_rejects_the_emitted_event(self) -> None:
+        emitter = self.gated({ "overflow": "raise" })
+        with self.assertRaises(queue.Full):
+            emitter.emit('job', 3)
+        self.release(emitter)
+        self.assertEqual(self.calls, [0, 1, 2])
+        self.assertEqual(emitter.queue_metrics()['rejected'], 1)
+
+    def test_block_waits_for_room(self) -> None:
+        emitter = self.gated({ "overflow": "block" })
+        producer = threading.Thread(target=emitter.emit, args=('job', 3))
+        producer.start()
+        producer.join(0.05)
+        self.assertTrue(producer.is_alive())
+        self.assertFalse(emitter.flush(0.01))
+        self.release(emitter)
+        producer.join(WAIT)
+        self.assertTrue(emitter.flush(WAIT))
+        self.assertEqual(self.calls, [0, 1, 2, 3])
+        metrics = emitter.queue_metrics()
+        self.assertEqual((metrics['enqueued'], metrics['delivered'], metrics['depth']), (4, 4, 0))
+
+    def test_block_raises_once_the_timeout_expires(self) -> None:
+        emitter = self.gated({ "overflow": "block", "timeout": 0.01 })
+        with self.assertRaises(queue.Full):
+            emitter.emit('job', 3)
+        self.release(emitter)
+        self.assertEqual(self.calls, [0, 1, 2])
+
+    def test_listeners_emit_past_a_full_queue(self) -> None:
+        emitter = QueuedEventEmitter({ "maxsize": 1 })
+        self.addCleanup(emitter.close)
+        calls: List[Any] = []
+        emitter.on('job', twice(emitter))
+        emitter.on('follow-up', calls.append)
+        emitter.emit('job', 0)
+        self.assertTrue(emitter.flush(WAIT))
+        self.assertEqual(calls, [0, 1])
+        self.assertEqual(emitter.queue_metrics()['rejected'], 0)
+
+    def test_the_drain_task_loop_emits_past_a_full_queue(self) -> None:
+        emitter = QueuedEventEmitter({ "drain": "task", "maxsize": 1 })
+        calls: List[Any] = []
+
+        async def main() -> None:
+            emitter.on('job', twice(emitter))
+            emitter.on('follow-up', calls.append)
+            drainer = asyncio.create_task(emitter.run())
+            await asyncio.sleep(0)
+            emitter.emit('job', 0)
+            emitter.emit('job', 2)
+            while len(calls) < 4:
+                await asyncio.sleep(0.001)
+            emitter.close()
+            await asyncio.wait_for(drainer, WAIT)
+
+        asyncio.run(asyncio.wait_for(main(), WAIT))
+        self.assertEqual(calls, [0, 1, 2, 3])
+
+    def test_close_delivers_the_queued_events_and_rejects_new_ones(self) -> None:
+        emitter = self.gated({})
+        self.gate.set()
+        emitter.close()
+        self.assertEqual(self.calls, [0, 1, 2])
+        with self.assertRaises(RuntimeError):
+            emitter.emit('job', 3)
+
+    def test_close_wakes_up_blocked_emits(self) -> None:
+        emitter = self.gated({ "overflow": "block" })
+        errors: List[BaseException] = []
+
+        def produce() -> None:
+            try:
+                emitter.emit('job', 3)
+            except RuntimeError as error:
+                errors.append(error)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        producer.join(0.05)
+        emitter.close(wait=False)
+        producer.join(WAIT)
+        self.assertEqual(len(errors), 1)
+        self.release(emitter)
+        self.assertEqual(self.calls, [0, 1, 2])
+
+    def test_listener_errors_do_not_stop_the_drain_loop(self) -> None:
+        emitter = QueuedEventEmitter(None)
+        calls: List[Any] = []
+
+        def listener(n: int) -> None:
+            if n == 0:
+                raise ValueError(n)
+            calls.append(n)
+
+        emitter.on('job', listener)
+        with mock.patch('sys.excepthook') as excepthook:
+            emitter.emit('job', 0)
+            emitter.emit('job', 1)
+            emitter.close()
+        self.assertEqual(calls, [1])
+        self.assertEqual(excepthook.call_count, 1)
+
+    def test_emit_now_bypasses_the_queue(self) -> None:
+        emitter = self.gated({})
+        calls: List[Any] = []
+        emitter.on('now', lambda n: calls.append((n, threading.current_thread())))
+        emitter.emit_now('now', 3)
+        self.assertEqual(calls, [(3, threading.current_thread())])
+        self.assertEqual(emitter.queue_metrics()['depth'], 2)
+
+    def test_emit_futures_is_not_supported(self) -> None:
+        emitter = QueuedEventEmitter(None)
+        with self.assertRaises(TypeError):
+            emitter.emit_futures('job', 0)
+
+    def test_task_drain_delivers_on_the_event_loop(self) -> None:
+        emitter = QueuedEventEmitter({ "drain": "task" })
+        calls: List[Any] = []
+
+        async def main() -> None:
+            emitter.on('job', lambda n: calls.append((n, threading.current_thread())))
+            drainer = asyncio.create_task(emitter.run())
+            for n in range(100):
+                emitter.emit('job', n)
+            await asyncio.sleep(0)
+            emitter.close()
+            await asyncio.wait_for(drainer, WAIT)
+
+        asyncio.run(main())
+        self.assertEqual(calls, [(n, threading.current_thread()) for n in range(100)])
+
+
+if __name__ == '__main__':
+    unittest.main()
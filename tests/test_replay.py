@@ -0,0 +1,89 @@
+import unittest
+from typing import Any, List, Tuple
+
+from PyEventsEmitter import EventEmitter
+from PyEventsEmitter.replay import ReplayBuffer
+
+
+def first(args: Tuple[Any, ...]) -> int:
+    return args[0]
+
+
+class ReplayBufferTest(unittest.TestCase):
+    def test_last_bounds_the_number_of_entries(self) -> None:
+        buffer = ReplayBuffer(3)
+        for n in range(5):
+            buffer.record(n)
+        self.assertEqual(buffer.entries(), [(2,), (3,), (4,)])
+        self.assertEqual(len(buffer), 3)
+
+    def test_max_bytes_evicts_the_oldest_entries(self) -> None:
+        buffer = ReplayBuffer(10, max_bytes=10, sizeof=first)
+        for size in (4, 4, 4):
+            buffer.record(size)
+        self.assertEqual(buffer.entries(), [(4,), (4,)])
+        self.assertEqual(buffer.size, 8)
+        buffer.record(10)
+        self.assertEqual(buffer.entries(), [(10,)])
+        self.assertEqual(buffer.size, 10)
+
+    def test_entries_larger_than_max_bytes_clear_the_buffer(self) -> None:
+        buffer = ReplayBuffer(10, max_bytes=10, sizeof=first)
+        buffer.record(3)
+        buffer.record(11)
+        self.assertEqual(buffer.entries(), [])
+        self.assertEqual(buffer.size, 0)
+        buffer.record(4)
+        self.assertEqual(buffer.entries(), [(4,)])
+        self.assertEqual(buffer.size, 4)
+
+    def test_last_and_max_bytes_bound_together(self) -> None:
+        buffer = ReplayBuffer(2, max_bytes=10, sizeof=first)
+        for size in (1, 2, 3):
+            buffer.record(size)
+        self.assertEqual(buffer.entries(), [(2,), (3,)])
+        self.assertEqual(buffer.size, 5)
+
+    def test_last_must_be_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            ReplayBuffer(0)
+
+
+class RetainTest(unittest.TestCase):
+    def test_listeners_added_later_get_the_retained_emits(self) -> None:
+        emitter = EventEmitter(None)
+        calls: List[Any] = []
+        emitter.retain('price', last=2)
+        for n in range(3):
+            emitter.emit('price', n)
+        emitter.on('price', calls.append)
+        emitter.emit('price', 3)
+        self.assertEqual(calls, [1, 2, 3])
+        self.assertEqual(emitter.retained('price'), [(2,), (3,)])
+
+    def test_once_consumes_the_oldest_retained_emit(self) -> None:
+        emitter = EventEmitter(None)
+        calls: List[Any] = []
+        emitter.retain('price', last=2)
+        emitter.emit('price', 1)
+        emitter.emit('price', 2)
+        emitter.once('price', calls.append)
+        emitter.emit('price', 3)
+        self.assertEqual(calls, [1])
+        self.assertEqual(emitter.listener_count('price'), 0)
+
+    def test_release_stops_retaining(self) -> None:
+        emitter = EventEmitter(None)
+        calls: List[Any] = []
+        emitter.retain('price', last=2, max_bytes=1 << 20)
+        emitter.emit('price', 1)
+        emitter.remove_all_listeners()
+        self.assertEqual(emitter.retained('price'), [(1,)])
+        emitter.release('price')
+        emitter.on('price', calls.append)
+        self.assertEqual(calls, [])
+        self.assertEqual(emitter.retained('price'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import sys
+import threading
+import unittest
+from typing import Any, Callable, Dict, List
+
+from PyEventsEmitter import ThreadSafeEventEmitter
+
+THREADS = 4
+ROUNDS = 2_000
+
+
+class ThreadSafeEventEmitterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self) -> None:
+        sys.setswitchinterval(self.interval)
+
+    def run_threads(self, *targets: Callable[[], None]) -> None:
+        errors: List[BaseException] = []
+
+        def run(target: Callable[[], None]) -> None:
+            try:
+                target()
+            except BaseException as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def churn(self, emitter: ThreadSafeEventEmitter, event_name: str) -> Callable[[], None]:
+        # Adds and removes a listener of its own, over and over.
+        def target() -> None:
+            listener = lambda *args: None
+            for _ in range(ROUNDS):
+                emitter.on(event_name, listener)
+                emitter.off(event_name, listener)
+        return target
+
+    def emits(self, emitter: ThreadSafeEventEmitter, event_name: str) -> Callable[[], None]:
+        def target() -> None:
+            for n in range(ROUNDS):
+                emitter.emit(event_name, n)
+        return target
+
+    def test_emits_call_the_stable_listeners_once_while_others_change(self) -> None:
+        emitter = ThreadSafeEventEmitter(None)
+        calls: List[Any] = []
+        emitter.on('job', calls.append)
+        self.run_threads(*[self.emits(emitter, 'job') for _ in range(THREADS)],
+                         *[self.churn(emitter, 'job') for _ in range(THREADS)])
+        self.assertEqual(len(calls), THREADS * ROUNDS)
+        self.assertEqual(emitter.listeners('job'), [calls.append])
+
+    def test_once_listeners_run_once_under_concurrent_emits(self) -> None:
+        emitter = ThreadSafeEventEmitter(None).set_max_listeners(0)
+        calls: Dict[int, int] = {}
+        for key in range(100):
+            emitter.once('job', lambda *args, key=key: calls.__setitem__(key, calls.get(key, 0) + 1))
+        self.run_threads(*[self.emits(emitter, 'job') for _ in range(THREADS)])
+        self.assertEqual(calls, {key: 1 for key in range(100)})
+        self.assertEqual(emitter.listener_count('job'), 0)
+
+    def test_wildcard_chains_follow_concurrent_subscriptions(self) -> None:
+        emitter = ThreadSafeEventEmitter({ "wildcard": True })
+        calls: List[Any] = []
+        emitter.on('job.done', calls.append)
+        self.run_threads(*[self.emits(emitter, 'job.done') for _ in range(THREADS)],
+                         *[self.churn(emitter, 'job.*') for _ in range(THREADS // 2)],
+                         *[self.churn(emitter, 'job.done') for _ in range(THREADS // 2)])
+        self.assertEqual(len(calls), THREADS * ROUNDS)
+        self.assertEqual(emitter.listeners('job.done'), [calls.append])
+        late: List[Any] = []
+        emitter.on('job.*', late.append)
+        emitter.emit('job.done', 0)
+        self.assertEqual(late, [0])
+
+    def test_remove_all_listeners_races_with_emits(self) -> None:
+        emitter = ThreadSafeEventEmitter(None)
+
+        def reset() -> None:
+            for _ in range(ROUNDS):
+                emitter.on('job', lambda *args: None)
+                emitter.once('job', lambda *args: None)
+                emitter.remove_all_listeners('job')
+
+        self.run_threads(*[self.emits(emitter, 'job') for _ in range(THREADS)], reset)
+        self.assertEqual(emitter.listener_count('job'), 0)
+        self.assertEqual(emitter.event_names(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import gc
+import unittest
+import weakref
+from typing import Any, List
+
+from PyEventsEmitter import EventEmitter
+
+
+class Session:
+    def __init__(self, calls: List[Any]) -> None:
+        self.calls = calls
+
+    def on_message(self, *args: Any) -> None:
+        self.calls.append(args)
+
+
+class Slotted:
+    # A callable that cannot be weakly referenced.
+    __slots__ = ()
+
+    def __call__(self, *args: Any) -> None:
+        pass
+
+
+class WeakListenerTest(unittest.TestCase):
+    def test_collected_methods_are_purged(self) -> None:
+        emitter = EventEmitter(None)
+        calls: List[Any] = []
+        session = Session(calls)
+        emitter.on('message', session.on_message, weak=True)
+        emitter.emit('message', 1)
+        del session
+        gc.collect()
+        emitter.emit('message', 2)
+        self.assertEqual(calls, [(1,)])
+        self.assertEqual(emitter.listener_count('message'), 0)
+        self.assertEqual(emitter.event_names(), [])
+
+    def test_collected_functions_are_purged(self) -> None:
+        emitter = EventEmitter(None)
+        calls: List[Any] = []
+        listener = lambda *args: calls.append(args)
+        emitter.on('message', listener, weak=True)
+        emitter.on('message', calls.append)
+        del listener
+        gc.collect()
+        emitter.emit('message', 3)
+        self.assertEqual(calls, [3])
+        self.assertEqual(emitter.listeners('message'), [calls.append])
+
+    def test_off_removes_weak_listeners(self) -> None:
+        emitter = EventEmitter(None)
+        calls: List[Any] = []
+        session = Session(calls)
+        emitter.on('message', session.on_message, weak=True)
+        emitter.off('message', session.on_message)
+        emitter.emit('message', 4)
+        self.assertEqual(calls, [])
+        self.assertEqual(emitter.event_names(), [])
+
+    def test_weak_listeners_do_not_keep_the_emitter_alive(self) -> None:
+        emitter = EventEmitter(None)
+        session = Session([])
+        emitter.on('message', session.on_message, weak=True)
+        reference = weakref.ref(emitter)
+        del emitter
+        gc.collect()
+        self.assertIsNone(reference())
+        del session
+        gc.collect()
+
+    def test_wildcard_chains_drop_collected_listeners(self) -> None:
+        emitter = EventEmitter({ "wildcard": True })
+        calls: List[Any] = []
+        session = Session(calls)
+        emitter.on('message.*', session.on_message, weak=True)
+        emitter.on('message.sent', calls.append)
+        emitter.emit('message.sent', 5)
+        del session
+        gc.collect()
+        emitter.emit('message.sent', 6)
+        self.assertEqual(calls, [5, (5,), 6])
+        self.assertEqual(emitter.event_names(), ['message.sent'])
+
+    def test_listeners_without_weak_references_leave_no_registry(self) -> None:
+        for options in (None, { "wildcard": True }):
+            emitter = EventEmitter(options)
+            for event_name in ('message', 'message.*'):
+                with self.assertRaises(TypeError):
+                    emitter.on(event_name, Slotted(), weak=True)
+            self.assertEqual(dict(emitter.events), {})
+            self.assertEqual(emitter.listener_count('message.sent'), 0)
+            emitter.emit('message.sent', 7)
+
+
+if __name__ == '__main__':
+    unittest.main()